@@ -0,0 +1,211 @@
+import atexit
+import threading
+import time
+import pyaudio
+
+
+class StreamLease:
+    """A pooled PortAudio stream. ``close`` hands it back to the host instead of closing it."""
+
+    def __init__(self, host, key, stream, owner, pooled):
+        self.host = host
+        self.key = key
+        self.stream = stream
+        self.owner = owner
+        self.pooled = pooled  # Callback streams are bound to their callback and never reused
+        self.closed = False
+
+    def read(self, frames, exception_on_overflow=True):
+        return self.stream.read(frames, exception_on_overflow=exception_on_overflow)
+
+    def write(self, data):
+        self.stream.write(data)
+
+    def start_stream(self):
+        self.stream.start_stream()
+
+    def stop_stream(self):
+        self.stream.stop_stream()
+
+    def is_active(self):
+        return self.stream.is_active()
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.host.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class AudioHost:
+    """Process-wide PortAudio host with a pool of reusable streams.
+
+    ``pyaudio.PyAudio()`` enumerates every device on init, which costs hundreds
+    of milliseconds on PulseAudio hosts, so it is created once per process
+    (``AudioHost.get()``) and shared by the recorder, capture bus, realtime
+    clients, playback and media streamer. Blocking streams are leased by
+    (direction, format, channels, rate, buffer, device). A released stream
+    is stopped and parked, then restarted for the next lease with the same
+    key. Leases are tracked, so streams left open at shutdown are reported
+    and closed.
+    """
+
+    _hosts = {}  # id(interface) or None -> AudioHost
+    _hosts_lock = threading.Lock()
+
+    @classmethod
+    def get(cls, interface=None):
+        """The shared host, or the host wrapping a PyAudio-like ``interface`` (e.g. FakePyAudio)."""
+        key = None if interface is None else id(interface)
+        with cls._hosts_lock:
+            host = cls._hosts.get(key)
+            if host is None:
+                host = cls._hosts[key] = cls(interface)
+                if interface is None:
+                    atexit.register(host.terminate)
+            return host
+
+    def __init__(self, interface=None, max_idle_per_key=2):
+        started = time.perf_counter()
+        self.interface = interface if interface is not None else pyaudio.PyAudio()
+        self.init_ms = (time.perf_counter() - started) * 1000
+        self.max_idle_per_key = max_idle_per_key
+        self.open_ms = []  # Latency of every real PortAudio open
+        self.reuses = 0
+        self._idle = {}  # key -> [stream]
+        self._leases = set()
+        self._lock = threading.Lock()
+        self._terminated = False
+
+    def get_sample_size(self, format):
+        return self.interface.get_sample_size(format)
+
+    def open_input(self, rate, channels, frames_per_buffer, format=pyaudio.paInt16,
+                   device_index=None, stream_callback=None, owner=None):
+        kwargs = {"input_device_index": device_index} if device_index is not None else {}
+        return self._lease(
+            ("input", format, channels, rate, frames_per_buffer, device_index),
+            dict(format=format, channels=channels, rate=rate, input=True,
+                 frames_per_buffer=frames_per_buffer, **kwargs),
+            stream_callback,
+            owner,
+        )
+
+    def open_output(self, rate, channels, frames_per_buffer=1024, format=pyaudio.paInt16,
+                    device_index=None, owner=None):
+        kwargs = {"output_device_index": device_index} if device_index is not None else {}
+        return self._lease(
+            ("output", format, channels, rate, frames_per_buffer, device_index),
+            dict(format=format, channels=channels, rate=rate, output=True,
+                 frames_per_buffer=frames_per_buffer, **kwargs),
+            None,
+            owner,
+        )
+
+    def _lease(self, key, kwargs, stream_callback, owner):
+        stream = None
+        if stream_callback is None:
+            with self._lock:
+                idle = self._idle.get(key)
+                if idle:
+                    stream = idle.pop()
+                    self.reuses += 1
+            if stream is not None:
+                stream.start_stream()
+        if stream is None:
+            started = time.perf_counter()
+            if stream_callback is not None:
+                kwargs = dict(kwargs, stream_callback=stream_callback)
+            stream = self.interface.open(**kwargs)
+            with self._lock:
+                self.open_ms.append((time.perf_counter() - started) * 1000)
+        lease = StreamLease(self, key, stream, owner, pooled=stream_callback is None)
+        with self._lock:
+            self._leases.add(lease)
+        return lease
+
+    def release(self, lease):
+        with self._lock:
+            self._leases.discard(lease)
+            park = (
+                lease.pooled
+                and not self._terminated
+                and len(self._idle.get(lease.key, ())) < self.max_idle_per_key
+            )
+        lease.stream.stop_stream()
+        if park:
+            with self._lock:
+                self._idle.setdefault(lease.key, []).append(lease.stream)
+        else:
+            lease.stream.close()
+
+    @property
+    def open_streams(self):
+        with self._lock:
+            return len(self._leases) + sum(len(idle) for idle in self._idle.values())
+
+    def stats(self):
+        with self._lock:
+            ordered = sorted(self.open_ms)
+            return {
+                "init_ms": round(self.init_ms, 1),
+                "opens": len(ordered),
+                "open_ms_p50": round(ordered[len(ordered) // 2], 2) if ordered else None,
+                "open_ms_max": round(ordered[-1], 2) if ordered else None,
+                "reuses": self.reuses,
+                "leased": len(self._leases),
+                "idle": sum(len(idle) for idle in self._idle.values()),
+            }
+
+    def terminate(self):
+        """Close every stream (reporting leaked leases) and shut PortAudio down."""
+        with self._lock:
+            if self._terminated:
+                return
+            self._terminated = True
+            leaked = list(self._leases)
+            idle = [s for streams in self._idle.values() for s in streams]
+            self._idle.clear()
+        for lease in leaked:
+            print(f"Audio host: closing leaked {lease.key[0]} stream from {lease.owner or 'unknown'}")
+            lease.close()
+        for stream in idle:
+            stream.close()
+        print(f"Audio host stats: {self.stats()}")
+        self.interface.terminate()
+        with AudioHost._hosts_lock:
+            for key, host in list(AudioHost._hosts.items()):
+                if host is self:
+                    del AudioHost._hosts[key]
+
+
+def benchmark(cycles=20, rate=24000, channels=1, frames_per_buffer=480):
+    """Compare a fresh PyAudio per stream (the old pattern) with leasing from the host."""
+    started = time.perf_counter()
+    for _ in range(cycles):
+        p = pyaudio.PyAudio()
+        stream = p.open(format=pyaudio.paInt16, channels=channels, rate=rate,
+                        output=True, frames_per_buffer=frames_per_buffer)
+        stream.stop_stream()
+        stream.close()
+        p.terminate()
+    fresh_ms = (time.perf_counter() - started) * 1000 / cycles
+
+    host = AudioHost.get()
+    started = time.perf_counter()
+    for _ in range(cycles):
+        host.open_output(rate, channels, frames_per_buffer, owner="benchmark").close()
+    leased_ms = (time.perf_counter() - started) * 1000 / cycles
+
+    print(f"PyAudio() + open + terminate: {fresh_ms:8.2f} ms per stream")
+    print(f"AudioHost lease + release:    {leased_ms:8.2f} ms per stream")
+    print(f"Host stats: {host.stats()}")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -2,6 +2,9 @@ import pyaudio
 import wave
 import threading
 import time
+from bot.audio_host import AudioHost
+from bot.ring_buffer import AudioRingBuffer
+from bot.wav_writer import StreamingWavWriter
 
 # Parameters
 CHUNK = 88200  # Number of frames per buffer
@@ -10,37 +13,163 @@ CHANNELS = 2  # Stereo audio
 RATE = 44100  # Sampling rate
 
 class AudioRecorder:
-    def __init__(self, filename="output.wav"):
+    def __init__(
+        self,
+        filename="output.wav",
+        stream_to_disk=True,
+        segment_seconds=None,
+        header_interval=2.0,
+        capture_mode="blocking",
+        chunk_ms=20,
+        ring_seconds=5,
+        source=None,
+        vad=None,
+    ):
         self.filename = filename
         self.frames = []
         self.recording = False
         self.thread = None
 
+        # Streaming writer settings (memory stays constant for any meeting length)
+        self.stream_to_disk = stream_to_disk
+        self.segment_seconds = segment_seconds  # Rotate into new files every N seconds
+        self.header_interval = header_interval  # Seconds between WAV header fixes
+        self.writer = None
+
+        # "blocking" reads CHUNK frames at a time; "callback" lets PortAudio fill
+        # a preallocated ring buffer in chunk_ms blocks.
+        self.capture_mode = capture_mode
+        self.chunk_frames = max(1, int(RATE * chunk_ms / 1000))
+        self.ring = None
+        if capture_mode == "callback":
+            self.ring = AudioRingBuffer(RATE * ring_seconds, channels=CHANNELS)
+
+        # Optional AudioCaptureBus subscription; when set, no PortAudio stream is opened here.
+        self.source = source
+
+        # Optional StreamingVAD; speech (start, end) times are collected as audio is written
+        self.vad = vad
+        self.speech_segments = []
+
+    def _open_writer(self, sample_width):
+        if not self.stream_to_disk:
+            return None
+        return StreamingWavWriter(
+            self.filename,
+            channels=self.source.channels if self.source else CHANNELS,
+            sample_width=sample_width,
+            rate=self.source.rate if self.source else RATE,
+            segment_seconds=self.segment_seconds,
+            header_interval=self.header_interval,
+        )
+
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        """PortAudio callback: copy the block into the ring and return immediately."""
+        self.ring.write(in_data)
+        return (None, pyaudio.paContinue)
+
+    def _write_block(self, data):
+        if self.vad is not None:
+            for event, at in self.vad.process(data):
+                if event == "speech_start":
+                    self.speech_segments.append([at, None])
+                elif self.speech_segments:
+                    self.speech_segments[-1][1] = at
+        if self.writer is not None:
+            self.writer.write(data)
+        else:
+            self.frames.append(bytes(data))
+
+    def _drain_ring(self):
+        """Hand every buffered block to the writer without copying it first."""
+        views = self.ring.peek()
+        frames = 0
+        for view in views:
+            self._write_block(view)
+            frames += len(view) // self.ring.frame_bytes
+        self.ring.consume(frames)
+
+    def _record_callback(self, host):
+        stream = host.open_input(rate=RATE,
+                                 channels=CHANNELS,
+                                 frames_per_buffer=self.chunk_frames,
+                                 format=FORMAT,
+                                 stream_callback=self._on_audio,
+                                 owner="recorder")
+        stream.start_stream()
+
+        print("Recording...")
+
+        try:
+            while self.recording:
+                if self.ring.wait(self.chunk_frames, timeout=0.5):
+                    self._drain_ring()
+        finally:
+            stream.close()  # Back to the audio host
+            self._drain_ring()
+            print(f"Capture stats: {self.ring.stats()}")
+
+    def _record_from_source(self):
+        self.writer = self._open_writer(pyaudio.get_sample_size(FORMAT))
+        print("Recording from shared capture bus...")
+        try:
+            while self.recording:
+                data = self.source.read(timeout=0.5)
+                if data:
+                    self._write_block(data)
+        finally:
+            if self.writer is not None:
+                self.writer.close()
+
+        self._save(self.source.channels, self.source.rate)
+
     def _record_audio(self):
-        p = pyaudio.PyAudio()
+        if self.source is not None:
+            self._record_from_source()
+            return
 
-        stream = p.open(format=FORMAT,
-                        channels=CHANNELS,
-                        rate=RATE,
-                        input=True,
-                        frames_per_buffer=CHUNK)
+        host = AudioHost.get()  # Shared PortAudio instance; no per-recording init
+        self.writer = self._open_writer(host.get_sample_size(FORMAT))
+
+        if self.capture_mode == "callback":
+            try:
+                self._record_callback(host)
+            finally:
+                if self.writer is not None:
+                    self.writer.close()
+            self._save()
+            return
+
+        stream = host.open_input(rate=RATE,
+                                 channels=CHANNELS,
+                                 frames_per_buffer=CHUNK,
+                                 format=FORMAT,
+                                 owner="recorder")
 
         print("Recording...")
 
-        while self.recording:
-            data = stream.read(CHUNK)
-            self.frames.append(data)
+        try:
+            while self.recording:
+                self._write_block(stream.read(CHUNK))
+        finally:
+            # Return the stream to the audio host
+            stream.close()
+
+            if self.writer is not None:
+                self.writer.close()
+
+        self._save()
 
-        # Stop and close the stream
-        stream.stop_stream()
-        stream.close()
-        p.terminate()
+    def _save(self, channels=CHANNELS, rate=RATE):
+        if self.writer is not None:
+            print(f"Recording saved as {', '.join(self.writer.segments)}")
+            return
 
         # Save the recorded audio to a file
         wf = wave.open(self.filename, 'wb')
-        wf.setnchannels(CHANNELS)
-        wf.setsampwidth(p.get_sample_size(FORMAT))
-        wf.setframerate(RATE)
+        wf.setnchannels(channels)
+        wf.setsampwidth(pyaudio.get_sample_size(FORMAT))
+        wf.setframerate(rate)
         wf.writeframes(b''.join(self.frames))
         wf.close()
 
@@ -58,7 +187,7 @@ class AudioRecorder:
 
 if __name__ == "__main__":
     pass
-    # recorder = AudioRecorder()
+    # recorder = AudioRecorder(segment_seconds=600)
     # recorder.start()
 
     # time.sleep(50)
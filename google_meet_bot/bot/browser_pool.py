@@ -0,0 +1,229 @@
+import collections
+import threading
+import time
+import undetected_chromedriver as uc
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from bot.proc_stats import driver_pids, tree_rss_mb
+
+# Origins whose cookies/storage are wiped between meetings
+RESET_ORIGINS = ["https://meet.google.com", "https://accounts.google.com"]
+
+
+def media_options():
+    """Chrome options every bot browser needs. uc.Chrome refuses to reuse an Options object."""
+    chrome_options = Options()
+    chrome_options.add_argument("--use-fake-ui-for-media-stream")
+    return chrome_options
+
+
+def launch_chrome(headless=False):
+    return uc.Chrome(options=media_options(), headless=headless)
+
+
+class PooledBrowser:
+    def __init__(self, driver, launch_ms):
+        self.driver = driver
+        self.launch_ms = launch_ms
+        self.uses = 0
+        self.created = time.monotonic()
+
+    def rss_mb(self):
+        return tree_rss_mb(*driver_pids(self.driver))
+
+
+class BrowserPool:
+    """Keeps ``size`` Chrome sessions launched and idle, ready for the next meeting.
+
+    ``acquire`` hands out a warm browser and refills the pool in the
+    background. Parked browsers are checked before they are handed out, and
+    one that crashed is discarded. With none idle it waits for one already
+    warming (launching its own would queue behind it anyway) and launches
+    cold only if nothing is in flight.
+    ``release`` takes it back after the meeting. The browser is reset
+    (blank page, extra windows closed, Meet cookies and storage cleared) and
+    parked again. It is quit and replaced instead once it has served
+    ``max_uses`` meetings, its process tree exceeds ``max_rss_mb``, or the
+    reset fails, and quit without replacement if the pool already holds
+    ``size`` idle or launching browsers. Launches are serialized because undetected_chromedriver
+    patches the shared chromedriver binary on every start.
+    """
+
+    def __init__(self, size=2, max_uses=10, max_rss_mb=1500, launch=launch_chrome):
+        self.size = size
+        self.max_uses = max_uses
+        self.max_rss_mb = max_rss_mb
+        self.launch = launch
+        self.launch_ms = []
+        self.warm_hits = 0
+        self.cold_launches = 0
+        self.recycled = collections.Counter()  # reason -> count
+        self._idle = collections.deque()
+        self._leased = {}  # id(driver) -> PooledBrowser
+        self._launching = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._launch_lock = threading.Lock()
+
+    def start(self):
+        """Begin warming ``size`` browsers in the background; returns self."""
+        self._refill()
+        return self
+
+    def wait_ready(self, timeout=None):
+        """Block until ``size`` browsers are idle (or ``timeout``); returns whether they are."""
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self._idle) >= self.size or self._closed, timeout)
+
+    def _launch(self):
+        with self._launch_lock:
+            started = time.perf_counter()
+            driver = self.launch()
+            launch_ms = (time.perf_counter() - started) * 1000
+        with self._cond:
+            self.launch_ms.append(launch_ms)
+        return PooledBrowser(driver, launch_ms)
+
+    def _refill(self):
+        with self._cond:
+            missing = self.size - len(self._idle) - self._launching
+            if self._closed or missing <= 0:
+                return
+            self._launching += missing
+        for _ in range(missing):
+            threading.Thread(target=self._warm_one, daemon=True).start()
+
+    def _warm_one(self):
+        browser = None
+        try:
+            browser = self._launch()
+        except Exception as e:
+            print(f"Browser pool: launch failed: {e}")
+        with self._cond:
+            self._launching -= 1
+            if browser is not None and not self._closed:
+                self._idle.append(browser)
+                browser = None
+            self._cond.notify_all()
+        if browser is not None:  # Pool closed while it was starting
+            browser.driver.quit()
+
+    @staticmethod
+    def _alive(driver):
+        """False if the browser or its chromedriver has died while parked."""
+        try:
+            driver.window_handles
+            return True
+        except Exception:
+            return False
+
+    def acquire(self, timeout=120):
+        """A driver for one meeting; waits up to ``timeout`` s for a warming browser before launching cold."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("browser pool is closed")
+                while not self._idle and self._launching:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                browser = self._idle.popleft() if self._idle else None
+            if browser is None or self._alive(browser.driver):
+                break
+            print("Browser pool: idle browser died while parked; discarding it.")
+            with self._cond:
+                self.recycled["crashed"] += 1
+            try:
+                browser.driver.quit()
+            except Exception:
+                pass
+            self._refill()
+        if browser is not None:
+            with self._cond:
+                self.warm_hits += 1
+        else:
+            browser = self._launch()
+            with self._cond:
+                self.cold_launches += 1
+            print(f"Browser pool: no warm browser; cold launch took {browser.launch_ms:.0f} ms.")
+        browser.uses += 1
+        with self._cond:
+            self._leased[id(browser.driver)] = browser
+        self._refill()
+        return browser.driver
+
+    def _reset(self, driver):
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        driver.get("about:blank")
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        for origin in RESET_ORIGINS:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+
+    def release(self, driver):
+        """Take a driver back after ``leave_meeting``; resets and parks it, or recycles it."""
+        with self._cond:
+            browser = self._leased.pop(id(driver), None)
+        if browser is None:
+            driver.quit()
+            return
+        reason = None
+        if self._closed:
+            reason = "closed"
+        elif browser.uses >= self.max_uses:
+            reason = "max_uses"
+        elif self.max_rss_mb and browser.rss_mb() > self.max_rss_mb:
+            reason = "memory"
+        else:
+            try:
+                self._reset(driver)
+            except WebDriverException as e:
+                print(f"Browser pool: reset failed ({e.msg}); recycling.")
+                reason = "reset_failed"
+        if reason is None:
+            with self._cond:
+                # A cold launch or refill may have topped the pool up while this one was out
+                if len(self._idle) + self._launching < self.size:
+                    self._idle.append(browser)
+                    self._cond.notify_all()
+                    return
+                reason = "surplus"
+        with self._cond:
+            self.recycled[reason] += 1
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+        self._refill()
+
+    def stats(self):
+        with self._cond:
+            ordered = sorted(self.launch_ms)
+            return {
+                "idle": len(self._idle),
+                "leased": len(self._leased),
+                "launching": self._launching,
+                "warm_hits": self.warm_hits,
+                "cold_launches": self.cold_launches,
+                "launch_ms_p50": round(ordered[len(ordered) // 2]) if ordered else None,
+                "recycled": dict(self.recycled),
+            }
+
+    def close(self):
+        """Quit every idle browser; leased ones are quit when released."""
+        with self._cond:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._cond.notify_all()
+        for browser in idle:
+            try:
+                browser.driver.quit()
+            except WebDriverException:
+                pass
+        print(f"Browser pool stats: {self.stats()}")
@@ -0,0 +1,155 @@
+import threading
+import numpy as np
+import pyaudio
+from bot.audio_host import AudioHost
+from bot.resampler import AudioConverter
+from bot.ring_buffer import AudioRingBuffer
+
+
+class AudioSubscription:
+    """One consumer of an AudioCaptureBus, delivering audio in its own format."""
+
+    def __init__(self, bus, rate, channels, frame_ms, buffer_seconds):
+        self.bus = bus
+        self.rate = rate
+        self.channels = channels
+        self.frame_ms = frame_ms
+        self.frames_per_read = max(1, int(rate * frame_ms / 1000))
+        self.ring = AudioRingBuffer(rate * buffer_seconds, channels=channels)
+        # Optional no-argument callback, run on the bus thread after each write and on close,
+        # for consumers (e.g. an event loop) that must not block in ``read``
+        self.listener = None
+
+    @property
+    def format_key(self):
+        return (self.rate, self.channels)
+
+    def clear(self):
+        """Discard anything captured before now."""
+        self.ring.clear()
+
+    def read(self, frames=None, timeout=None):
+        """Block until ``frames`` (default: one frame_ms block) are available and return them as bytes.
+
+        Returns None if the bus stopped before enough audio arrived.
+        """
+        frames = frames or self.frames_per_read
+        if not self.ring.wait(frames, timeout):
+            return None
+        data = b"".join(self.ring.peek(frames))
+        self.ring.consume(frames)
+        return data
+
+    @property
+    def closed(self):
+        """True once the bus stopped or this subscription was closed."""
+        return self.ring.closed
+
+    def _notify(self):
+        listener = self.listener
+        if listener is not None:
+            listener()
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class AudioCaptureBus:
+    """Single PortAudio input stream fanned out to any number of subscribers.
+
+    Each subscriber declares the sample rate, channel count and frame size it needs.
+    Format conversion runs once per distinct (rate, channels) pair, no matter how
+    many subscribers share it.
+    """
+
+    def __init__(self, rate=44100, channels=2, chunk_ms=20, device_index=None, ring_seconds=5):
+        self.rate = rate
+        self.channels = channels
+        self.chunk_frames = max(1, int(rate * chunk_ms / 1000))
+        self.device_index = device_index
+        self.ring = AudioRingBuffer(rate * ring_seconds, channels=channels)
+
+        self.subscribers = []
+        self._converters = {}
+        self._lock = threading.Lock()
+        self.running = False
+        self.thread = None
+        self._stream = None
+
+    def subscribe(self, rate=None, channels=None, frame_ms=20, buffer_seconds=10):
+        """Register a consumer; audio flows to it from the next captured block."""
+        sub = AudioSubscription(
+            self, rate or self.rate, channels or self.channels, frame_ms, buffer_seconds
+        )
+        with self._lock:
+            if sub.format_key not in self._converters:
+                self._converters[sub.format_key] = AudioConverter(
+                    self.rate, self.channels, sub.rate, sub.channels
+                )
+            self.subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            if sub in self.subscribers:
+                self.subscribers.remove(sub)
+            if not any(s.format_key == sub.format_key for s in self.subscribers):
+                self._converters.pop(sub.format_key, None)
+        sub.ring.close()
+        sub._notify()
+
+    def _on_audio(self, in_data, frame_count, time_info, status):
+        self.ring.write(in_data)
+        return (None, pyaudio.paContinue)
+
+    def _dispatch(self, block):
+        """Convert one captured block once per target format and fan it out."""
+        with self._lock:
+            subscribers = list(self.subscribers)
+            converters = dict(self._converters)
+
+        for key, converter in converters.items():
+            out = converter.process(block)
+            if not len(out):
+                continue
+            for sub in subscribers:
+                if sub.format_key == key:
+                    sub.ring.write(out)
+                    sub._notify()
+
+    def _run(self):
+        while self.running or self.ring.available:
+            if not self.ring.wait(self.chunk_frames, timeout=0.5) and self.running:
+                continue
+            for view in self.ring.peek():
+                frames = len(view) // self.ring.frame_bytes
+                block = np.frombuffer(view, dtype=np.int16).reshape(frames, self.channels)
+                self._dispatch(block)
+                self.ring.consume(frames)
+
+    def start(self):
+        self._stream = AudioHost.get().open_input(
+            rate=self.rate,
+            channels=self.channels,
+            frames_per_buffer=self.chunk_frames,
+            device_index=self.device_index,
+            stream_callback=self._on_audio,
+            owner="capture bus",
+        )
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self._stream.start_stream()
+        print("Audio capture bus started.")
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stream.close()
+        self.running = False
+        self.ring.close()
+        self.thread.join()
+        for sub in list(self.subscribers):
+            sub.ring.close()
+            sub._notify()
+        print(f"Audio capture bus stopped. Capture stats: {self.ring.stats()}")
@@ -0,0 +1,229 @@
+import time
+from enum import Enum
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from bot.models import JoinReport
+from bot.page_state import read_page_state
+
+# Locators, most specific first; later entries are fallbacks for older Meet layouts
+NAME_INPUT = [(By.XPATH, '//input[@aria-label="Your name"]')]
+ASK_TO_JOIN = [
+    (By.XPATH, '//span[text()="Ask to join"]/ancestor::button[1][not(@disabled)]'),
+    (By.XPATH, '//span[text()="Ask to join"]'),
+]
+JOIN_NOW = [
+    (By.XPATH, '//span[text()="Join now"]/ancestor::button[1][not(@disabled)]'),
+    (By.XPATH, '//span[text()="Join now"]'),
+]
+IN_CALL = [
+    (By.XPATH, "//button[@aria-label='Leave call']"),
+    (By.XPATH, "//button[contains(@aria-label, 'Leave call')]"),
+]
+DENIED = [
+    (By.XPATH, '//*[contains(text(), "denied your request")]'),
+    (By.XPATH, '//*[contains(text(), "No one responded to your request")]'),
+    (By.XPATH, "//*[contains(text(), \"You can't join this call\")]"),
+]
+PEOPLE_BUTTON = [
+    (By.XPATH, "//button[@aria-label='People']"),
+    (By.XPATH, "//button[contains(@aria-label, 'Show everyone')]"),
+]
+PEOPLE_PANEL = [(By.XPATH, '//div[contains(text(), "Contributors")]')]
+
+
+class JoinStage(Enum):
+    LOADING = "loading"  # driver.get() until the pre-join screen renders
+    NAME = "name"  # Guest name typed and the join button enabled
+    DEVICES = "devices"  # Camera muted / virtual devices selected
+    JOIN_CLICK = "join_click"  # "Ask to join" or "Join now" clicked
+    ADMISSION = "admission"  # Waiting for the in-call UI (host approval)
+    PEOPLE = "people"  # Participants panel opened
+    CONFIRM = "confirm"  # Waiting for the bot's own name in the panel
+    IN_MEETING = "in_meeting"  # Done
+    FAILED = "failed"
+
+
+def find_first(driver, locators, displayed=True):
+    """First matching (and, by default, displayed) element among ``locators``, else None."""
+    for by, value in locators:
+        for element in driver.find_elements(by, value):
+            try:
+                if not displayed or element.is_displayed():
+                    return element
+            except WebDriverException:
+                continue  # Went stale between find and check
+    return None
+
+
+class JoinFlow:
+    """Pre-join screen → in meeting, as an explicit state machine.
+
+    Every stage waits on the DOM condition that ends it (polled every
+    ``poll_interval`` seconds) instead of sleeping a fixed time. Each wait has
+    its own timeout and fallback locators. Time spent per stage is recorded in
+    the returned JoinReport.
+    """
+
+    def __init__(
+        self,
+        driver,
+        bot_name="Guest Bot",
+        before_join=None,  # Called with the driver once the pre-join screen is ready
+        page_timeout=30,
+        name_timeout=5,
+        join_button_timeout=10,
+        admission_timeout=300,
+        panel_timeout=10,
+        confirm_timeout=20,
+        poll_interval=0.1,
+    ):
+        self.driver = driver
+        self.bot_name = bot_name
+        self.before_join = before_join
+        self.page_timeout = page_timeout
+        self.name_timeout = name_timeout
+        self.join_button_timeout = join_button_timeout
+        self.admission_timeout = admission_timeout
+        self.panel_timeout = panel_timeout
+        self.confirm_timeout = confirm_timeout
+        self.poll_interval = poll_interval
+        self.stage = None
+        self.stage_ms = {}
+        self._stage_started = None
+
+    def _wait(self, timeout, condition, message):
+        return WebDriverWait(
+            self.driver, timeout, poll_frequency=self.poll_interval
+        ).until(condition, message)
+
+    def _wait_for(self, locators, timeout, message):
+        return self._wait(timeout, lambda d: find_first(d, locators), message)
+
+    def _enter(self, stage):
+        now = time.perf_counter()
+        if self.stage is not None:
+            self.stage_ms[self.stage.value] = round((now - self._stage_started) * 1000, 1)
+        self.stage = stage
+        self._stage_started = now
+        if stage not in (JoinStage.IN_MEETING, JoinStage.FAILED):
+            print(f"Join stage: {stage.value}")
+
+    def _loading(self, url):
+        self.driver.get(url)
+        self._wait(
+            self.page_timeout,
+            lambda d: not read_page_state(d).loading,
+            "pre-join screen did not load",
+        )
+
+    def _name(self):
+        name_input = find_first(self.driver, NAME_INPUT)
+        if name_input is None:
+            print("No guest name required.")
+            return
+        name_input.send_keys(self.bot_name)
+        try:
+            # The join button is disabled until a name is entered
+            self._wait_for(ASK_TO_JOIN[:1] + JOIN_NOW[:1], self.name_timeout, "")
+        except TimeoutException:
+            print("Join button did not report enabled; trying anyway.")
+
+    def _join_click(self):
+        """Click whichever join button is offered; returns True if admission is needed."""
+
+        def join_button(driver):
+            button = find_first(driver, ASK_TO_JOIN)
+            if button is not None:
+                return True, button
+            button = find_first(driver, JOIN_NOW)
+            return (False, button) if button is not None else False
+
+        asked, button = self._wait(
+            self.join_button_timeout,
+            join_button,
+            "neither 'Ask to join' nor 'Join now' button found",
+        )
+        button.click()
+        print("Clicked 'Ask to join'. Waiting for host approval..." if asked else "Clicked 'Join now'.")
+        return asked
+
+    def _admission(self, asked):
+        timeout = self.admission_timeout if asked else self.page_timeout
+
+        def admitted_or_denied(driver):
+            # One snapshot per poll instead of a find_elements per locator
+            state = read_page_state(driver)
+            if state.in_meeting:
+                return "admitted"
+            if state.denied:
+                return "denied"
+            return False
+
+        outcome = self._wait(timeout, admitted_or_denied, "not admitted before the timeout")
+        if outcome == "denied":
+            raise PermissionError("host denied the join request")
+
+    def _people(self):
+        button = self._wait_for(PEOPLE_BUTTON, self.panel_timeout, "People button not found")
+        button.click()
+        self._wait_for(PEOPLE_PANEL, self.panel_timeout, "participants panel did not open")
+        print("Opened participants list.")
+
+    def _confirm(self):
+        self._wait_for(
+            [(By.XPATH, f'//div[contains(text(), "{self.bot_name}")]')],
+            self.confirm_timeout,
+            f"{self.bot_name!r} not listed in the participants panel",
+        )
+
+    def run(self, url):
+        """Drive the join from ``url`` to a confirmed in-meeting state and report timings."""
+        self.stage = None
+        self.stage_ms = {}
+        started = time.perf_counter()
+        join_clicked_at = None
+        in_call_at = None
+        error = None
+        try:
+            self._enter(JoinStage.LOADING)
+            self._loading(url)
+            self._enter(JoinStage.NAME)
+            self._name()
+            self._enter(JoinStage.DEVICES)
+            if self.before_join is not None:
+                self.before_join(self.driver)
+            self._enter(JoinStage.JOIN_CLICK)
+            asked = self._join_click()
+            join_clicked_at = time.perf_counter()
+            self._enter(JoinStage.ADMISSION)
+            self._admission(asked)
+            in_call_at = time.perf_counter()
+            self._enter(JoinStage.PEOPLE)
+            self._people()
+            self._enter(JoinStage.CONFIRM)
+            self._confirm()
+            self._enter(JoinStage.IN_MEETING)
+        except (TimeoutException, WebDriverException, PermissionError) as e:
+            error = f"{self.stage.value}: {getattr(e, 'msg', None) or e}"
+            final_stage = self.stage.value
+            self._enter(JoinStage.FAILED)
+        else:
+            final_stage = JoinStage.IN_MEETING.value
+
+        report = JoinReport(
+            joined=error is None,
+            final_stage=final_stage,
+            stage_ms=self.stage_ms,
+            total_ms=round((time.perf_counter() - started) * 1000, 1),
+            join_to_in_meeting_ms=round((in_call_at - join_clicked_at) * 1000, 1)
+            if in_call_at and join_clicked_at
+            else None,
+            error=error,
+        )
+        stages = ", ".join(f"{name} {ms:.0f} ms" for name, ms in report.stage_ms.items())
+        if report.joined:
+            print(f"Joined the meeting in {report.total_ms:.0f} ms ({stages}).")
+        else:
+            print(f"Join failed at {report.final_stage} after {report.total_ms:.0f} ms: {error} ({stages})")
+        return report
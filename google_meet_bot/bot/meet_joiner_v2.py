@@ -1,16 +1,23 @@
 import time
 import threading
+from typing import Optional
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import undetected_chromedriver as uc
 from bot.models import MeetJoinerConfig
 from media_players.media_stream import VirtualMediaStreamer
-from bot.audio_recorder import AudioRecorder
+from bot.audio_recorder import AudioRecorder, CHANNELS, RATE
+from bot.capture_bus import AudioCaptureBus
+from bot.join_flow import JoinFlow
+from bot.presence import PresenceMonitor
+from bot.browser_pool import launch_chrome
+from bot.page_state import read_page_state, wait_for_state
 from openai_voice_assistant.realtime_voice_bot import AudioWebSocketClient
+from openai_voice_assistant.async_realtime_client import AsyncAudioWebSocketClient
+from openai_voice_assistant.metrics import MetricsServer
+from openai_voice_assistant.response_cache import ResponseAudioCache
 import os
 
 API_KEY = os.environ.get("OPEN_API_KEY")
@@ -18,29 +25,76 @@ WS_URL = os.environ.get("OPEN_WS_URL")
 
 
 class GoogleMeetBot:
-    def __init__(self, config: MeetJoinerConfig):
+    def __init__(self, config: MeetJoinerConfig, browser_pool=None, device_pool=None):
         self.config = config
+        self.browser_pool = browser_pool  # Shared BrowserPool; None launches a fresh Chrome per meeting
+        self.device_pool = device_pool  # Shared DevicePool; None loads this bot's own modules
         self.driver = None
         self.media_stream_driver = None
         # self.recorder = record_audio()
         self.recording_thread = None
+        self.capture_bus = None
+        self.websocket_client = None
+        self.metrics_server = None
+        self.join_report = None
+        self.presence = None
+        self.response_cache = None
 
     def setup_driver(self):
-        chrome_options = Options()
-        chrome_options.add_argument("--use-fake-ui-for-media-stream")
-        self.driver = uc.Chrome(options=chrome_options)
+        started = time.perf_counter()
+        if self.browser_pool is not None:
+            self.driver = self.browser_pool.acquire()
+        else:
+            self.driver = launch_chrome()
+        print(f"Browser ready in {(time.perf_counter() - started) * 1000:.0f} ms.")
+
+    def release_driver(self):
+        """Hand the browser back to the pool (reset for the next meeting), or quit it."""
+        if self.driver is None:
+            return
+        driver, self.driver = self.driver, None
+        if self.browser_pool is not None:
+            self.browser_pool.release(driver)
+        else:
+            driver.quit()
 
     def start_websocket(self):
         """Start the WebSocket connection in a separate thread."""
-        self.websocket_client = AudioWebSocketClient(
+        client_class = (
+            AsyncAudioWebSocketClient
+            if self.config.use_async_client
+            else AudioWebSocketClient
+        )
+        if self.config.response_cache_dir and self.response_cache is None:
+            self.response_cache = ResponseAudioCache(
+                self.config.response_cache_dir,
+                max_bytes=self.config.response_cache_mb * 1024 * 1024,
+            )
+        self.websocket_client = client_class(
             api_key=API_KEY,  # Replace with your API key
             ws_url=WS_URL,  # Replace with your WebSocket URL
+            capture=self.capture_bus.subscribe(rate=24000, channels=1)
+            if self.capture_bus
+            else None,
+            session_id=self.config.meeting_url,
+            trace_path=self.config.trace_path,
+            transcript_path=self.config.transcript_path,
+            response_cache=self.response_cache,
         )
+        if self.config.metrics_port and self.metrics_server is None:
+            self.metrics_server = MetricsServer(port=self.config.metrics_port).start()
 
         self.websocket_thread = threading.Thread(target=self.websocket_client.run)
         self.websocket_thread.start()
         print("WebSocket started.")
 
+    def greet(self, timeout=10.0):
+        """Say ``config.greeting``; from the second meeting on it plays from the response cache."""
+        deadline = time.monotonic() + timeout
+        while not self.websocket_client.connected and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.websocket_client.speak(self.config.greeting)
+
     def stop_websocket(self):
         """Stop the WebSocket connection."""
         if self.websocket_client:
@@ -63,8 +117,17 @@ class GoogleMeetBot:
         except Exception as e:
             print(f"Error muting microphone or camera: {e}")
 
+    def prepare_devices(self, driver=None):
+        """Pre-join device setup, run by the join flow once the preview is ready."""
+        self.mute_audio_camera_before_join()
+        self.select_virtual_audio_devices()
+
     def select_virtual_audio_devices(self):
-        """Select both 'virtual_mic' and 'virtual_speaker' from Google Meet's dropdowns."""
+        """Select the bot's virtual mic and speaker from Google Meet's dropdowns."""
+        mic_name = self.media_stream_driver.mic_name if self.media_stream_driver else "virtual_mic"
+        speaker_name = (
+            self.media_stream_driver.speaker_name if self.media_stream_driver else "virtual_speaker"
+        )
         try:
             mic_button = WebDriverWait(self.driver, 10).until(
                 EC.element_to_be_clickable(
@@ -76,7 +139,7 @@ class GoogleMeetBot:
 
             virtual_mic_option = WebDriverWait(self.driver, 10).until(
                 EC.visibility_of_element_located(
-                    (By.XPATH, '//span[text()="virtual_mic"]')
+                    (By.XPATH, f'//span[text()="{mic_name}"]')
                 )
             )
             virtual_mic_option.click()
@@ -92,7 +155,7 @@ class GoogleMeetBot:
 
             virtual_speaker_option = WebDriverWait(self.driver, 10).until(
                 EC.visibility_of_element_located(
-                    (By.XPATH, '//span[text()="virtual_speaker"]')
+                    (By.XPATH, f'//span[text()="{speaker_name}"]')
                 )
             )
             virtual_speaker_option.click()
@@ -106,22 +169,22 @@ class GoogleMeetBot:
         actions.key_down(Keys.CONTROL).send_keys("d").key_up(Keys.CONTROL).perform()
         print("Microphone toggle (Ctrl + D) sent.")
 
-    def get_participant_count(self) -> int:
-        """Fetch the number of participants in the meeting."""
+    def snapshot(self):
+        """Current page state (join buttons, in-call marker, participants, mic/camera, dialogs) in one round-trip."""
+        return read_page_state(self.driver, self.config.bot_name)
+
+    def get_participant_count(self) -> Optional[int]:
+        """Fetch the number of participants in the meeting; None when it can't be read.
+
+        Callers must treat None as "unknown", never as an empty call.
+        """
         try:
-            sample_div = self.driver.find_element(
-                By.XPATH, '//div[contains(text(), "Contributors")]'
-            )
-            time.sleep(5)
-            contributor_count_element = sample_div.find_element(
-                By.XPATH, "following-sibling::*[1]"
-            )
-            contributor_count = contributor_count_element.text
+            contributor_count = self.snapshot().participant_count
             print(f"Contributor Count: {contributor_count}")
-            return int(contributor_count)
+            return contributor_count  # None while the panel isn't showing, like the push path
         except Exception as e:
             print(f"Error while fetching participant count: {e}")
-            return 0
+            return None  # A failed read is not a count of 0, which would make the bot leave
 
     def leave_meeting(self):
         """Leave the Google Meet session."""
@@ -135,92 +198,97 @@ class GoogleMeetBot:
 
     def is_in_meeting(self) -> bool:
         """Check if the bot has successfully joined the meeting."""
-        try:
-            WebDriverWait(self.driver, 20).until(
-                EC.presence_of_element_located(
-                    (By.XPATH, '//div[contains(text(), "Guest Bot")]')
-                )
-            )
-            print("Bot has joined the meeting.")
-            return True
-        except Exception as e:
-            print(f"Error detecting meeting: {e}")
+        state = wait_for_state(
+            self.driver, lambda state: state.bot_listed, 20, bot_name=self.config.bot_name
+        )
+        if state is None:
+            print("Error detecting meeting: bot not listed after 20s")
             return False
+        print("Bot has joined the meeting.")
+        return True
+
+    @staticmethod
+    def _teardown(step, action):
+        """Run one cleanup step; a failure is reported and never skips the steps after it."""
+        try:
+            action()
+        except BaseException as e:  # Including the SystemExit a supervisor's SIGTERM raises
+            print(f"Teardown: {step} failed: {e!r}")
 
     def join_meeting(self):
         """Join a Google Meet session."""
-        self.media_stream_driver = VirtualMediaStreamer(
-            self.config.video_url, self.config.audio_url
-        )
-        self.media_stream_driver.unload_modules()
-        self.media_stream_driver.load_virtual_audio_modules()
-
-        self.setup_driver()
+        started = time.perf_counter()
+        leased = None
+        recorder = None
         try:
-            self.driver.get(self.config.meeting_url)
-            time.sleep(5)
+            devices = self.config.devices
+            if devices is None and self.device_pool is not None:
+                devices = leased = self.device_pool.lease(owner=self.config.meeting_url)
+            self.media_stream_driver = VirtualMediaStreamer(
+                self.config.video_url,
+                self.config.audio_url,
+                instance_id=self.config.instance_id,
+                video_nr=self.config.video_nr,
+                devices=devices,
+            )
+            self.media_stream_driver.unload_modules()
+            self.media_stream_driver.load_virtual_audio_modules()
+            # Each bot gets its own camera (/dev/video<video_nr>); a leased DeviceSet already has one
+            self.media_stream_driver.create_virtual_cam()
+            print(f"Media devices ready in {(time.perf_counter() - started) * 1000:.0f} ms.")
 
-            try:
-                name_input = self.driver.find_element(
-                    By.XPATH, '//input[@aria-label="Your name"]'
-                )
-                name_input.send_keys("Guest Bot")
-                time.sleep(2)
-            except Exception:
-                print("No guest name required.")
+            self.setup_driver()
 
-            self.mute_audio_camera_before_join()
-            self.select_virtual_audio_devices()
+            # Each step waits on the page itself rather than a fixed sleep
+            self.join_report = JoinFlow(
+                self.driver,
+                bot_name=self.config.bot_name,
+                before_join=self.prepare_devices,
+                admission_timeout=self.config.admission_timeout,
+            ).run(self.config.meeting_url)
 
-            try:
-                ask_to_join_button = self.driver.find_element(
-                    By.XPATH, '//span[text()="Ask to join"]'
-                )
-                ask_to_join_button.click()
-                print("Clicked 'Ask to join'. Waiting for host approval...")
-                time.sleep(20)
-            except Exception:
-                try:
-                    join_button = self.driver.find_element(
-                        By.XPATH, '//span[text()="Join now"]'
-                    )
-                    join_button.click()
-                    print("Clicked 'Join now'.")
-                except Exception:
-                    print("Neither 'Ask to join' nor 'Join now' button found.")
-                    return
-
-            try:
-                self.driver.find_element(
-                    By.XPATH, "//button[@aria-label='People']"
-                ).click()
-                print("Opened participants list.")
-                time.sleep(2)
-            except Exception as e:
-                print(f"Error opening participants list: {e}")
-                return
-
-            if self.is_in_meeting():
+            if self.join_report.joined:
                 print("Joined the meeting.")
                 # self.start_recording()
-                recorder = AudioRecorder()
+                # One capture stream feeds both the recording and the AI input
+                self.capture_bus = AudioCaptureBus(rate=RATE, channels=CHANNELS)
+                recorder = AudioRecorder(
+                    source=self.capture_bus.subscribe(rate=RATE, channels=CHANNELS)
+                )
+                self.capture_bus.start()
                 recorder.start()
 
                 self.start_websocket()
+                if self.config.greeting:
+                    self.greet()
 
-                while True:
-                    if self.get_participant_count() < 2:
-                        print("Participant count dropped below 2. Leaving the meeting.")
-                        self.leave_meeting()
-                        break
+                # Participant changes are pushed from the page; get_participant_count
+                # polling is the fallback when DevTools isn't reachable
+                self.presence = PresenceMonitor(
+                    self.driver, poll=self.get_participant_count
+                ).start()
+                self.presence.wait_until(lambda count: count is not None and count < 2)
+                print("Participant count dropped below 2. Leaving the meeting.")
+                self.leave_meeting()
 
         except Exception as e:
             print(f"Error in meeting: {e}")
         finally:
-            recorder.stop()
-            self.stop_websocket()
-            self.media_stream_driver.unload_modules()
-            self.driver.quit()
+            # Every step runs even if an earlier one raises, so the device slot and Chrome are never leaked
+            if self.presence:
+                self._teardown("presence monitor", self.presence.stop)
+            if self.capture_bus:
+                self._teardown("capture bus", self.capture_bus.stop)
+            if recorder is not None:
+                self._teardown("recorder", recorder.stop)
+            self._teardown("websocket", self.stop_websocket)
+            if self.metrics_server:
+                self._teardown("metrics server", self.metrics_server.stop)
+            if self.media_stream_driver is not None:
+                self._teardown("media devices", self.media_stream_driver.unload_modules)
+            if leased is not None:
+                self._teardown("device lease", lambda: self.device_pool.release(leased))
+            self._teardown("browser", self.release_driver)
             print("Bot has left the meeting.")
 
     def start_recording(self):
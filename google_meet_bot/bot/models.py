@@ -1,9 +1,63 @@
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 
+class DeviceSet(BaseModel):
+    """One bot's pre-provisioned virtual devices, leased from a DevicePool."""
+
+    slot: int
+    instance_id: str
+    speaker_name: str  # Null sink the browser plays into
+    mic_name: str  # Remap source of the sink's monitor, picked as the browser mic
+    cam_label: str
+    video_nr: int
+    module_indices: List[int] = []  # PulseAudio modules that created the sink and source
+
+
 class MeetJoinerConfig(BaseModel):
     meeting_url: str
     video_url: str
     audio_url: str
+    use_async_client: bool = False  # Run the realtime session on asyncio instead of threads
+    metrics_port: Optional[int] = None  # Serve Prometheus turn metrics on this local port
+    trace_path: Optional[str] = None  # Append per-turn JSONL traces here when the session ends
+    transcript_path: Optional[str] = None  # Append-only JSONL transcript of the meeting
+    bot_name: str = "Guest Bot"  # Name typed on the pre-join screen
+    admission_timeout: float = 300  # Seconds to wait for the host to let the bot in
+    instance_id: Optional[str] = None  # Suffix for this bot's own audio/video devices (multi-bot hosts)
+    video_nr: int = 3  # v4l2loopback device number (/dev/videoN) for the bot's camera
+    devices: Optional[DeviceSet] = None  # Pre-provisioned devices; skips loading/unloading modules
+    response_cache_dir: Optional[str] = None  # Cache audio for phrases the bot speaks verbatim here
+    response_cache_mb: int = 200  # Size limit of that cache; least recently used entries go first
+    greeting: Optional[str] = None  # Said verbatim once the realtime session is up (cacheable)
+
+
+class JoinReport(BaseModel):
+    joined: bool
+    final_stage: str  # Last stage reached (in_meeting on success)
+    stage_ms: Dict[str, float]  # Time spent in each stage, in order
+    total_ms: float  # driver.get() to confirmed in-meeting (or failure)
+    join_to_in_meeting_ms: Optional[float] = None  # Join click to in-call UI
+    error: Optional[str] = None
+
+
+class PageState(BaseModel):
+    """One read of the Meet page, from a single execute_script round-trip."""
+
+    url: str = ""
+    loading: bool = True  # Neither the pre-join screen nor the call UI is up yet
+    name_input: bool = False  # Guest "Your name" field shown
+    ask_to_join: bool = False  # "Ask to join" button shown
+    join_now: bool = False  # "Join now" button shown
+    join_enabled: bool = False  # Whichever join button is shown is clickable
+    in_meeting: bool = False  # "Leave call" button shown
+    denied: bool = False  # Join request denied / unanswered / call unavailable
+    people_panel: bool = False  # Participants panel open
+    participant_count: Optional[int] = None
+    bot_listed: bool = False  # Bot's own name present in the page
+    mic_on: Optional[bool] = None  # None when no microphone toggle is shown
+    camera_on: Optional[bool] = None
+    dialogs: List[str] = []  # Visible dialog labels/text, truncated
+    read_ms: float = 0.0  # Round-trip time of the read
 
 
 class AudioRecorderConfig(BaseModel):
@@ -0,0 +1,108 @@
+import time
+from selenium.common.exceptions import WebDriverException
+from bot.models import PageState
+
+# Everything the bot checks on the page, read in one script. Selectors and
+# texts mirror the locators in join_flow.py.
+SNAPSHOT_JS = r"""
+const botName = arguments[0];
+const visible = (el) => !!el && el.getClientRects().length > 0;
+const first = (xpath) => {
+  const nodes = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+  for (let i = 0; i < nodes.snapshotLength; i++) {
+    if (visible(nodes.snapshotItem(i))) return nodes.snapshotItem(i);
+  }
+  return null;
+};
+const joinButton = (label) => {
+  const span = first(`//span[text()="${label}"]`);
+  if (!span) return null;
+  const button = span.closest("button");
+  return {enabled: !(button && button.disabled)};
+};
+const toggle = (device) => {
+  if (visible(document.querySelector(`[aria-label^="Turn off ${device}"]`))) return true;
+  if (visible(document.querySelector(`[aria-label^="Turn on ${device}"]`))) return false;
+  return null;
+};
+
+const ask = joinButton("Ask to join");
+const now = joinButton("Join now");
+const nameInput = visible(document.querySelector('input[aria-label="Your name"]'));
+const inMeeting = visible(document.querySelector('button[aria-label*="Leave call"]'));
+const contributors = first('//div[contains(text(), "Contributors")]');
+let count = null;
+if (contributors && contributors.nextElementSibling) {
+  const value = parseInt(contributors.nextElementSibling.textContent, 10);
+  if (!Number.isNaN(value)) count = value;
+}
+const denied = first('//*[contains(text(), "denied your request") or '
+  + 'contains(text(), "No one responded to your request") or '
+  + 'contains(text(), "You can\'t join this call")]');
+const dialogs = Array.from(document.querySelectorAll('[role="dialog"], [role="alertdialog"]'))
+  .filter(visible)
+  .map((d) => (d.getAttribute("aria-label") || d.innerText || "").trim().slice(0, 200));
+
+return {
+  url: location.href,
+  loading: !(nameInput || ask || now || inMeeting || denied),
+  name_input: nameInput,
+  ask_to_join: !!ask,
+  join_now: !!now,
+  join_enabled: !!((ask && ask.enabled) || (now && now.enabled)),
+  in_meeting: inMeeting,
+  denied: !!denied,
+  people_panel: !!contributors,
+  participant_count: count,
+  bot_listed: !!(botName && first(`//div[contains(text(), ${JSON.stringify(botName)})]`)),
+  mic_on: toggle("microphone"),
+  camera_on: toggle("camera"),
+  dialogs: dialogs,
+};
+"""
+
+
+def read_page_state(driver, bot_name=None) -> PageState:
+    """Snapshot the page in a single chromedriver round-trip."""
+    started = time.perf_counter()
+    raw = driver.execute_script(SNAPSHOT_JS, bot_name)
+    return PageState(**(raw or {}), read_ms=round((time.perf_counter() - started) * 1000, 2))
+
+
+def wait_for_state(driver, predicate, timeout, bot_name=None, poll_interval=0.1):
+    """Snapshot every ``poll_interval`` until ``predicate(state)`` holds; returns that state or None."""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            state = read_page_state(driver, bot_name)
+            if predicate(state):
+                return state
+        except WebDriverException:
+            pass  # Mid-navigation; the next tick sees the new document
+        if time.monotonic() >= deadline:
+            return None
+        time.sleep(poll_interval)
+
+
+class CommandCounter:
+    """Counts chromedriver commands (HTTP round-trips) issued through ``driver``.
+
+    Every WebDriver and WebElement call funnels through ``driver.execute``, so
+    wrapping it on the instance catches all of them.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.count = 0
+        self._execute = driver.execute
+
+    def _counted(self, *args, **kwargs):
+        self.count += 1
+        return self._execute(*args, **kwargs)
+
+    def __enter__(self):
+        self.driver.execute = self._counted
+        return self
+
+    def __exit__(self, *exc):
+        del self.driver.execute  # Back to the class method
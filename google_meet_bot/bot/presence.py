@@ -0,0 +1,244 @@
+import collections
+import itertools
+import json
+import queue
+import threading
+import time
+import urllib.request
+import websocket
+
+BINDING = "__meetPresence"
+
+# Injected into the page: watches the DOM and reports participant count changes
+# through the CDP binding. Mutation bursts are coalesced so Meet's constant
+# UI churn costs at most one count read per ``throttle_ms``.
+OBSERVER_JS = """
+(() => {
+  const binding = window[%(binding)s];
+  if (typeof binding !== "function") return "no-binding";
+  if (window.__meetPresenceObserver) window.__meetPresenceObserver.disconnect();
+  let last = undefined;
+  let scheduled = false;
+  const read = () => {
+    const label = document.evaluate(
+      '//div[contains(text(), "Contributors")]', document, null,
+      XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    const value = label && label.nextElementSibling
+      ? parseInt(label.nextElementSibling.textContent, 10) : NaN;
+    return Number.isNaN(value) ? null : value;
+  };
+  const report = () => {
+    scheduled = false;
+    const count = read();
+    if (count !== last) {
+      last = count;
+      binding(JSON.stringify({count: count, t: Date.now()}));
+    }
+  };
+  const observer = new MutationObserver(() => {
+    if (!scheduled) { scheduled = true; setTimeout(report, %(throttle_ms)d); }
+  });
+  const start = () => {
+    observer.observe(document.body, {subtree: true, childList: true, characterData: true});
+    report();
+  };
+  window.__meetPresenceObserver = observer;
+  // Registered for new documents too, where it runs before <body> exists
+  if (document.body) start();
+  else document.addEventListener("DOMContentLoaded", start);
+  return "ok";
+})()
+"""
+
+
+class CDPSession:
+    """Minimal DevTools protocol client on its own websocket (alongside chromedriver's)."""
+
+    def __init__(self, ws_url, on_event):
+        # Chrome rejects DevTools websockets that send an Origin it doesn't allow
+        self.ws = websocket.create_connection(ws_url, timeout=10, suppress_origin=True)
+        self.ws.settimeout(None)
+        self.on_event = on_event
+        self.closed = threading.Event()
+        self._ids = itertools.count(1)
+        self._replies = {}
+        self._lock = threading.Lock()
+        self.thread = threading.Thread(target=self._read_loop, daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def for_driver(cls, driver, on_event):
+        """Attach to the page target of a chromedriver/uc.Chrome session."""
+        address = driver.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+        if not address:
+            raise RuntimeError("driver exposes no DevTools debugger address")
+        with urllib.request.urlopen(f"http://{address}/json/list", timeout=5) as response:
+            targets = [t for t in json.load(response) if t.get("type") == "page"]
+        if not targets:
+            raise RuntimeError("no page target to attach to")
+        current = driver.current_url
+        target = next((t for t in targets if t.get("url") == current), targets[0])
+        return cls(target["webSocketDebuggerUrl"], on_event)
+
+    def _read_loop(self):
+        try:
+            while True:
+                message = json.loads(self.ws.recv())
+                if "id" in message:
+                    with self._lock:
+                        waiter = self._replies.pop(message["id"], None)
+                    if waiter is not None:
+                        waiter[1] = message
+                        waiter[0].set()
+                else:
+                    self.on_event(message.get("method"), message.get("params", {}))
+        except (websocket.WebSocketException, OSError, ValueError):
+            pass
+        finally:
+            self.closed.set()
+            self.on_event("session.closed", {})
+
+    def send(self, method, params=None, timeout=10):
+        message_id = next(self._ids)
+        waiter = [threading.Event(), None]
+        with self._lock:
+            self._replies[message_id] = waiter
+        self.ws.send(json.dumps({"id": message_id, "method": method, "params": params or {}}))
+        if not waiter[0].wait(timeout):
+            raise TimeoutError(f"CDP {method} timed out")
+        reply = waiter[1]
+        if "error" in reply:
+            raise RuntimeError(f"CDP {method} failed: {reply['error'].get('message')}")
+        return reply.get("result", {})
+
+    def close(self):
+        try:
+            self.ws.close()
+        except (websocket.WebSocketException, OSError):
+            pass
+        self.closed.wait(2)
+
+
+class PresenceMonitor:
+    """Participant count, pushed from the page as it changes.
+
+    The count is pushed through a CDP ``Runtime.addBinding`` callback driven by
+    an injected MutationObserver. The script is also registered for new
+    documents, so reloads keep reporting. The Runtime domain is never enabled
+    (pages can detect it); bindings report without it, and the current page
+    gets the script through chromedriver's own ``execute_script``. If DevTools
+    is unavailable, or the session drops, the monitor falls back to calling
+    ``poll`` (the old XPath read) every ``poll_interval`` seconds. The CDP
+    reader and the poller both publish under one condition. Either way,
+    consumers call ``wait_for_change`` or ``wait_until``.
+    """
+
+    def __init__(self, driver, poll=None, poll_interval=5.0, throttle_ms=100, push=True):
+        self.driver = driver
+        self.push = push  # False skips DevTools and polls from the start
+        self.poll = poll
+        self.poll_interval = poll_interval
+        self.throttle_ms = throttle_ms
+        self.count = None
+        self.mode = None  # "push" or "poll"
+        self.changes = 0
+        self.latencies_ms = collections.deque(maxlen=1000)  # Page mutation → Python, push mode only
+        self._events = queue.SimpleQueue()
+        self._cond = threading.Condition()
+        self._session = None
+        self._stopped = threading.Event()
+        self._poll_thread = None
+
+    def start(self):
+        try:
+            if not self.push:
+                raise RuntimeError("push disabled")
+            self._start_push()
+            self.mode = "push"
+            print("Presence monitor: push mode (MutationObserver via CDP binding).")
+        except Exception as e:
+            print(f"Presence monitor: push unavailable ({e}); polling every {self.poll_interval}s.")
+            if self._session is not None:
+                self._stopped.set()  # Don't treat our own close as a lost session
+                self._session.close()
+                self._session = None
+                self._stopped.clear()
+            self._start_poll()
+        return self
+
+    def _start_push(self):
+        self._session = CDPSession.for_driver(self.driver, self._on_cdp_event)
+        # Bindings report Runtime.bindingCalled without Runtime.enable
+        self._session.send("Runtime.addBinding", {"name": BINDING})
+        script = OBSERVER_JS % {"binding": json.dumps(BINDING), "throttle_ms": self.throttle_ms}
+        self._session.send("Page.addScriptToEvaluateOnNewDocument", {"source": script})
+        result = self.driver.execute_script("return " + script)
+        if result != "ok":
+            raise RuntimeError(f"observer injection returned {result!r}")
+
+    def _on_cdp_event(self, method, params):
+        if method == "Runtime.bindingCalled" and params.get("name") == BINDING:
+            payload = json.loads(params["payload"])
+            self.latencies_ms.append(time.time() * 1000 - payload["t"])
+            self._publish(payload["count"])
+        elif method == "session.closed" and not self._stopped.is_set():
+            print("Presence monitor: DevTools session lost; falling back to polling.")
+            self._start_poll()
+
+    def _start_poll(self):
+        with self._cond:
+            self.mode = "poll"
+            if self.poll is None or self._poll_thread is not None:
+                return
+            self._poll_thread = threading.Thread(target=self._poll_loop, daemon=True)
+        self._poll_thread.start()
+
+    def _poll_loop(self):
+        while not self._stopped.is_set():
+            self._publish(self.poll())
+            self._stopped.wait(self.poll_interval)
+
+    def _publish(self, count):
+        with self._cond:
+            if count != self.count:
+                self.count = count
+                self.changes += 1
+                self._events.put(count)
+                self._cond.notify_all()
+
+    def wait_for_change(self, timeout=None):
+        """Block until the count changes; returns the new count, or None on timeout."""
+        try:
+            return self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def wait_until(self, predicate, timeout=None):
+        """Block until ``predicate(count)`` holds for a known count; returns that count (None on timeout)."""
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._stopped.is_set() or (self.count is not None and predicate(self.count)),
+                timeout,
+            )
+            if self.count is not None and predicate(self.count):
+                return self.count
+            return None
+
+    def stats(self):
+        ordered = sorted(self.latencies_ms)
+        return {
+            "mode": self.mode,
+            "changes": self.changes,
+            "push_latency_ms_p50": round(ordered[len(ordered) // 2], 1) if ordered else None,
+            "push_latency_ms_max": round(ordered[-1], 1) if ordered else None,
+        }
+
+    def stop(self):
+        with self._cond:
+            self._stopped.set()
+            self._cond.notify_all()
+        if self._session is not None:
+            self._session.close()
+        if self._poll_thread is not None:
+            self._poll_thread.join(timeout=self.poll_interval + 1)
+        print(f"Presence monitor stats: {self.stats()}")
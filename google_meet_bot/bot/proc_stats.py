@@ -0,0 +1,50 @@
+import os
+
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK")
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+def _read_stat(pid):
+    """(ppid, utime + stime ticks, rss pages) from /proc/<pid>/stat, or None if it exited."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            # The command name may contain spaces and parens; fields resume after the last ")"
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return int(fields[1]), int(fields[11]) + int(fields[12]), int(fields[21])
+
+
+def process_tree(*root_pids):
+    """PIDs of ``root_pids`` and all their live descendants, with their /proc stats."""
+    stats = {}
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            stat = _read_stat(int(entry))
+            if stat is not None:
+                stats[int(entry)] = stat
+    tree = {pid for pid in root_pids if pid in stats}
+    while True:
+        children = {pid for pid, stat in stats.items() if stat[0] in tree} - tree
+        if not children:
+            return {pid: stats[pid] for pid in tree}
+        tree |= children
+
+
+def tree_cpu_seconds(*root_pids):
+    """User + system CPU seconds used so far by the process trees."""
+    return sum(stat[1] for stat in process_tree(*root_pids).values()) / CLOCK_TICKS
+
+
+def tree_rss_mb(*root_pids):
+    """Resident memory of the process trees, in MiB (shared pages counted per process)."""
+    return sum(stat[2] for stat in process_tree(*root_pids).values()) * PAGE_SIZE / (1024 * 1024)
+
+
+def driver_pids(driver):
+    """Root PIDs of a Selenium/uc.Chrome session: the browser (uc launches it itself) and chromedriver."""
+    pids = [getattr(driver, "browser_pid", None)]
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    pids.append(getattr(process, "pid", None))
+    return [pid for pid in pids if pid]
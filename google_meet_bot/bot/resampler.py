@@ -0,0 +1,130 @@
+import time
+from functools import lru_cache
+from math import gcd
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+@lru_cache(maxsize=None)
+def polyphase_filter_bank(up, down, taps_per_phase=24, beta=8.0):
+    """Design (once per rate pair) a Kaiser-windowed sinc low-pass split into ``up`` phases.
+
+    Returns a read-only float32 array of shape (up, taps_per_phase) whose rows are
+    time-reversed so they can be dotted directly with a sliding input window.
+    """
+    length = up * taps_per_phase
+    cutoff = 0.5 / max(up, down) * 0.92  # Fraction of the upsampled rate, with a guard band
+    n = np.arange(length) - (length - 1) / 2.0
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, beta)
+    h *= up / h.sum()  # Unity DC gain after zero-stuffing
+
+    bank = h.reshape(taps_per_phase, up).T[:, ::-1].astype(np.float32)
+    bank.setflags(write=False)
+    return bank
+
+
+class PolyphaseResampler:
+    """Stateful rational-ratio resampler for (frames, channels) float32 blocks.
+
+    Filter history and the fractional output phase carry over between calls, so
+    feeding a signal in arbitrary chunk sizes gives the same result as one call.
+    """
+
+    def __init__(self, src_rate, dst_rate, channels=1, taps_per_phase=24):
+        g = gcd(src_rate, dst_rate)
+        self.up = dst_rate // g
+        self.down = src_rate // g
+        self.channels = channels
+        self.taps = taps_per_phase
+        self.bank = polyphase_filter_bank(self.up, self.down, taps_per_phase)
+        self._history = np.zeros((taps_per_phase - 1, channels), dtype=np.float32)
+        self._t = 0  # Next output position on the upsampled time grid, relative to this block
+
+    def process(self, block):
+        frames = len(block)
+        if frames == 0:
+            return np.zeros((0, self.channels), dtype=np.float32)
+
+        span = frames * self.up
+        n_out = max(0, -(-(span - self._t) // self.down))
+        t = self._t + self.down * np.arange(n_out, dtype=np.int64)
+        src_index = t // self.up
+        phase = t % self.up
+
+        extended = np.concatenate([self._history, block.astype(np.float32, copy=False)])
+        windows = sliding_window_view(extended, self.taps, axis=0)  # (frames, channels, taps)
+        out = np.einsum("nct,nt->nc", windows[src_index], self.bank[phase], optimize=True)
+
+        self._history = extended[-(self.taps - 1):]
+        self._t = self._t + n_out * self.down - span
+        return out
+
+    def reset(self):
+        self._history[:] = 0
+        self._t = 0
+
+
+class AudioConverter:
+    """int16 → int16 conversion between two (rate, channels) formats.
+
+    Stereo input is downmixed before resampling so the filter runs on as few
+    channels as possible.
+    """
+
+    def __init__(self, src_rate, src_channels, dst_rate, dst_channels, taps_per_phase=24):
+        self.src_rate = src_rate
+        self.src_channels = src_channels
+        self.dst_rate = dst_rate
+        self.dst_channels = dst_channels
+        work_channels = 1 if dst_channels == 1 or src_channels == 1 else src_channels
+        self.work_channels = work_channels
+        self.resampler = None
+        if src_rate != dst_rate:
+            self.resampler = PolyphaseResampler(
+                src_rate, dst_rate, channels=work_channels, taps_per_phase=taps_per_phase
+            )
+
+    def process(self, block):
+        """Convert an int16 block of shape (frames, src_channels) or raw bytes."""
+        if not isinstance(block, np.ndarray):
+            block = np.frombuffer(block, dtype=np.int16).reshape(-1, self.src_channels)
+
+        if self.resampler is None and self.src_channels == self.dst_channels:
+            return block
+
+        if self.work_channels == 1 and self.src_channels > 1:
+            samples = block.mean(axis=1, dtype=np.float32)[:, None]
+        else:
+            samples = block.astype(np.float32)
+
+        if self.resampler is not None:
+            samples = self.resampler.process(samples)
+
+        if samples.shape[1] != self.dst_channels:
+            samples = np.repeat(samples, self.dst_channels, axis=1)
+
+        return np.clip(np.rint(samples), -32768, 32767).astype(np.int16)
+
+
+def benchmark(seconds=60, block_ms=(20, 100, 1000)):
+    """Print conversion throughput in seconds of audio per CPU-second."""
+    src_rate, dst_rate = 44100, 24000
+    t = np.arange(src_rate * seconds) / src_rate
+    tone = (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16)
+    stereo = np.stack([tone, tone], axis=1)
+
+    for ms in block_ms:
+        converter = AudioConverter(src_rate, 2, dst_rate, 1)
+        step = src_rate * ms // 1000
+        start = time.process_time()
+        for i in range(0, len(stereo), step):
+            converter.process(stereo[i : i + step])
+        cpu = time.process_time() - start
+        print(
+            f"{src_rate} Hz stereo -> {dst_rate} Hz mono, {ms} ms blocks: "
+            f"{seconds / cpu:.0f}x real time ({cpu * 1000 / seconds:.2f} ms CPU per audio second)"
+        )
+
+
+if __name__ == "__main__":
+    benchmark()
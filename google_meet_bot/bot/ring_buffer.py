@@ -0,0 +1,114 @@
+import threading
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Preallocated single-producer/single-consumer ring of interleaved PCM frames.
+
+    The producer (usually a PortAudio callback) copies into the ring; the consumer
+    reads zero-copy memoryview slices with ``peek`` and releases them with
+    ``consume``. When the ring is full, incoming audio is dropped rather than
+    overwriting data a consumer may still be reading, and counted as an overrun.
+    """
+
+    def __init__(self, capacity_frames, channels=1, dtype=np.int16):
+        self.capacity = int(capacity_frames)
+        self.channels = channels
+        self.dtype = np.dtype(dtype)
+        self.frame_bytes = self.channels * self.dtype.itemsize
+        self.buffer = np.zeros((self.capacity, channels), dtype=self.dtype)
+        self._flat = memoryview(self.buffer.reshape(-1).view(np.uint8))
+
+        # Monotonic frame positions; the fill level is write_pos - read_pos.
+        self.write_pos = 0
+        self.read_pos = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # Counters
+        self.overruns = 0  # Number of writes that could not fit completely
+        self.dropped_frames = 0
+        self.high_water = 0  # Highest fill level observed, in frames
+
+    @property
+    def closed(self):
+        return self._closed
+
+    @property
+    def available(self):
+        """Frames written but not yet consumed."""
+        return self.write_pos - self.read_pos
+
+    def write(self, data):
+        """Copy raw PCM bytes into the ring. Returns the number of frames stored."""
+        src = np.frombuffer(data, dtype=self.dtype)
+        frames = len(src) // self.channels
+        free = self.capacity - (self.write_pos - self.read_pos)
+        if frames > free:
+            self.overruns += 1
+            self.dropped_frames += frames - free
+            frames = free
+        if frames == 0:
+            return 0
+
+        src = src[: frames * self.channels].reshape(frames, self.channels)
+        start = self.write_pos % self.capacity
+        first = min(frames, self.capacity - start)
+        self.buffer[start : start + first] = src[:first]
+        if first < frames:
+            self.buffer[: frames - first] = src[first:]
+
+        with self._cond:
+            self.write_pos += frames
+            fill = self.write_pos - self.read_pos
+            if fill > self.high_water:
+                self.high_water = fill
+            self._cond.notify()
+        return frames
+
+    def wait(self, min_frames=1, timeout=None):
+        """Block until at least ``min_frames`` are available or the ring is closed."""
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._closed or self.available >= min_frames, timeout
+            ) and self.available >= min_frames
+
+    def peek(self, max_frames=None):
+        """Return up to ``max_frames`` unread frames as one or two memoryviews of bytes."""
+        count = self.available
+        if max_frames is not None:
+            count = min(count, max_frames)
+        if count <= 0:
+            return []
+
+        start = self.read_pos % self.capacity
+        first = min(count, self.capacity - start)
+        fb = self.frame_bytes
+        views = [self._flat[start * fb : (start + first) * fb]]
+        if first < count:
+            views.append(self._flat[: (count - first) * fb])
+        return views
+
+    def consume(self, frames):
+        """Release ``frames`` previously returned by ``peek``."""
+        with self._cond:
+            self.read_pos += min(frames, self.available)
+
+    def clear(self):
+        with self._cond:
+            self.read_pos = self.write_pos
+
+    def close(self):
+        """Wake any waiting consumer; remaining frames can still be drained."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "available": self.available,
+            "high_water": self.high_water,
+            "overruns": self.overruns,
+            "dropped_frames": self.dropped_frames,
+        }
@@ -0,0 +1,241 @@
+import argparse
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from bot.models import MeetJoinerConfig
+from bot.proc_stats import tree_cpu_seconds, tree_rss_mb
+
+
+def _shutdown(signum, frame):
+    """SIGTERM/SIGINT in a worker: unwind join_meeting so its teardown runs."""
+    # Only once; a second signal would cut the teardown short
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    raise SystemExit(128 + signum)
+
+
+def _worker(run, config_data):
+    """Worker process entry point: ``run(config_data)`` with the shutdown handlers installed."""
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+    run(config_data)
+
+
+def _run_bot(config_data):
+    """One bot, routed to its own devices."""
+    # Imported in the worker so each bot gets its own PortAudio host, Chrome and event loops
+    from bot.meet_joiner_v2 import GoogleMeetBot
+    from media_players.media_stream import VirtualMediaStreamer
+
+    config = MeetJoinerConfig(**config_data)
+    # Set before anything opens audio: PortAudio and the browser read PULSE_SINK/PULSE_SOURCE at start-up
+    os.environ.update(
+        VirtualMediaStreamer(instance_id=config.instance_id, devices=config.devices).audio_env()
+    )
+    GoogleMeetBot(config).join_meeting()
+
+
+class BotUsage:
+    def __init__(self, slot, config):
+        self.slot = slot
+        self.config = config
+        self.process = None
+        self.started = None
+        self.ended = None
+        self.cpu_seconds = 0.0
+        self.peak_rss_mb = 0.0
+        self.samples = []  # CPU % per sample interval
+        self.last_cpu = 0.0  # Process tree CPU seconds at the previous reading
+        self.sampled = False  # First interval is partial (the bot started mid-interval)
+
+    def row(self):
+        wall = (self.ended or time.monotonic()) - self.started
+        ordered = sorted(self.samples)
+        return {
+            "bot": self.config.instance_id,
+            "meeting": self.config.meeting_url,
+            "wall_s": round(wall, 1),
+            "cpu_pct_avg": round(self.cpu_seconds / wall * 100, 1) if wall > 0 else None,
+            "cpu_pct_p95": round(ordered[int(len(ordered) * 0.95)], 1) if ordered else None,
+            "peak_rss_mb": round(self.peak_rss_mb),
+            "exitcode": self.process.exitcode if self.process else None,
+        }
+
+
+class BotSupervisor:
+    """Runs many meeting bots on one host, one worker process per bot.
+
+    Each bot gets a slot, and the slot gives it isolated devices: instance_id
+    ``bot<slot>`` (so virtual_speaker_bot<slot> / virtual_mic_bot<slot>) and
+    camera /dev/video<video_base + slot>. With a ``device_pool``, it gets a
+    leased pre-provisioned DeviceSet instead. The worker sets PULSE_SINK and
+    PULSE_SOURCE (the speaker's monitor) for itself and the Chrome it
+    launches. Processes rather than threads, because the Pulse environment
+    and PortAudio's device choice are per process. At most ``max_bots`` run
+    at once; the rest queue. Every ``sample_interval`` seconds the supervisor
+    reads each worker's /proc process tree (bot, Chrome, ffmpeg) for CPU and
+    RSS. Bots may be submitted before or after ``start``; the supervisor runs
+    until ``stop``.
+    """
+
+    def __init__(self, max_bots=4, video_base=10, sample_interval=2.0, device_pool=None, run=_run_bot):
+        self.max_bots = max_bots
+        self.run = run  # Module-level function (spawned workers import it) taking the config dict
+        self.device_pool = device_pool
+        self.video_base = video_base
+        self.sample_interval = sample_interval
+        self.pending = []
+        self.running = {}  # slot -> BotUsage
+        self.finished = []
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._drained = threading.Event()  # Set while nothing is running or queued
+        self._thread = None
+
+    def submit(self, config: MeetJoinerConfig):
+        with self._lock:
+            self.pending.append(config)
+            self._drained.clear()
+
+    def _start_pending(self):
+        free = [slot for slot in range(self.max_bots) if slot not in self.running]
+        while free and self.pending:
+            slot = free.pop(0)
+            update = {"instance_id": f"bot{slot}", "video_nr": self.video_base + slot}
+            if self.device_pool is not None:
+                try:
+                    devices = self.device_pool.lease(owner=f"bot{slot}")
+                except RuntimeError:
+                    return  # Every device set is out; retry once a bot exits
+                update = {"instance_id": devices.instance_id, "video_nr": devices.video_nr,
+                          "devices": devices}
+            config = self.pending.pop(0).model_copy(update=update)
+            usage = BotUsage(slot, config)
+            usage.process = self._context.Process(
+                target=_worker, args=(self.run, config.model_dump()), name=f"meet-bot-{slot}"
+            )
+            usage.process.start()
+            usage.started = time.monotonic()
+            usage.last_cpu = tree_cpu_seconds(usage.process.pid) or 0.0  # Baseline
+            self.running[slot] = usage
+            print(f"Supervisor: started bot{slot} (pid {usage.process.pid}) for {config.meeting_url}")
+
+    def _sample(self, usage, interval):
+        pid = usage.process.pid
+        cpu = tree_cpu_seconds(pid)
+        if cpu:
+            # A tree's CPU only grows; a drop means children exited and took their time with them
+            used = max(cpu - usage.last_cpu, 0.0)
+            usage.cpu_seconds += used
+            if usage.sampled:
+                usage.samples.append(used / interval * 100)
+            usage.sampled = True
+            usage.peak_rss_mb = max(usage.peak_rss_mb, tree_rss_mb(pid))
+            usage.last_cpu = cpu
+
+    def _loop(self):
+        while True:
+            with self._lock:
+                for slot, usage in list(self.running.items()):
+                    if not usage.process.is_alive():
+                        usage.process.join()
+                        usage.ended = time.monotonic()
+                        self.finished.append(self.running.pop(slot))
+                        if usage.config.devices is not None:
+                            self.device_pool.release(usage.config.devices)
+                        print(f"Supervisor: bot{slot} exited ({usage.process.exitcode}): {usage.row()}")
+                if not self._stopped.is_set():
+                    self._start_pending()
+                if not self.running and not self.pending:
+                    self._drained.set()
+                    if self._stopped.is_set():
+                        return
+                for usage in self.running.values():
+                    self._sample(usage, self.sample_interval)
+            time.sleep(self.sample_interval)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def wait(self, timeout=None):
+        """Block until every submitted bot has finished; returns whether they have."""
+        return self._drained.wait(timeout)
+
+    def stop(self, timeout=30.0):
+        """Stop starting new bots and shut the running ones down.
+
+        Each worker gets SIGTERM, which its handler turns into SystemExit so
+        join_meeting's teardown runs (devices released, Chrome quit). Workers
+        still alive after ``timeout`` seconds are killed.
+        """
+        self._stopped.set()
+        with self._lock:
+            self.pending.clear()
+            processes = [usage.process for usage in self.running.values()]
+        for process in processes:
+            process.terminate()
+        deadline = time.monotonic() + timeout
+        for process in processes:
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                print(f"Supervisor: {process.name} did not exit within {timeout:.0f}s; killing it.")
+                process.kill()
+        if self._thread is not None:
+            self._thread.join()
+
+    def report(self, headroom=0.8):
+        """Per-bot usage table plus how many bots this host could run at ``headroom`` utilisation."""
+        with self._lock:
+            rows = [usage.row() for usage in self.finished + list(self.running.values())]
+        for row in rows:
+            print(
+                f"{row['bot']:<6} cpu avg {row['cpu_pct_avg']}% p95 {row['cpu_pct_p95']}%  "
+                f"peak rss {row['peak_rss_mb']} MB  wall {row['wall_s']} s  exit {row['exitcode']}"
+            )
+        cpu = [row["cpu_pct_p95"] for row in rows if row["cpu_pct_p95"]]
+        rss = [row["peak_rss_mb"] for row in rows if row["peak_rss_mb"]]
+        if not cpu or not rss:
+            return rows
+        with open("/proc/meminfo") as f:
+            mem_total_mb = int(f.readline().split()[1]) / 1024
+        by_cpu = int(os.cpu_count() * 100 * headroom / max(cpu))
+        by_mem = int(mem_total_mb * headroom / max(rss))
+        print(
+            f"Host sizing at {headroom:.0%}: {min(by_cpu, by_mem)} bots "
+            f"(CPU allows {by_cpu} on {os.cpu_count()} cores, memory {by_mem} in {mem_total_mb:.0f} MB)"
+        )
+        return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run several meeting bots on this host")
+    parser.add_argument("meeting_urls", nargs="+", help="One bot per URL (repeat a URL for several bots)")
+    parser.add_argument("--max-bots", type=int, default=4)
+    parser.add_argument("--video", default="", help="Video file for the virtual cameras")
+    parser.add_argument("--audio", default="", help="Audio file for the virtual mics")
+    parser.add_argument("--device-pool", action="store_true", help="Provision every bot's devices up front")
+    args = parser.parse_args()
+
+    device_pool = None
+    if args.device_pool:
+        from media_players.device_pool import DevicePool
+
+        device_pool = DevicePool(size=args.max_bots).provision()
+    supervisor = BotSupervisor(max_bots=args.max_bots, device_pool=device_pool)
+    for url in args.meeting_urls:
+        supervisor.submit(MeetJoinerConfig(meeting_url=url, video_url=args.video, audio_url=args.audio))
+    supervisor.start()
+    try:
+        supervisor.wait()
+    except KeyboardInterrupt:
+        pass  # The workers got the SIGINT too and are already tearing down
+    finally:
+        supervisor.stop()
+    supervisor.report()
+    if device_pool is not None:
+        device_pool.shutdown()
@@ -0,0 +1,161 @@
+import collections
+import numpy as np
+
+
+def frame_dbfs(data):
+    """RMS level of int16 PCM (bytes or array) in dBFS."""
+    samples = np.frombuffer(data, dtype=np.int16) if not isinstance(data, np.ndarray) else data
+    if not len(samples):
+        return -100.0
+    x = samples.astype(np.float32) / 32768.0
+    return float(10.0 * np.log10(np.mean(x * x) + 1e-10))
+
+
+class StreamingVAD:
+    """Frame-level voice activity detector for streaming int16 audio.
+
+    Each ``frame_ms`` frame gets two vectorized features: energy in dBFS and zero
+    crossing rate. A noise floor tracks the background level (fast down, slow up)
+    so the detector adapts to the room, and hysteresis keeps decisions stable:
+    speech starts after ``min_speech_ms`` of frames ``start_db`` above the floor,
+    and ends after ``hangover_ms`` of frames no longer ``stop_db`` above it.
+
+    The floor is seeded from the quietest of the first ``seed_ms`` of frames,
+    and is never below the quietest frame of the last ``floor_window_ms``,
+    in speech or not. Speech has gaps between syllables and breaths, steady
+    noise does not, so a hum or fan that starts mid-stream lifts the floor
+    within one window and ends the "utterance" it triggered.
+    """
+
+    def __init__(
+        self,
+        rate=24000,
+        channels=1,
+        frame_ms=20,
+        start_db=10.0,
+        stop_db=6.0,
+        min_speech_ms=60,
+        hangover_ms=300,
+        min_speech_dbfs=-50.0,
+        max_zcr=0.45,
+        floor_rise=0.02,
+        initial_floor_dbfs=-60.0,
+        seed_ms=200,
+        floor_window_ms=3000,
+    ):
+        self.rate = rate
+        self.channels = channels
+        self.frame_ms = frame_ms
+        self.frame_len = max(1, int(rate * frame_ms / 1000))
+        self.start_db = start_db
+        self.stop_db = stop_db
+        self.min_speech_frames = max(1, round(min_speech_ms / frame_ms))
+        self.hangover_frames = max(1, round(hangover_ms / frame_ms))
+        self.min_speech_dbfs = min_speech_dbfs
+        self.max_zcr = max_zcr  # Broadband noise crosses zero far more often than voice
+        self.floor_rise = floor_rise
+        self.noise_floor = initial_floor_dbfs
+        self.seed_frames = max(1, round(seed_ms / frame_ms))
+        self.floor_window_frames = max(1, round(floor_window_ms / frame_ms))
+        self._window = collections.deque()  # (frame number, energy), energies increasing
+
+        self.in_speech = False
+        self.frames_seen = 0
+        self._run = 0  # Consecutive frames pushing toward the other state
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self.last_active_frame = None
+
+    @property
+    def time(self):
+        """Seconds of audio processed so far."""
+        return self.frames_seen * self.frame_len / self.rate
+
+    def features(self, frames):
+        """Energy (dBFS) and zero-crossing rate for an (n, frame_len) int16 array."""
+        x = frames.astype(np.float32) / 32768.0
+        energy = 10.0 * np.log10(np.mean(x * x, axis=1) + 1e-10)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (frames.shape[1] - 1)
+        return energy, zcr
+
+    def process(self, data):
+        """Feed raw PCM (bytes or int16 array) and return a list of (event, seconds) tuples.
+
+        Events are ``"speech_start"`` and ``"speech_end"``, timestamped on the
+        stream clock at the frame where the decision was made.
+        """
+        samples = np.frombuffer(data, dtype=np.int16) if not isinstance(data, np.ndarray) else data
+        if self.channels > 1:
+            samples = samples.reshape(-1, self.channels).mean(axis=1).astype(np.int16)
+        if len(self._remainder):
+            samples = np.concatenate([self._remainder, samples])
+
+        n = len(samples) // self.frame_len
+        self._remainder = samples[n * self.frame_len :].copy()
+        if n == 0:
+            return []
+
+        energy, zcr = self.features(samples[: n * self.frame_len].reshape(n, self.frame_len))
+
+        events = []
+        for e, z in zip(energy.tolist(), zcr.tolist()):
+            self.frames_seen += 1
+            window_min = self._track_window(e)
+            if self.frames_seen <= self.seed_frames:
+                if self.frames_seen == self.seed_frames:
+                    self.noise_floor = window_min
+                continue
+            if window_min > self.noise_floor:
+                self.noise_floor = window_min
+            above = e - self.noise_floor
+
+            if not self.in_speech:
+                voiced = above >= self.start_db and e >= self.min_speech_dbfs and z <= self.max_zcr
+                self._run = self._run + 1 if voiced else 0
+                if self._run >= self.min_speech_frames:
+                    self.in_speech = True
+                    self._run = 0
+                    self.last_active_frame = self.frames_seen
+                    events.append(("speech_start", self.time))
+                elif not voiced:
+                    self._track_floor(e)
+            else:
+                if above >= self.stop_db and e >= self.min_speech_dbfs:
+                    self._run = 0
+                    self.last_active_frame = self.frames_seen
+                else:
+                    self._run += 1
+                    if self._run >= self.hangover_frames:
+                        self.in_speech = False
+                        self._run = 0
+                        events.append(("speech_end", self.time))
+        return events
+
+    def _track_window(self, energy):
+        """Quietest energy over the last ``floor_window_ms`` (monotonic deque, O(1) per frame)."""
+        window = self._window
+        while window and window[-1][1] >= energy:
+            window.pop()
+        window.append((self.frames_seen, energy))
+        if window[0][0] <= self.frames_seen - self.floor_window_frames:
+            window.popleft()
+        return window[0][1]
+
+    def _track_floor(self, energy):
+        if energy < self.noise_floor:
+            self.noise_floor = energy  # Follow quieter backgrounds immediately
+        else:
+            self.noise_floor += self.floor_rise * (energy - self.noise_floor)
+
+    @property
+    def silence_ms(self):
+        """Milliseconds since the last active speech frame (0 while speech is active)."""
+        if self.last_active_frame is None:
+            return self.frames_seen * self.frame_ms
+        return (self.frames_seen - self.last_active_frame) * self.frame_ms
+
+    def reset(self):
+        self.in_speech = False
+        self._run = 0
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self.last_active_frame = None
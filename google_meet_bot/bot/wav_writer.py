@@ -0,0 +1,140 @@
+import os
+import struct
+import time
+
+
+class StreamingWavWriter:
+    """Write PCM audio to WAV files incrementally, with optional segment rotation.
+
+    The RIFF header is rewritten every ``header_interval`` seconds so a crash only
+    loses the audio written since the last patch. When ``segment_seconds`` is set,
+    the writer rotates into ``<name>_000.wav``, ``<name>_001.wav``, ... files.
+    RIFF sizes are 32-bit, so a file never grows past ``MAX_DATA_BYTES`` of
+    audio: an unsegmented recording that reaches it (about 6.7 hours at
+    44.1 kHz stereo) continues in ``<name>_001.wav``, ``<name>_002.wav``, ...
+    """
+
+    HEADER_SIZE = 44
+    MAX_DATA_BYTES = 0xFFFFFFFF - 36  # Largest data chunk whose RIFF size still fits in 32 bits
+
+    def __init__(
+        self,
+        filename,
+        channels,
+        sample_width,
+        rate,
+        segment_seconds=None,
+        header_interval=2.0,
+    ):
+        self.filename = filename
+        self.channels = channels
+        self.sample_width = sample_width
+        self.rate = rate
+        self.segment_seconds = segment_seconds
+        self.header_interval = header_interval
+
+        self.frame_size = channels * sample_width
+        self.segment_index = 0
+        self.segments = []
+        self.total_bytes = 0
+
+        self._file = None
+        self._data_bytes = 0
+        self._last_patch = 0.0
+        max_data = self.MAX_DATA_BYTES - self.MAX_DATA_BYTES % self.frame_size
+        self._segment_limit = (
+            min(int(segment_seconds * rate) * self.frame_size, max_data)
+            if segment_seconds
+            else max_data
+        )
+
+    def _segment_path(self):
+        if not self.segment_seconds and self.segment_index == 0:
+            return self.filename
+        root, ext = os.path.splitext(self.filename)
+        return f"{root}_{self.segment_index:03d}{ext or '.wav'}"
+
+    def _header(self, data_bytes):
+        byte_rate = self.rate * self.frame_size
+        return struct.pack(
+            "<4sI4s4sIHHIIHH4sI",
+            b"RIFF",
+            36 + data_bytes,
+            b"WAVE",
+            b"fmt ",
+            16,
+            1,  # PCM
+            self.channels,
+            self.rate,
+            byte_rate,
+            self.frame_size,
+            self.sample_width * 8,
+            b"data",
+            data_bytes,
+        )
+
+    def _open_segment(self):
+        path = self._segment_path()
+        self._file = open(path, "wb")
+        self._file.write(self._header(0))
+        self._data_bytes = 0
+        self._last_patch = time.monotonic()
+        self.segments.append(path)
+
+    def _patch_header(self):
+        """Rewrite the RIFF/data sizes so the file is valid up to this point."""
+        position = self._file.tell()
+        self._file.seek(0)
+        self._file.write(self._header(self._data_bytes))
+        self._file.seek(position)
+        self._file.flush()
+        self._last_patch = time.monotonic()
+
+    def _close_segment(self):
+        if self._file is None:
+            return
+        self._patch_header()
+        self._file.close()
+        self._file = None
+
+    def write(self, data):
+        """Append raw PCM bytes (or any buffer) to the current segment."""
+        view = memoryview(data).cast("B")
+        while len(view):
+            if self._file is None:
+                self._open_segment()
+
+            room = self._segment_limit - self._data_bytes
+            part = view[:room]
+            self._file.write(part)
+            self._data_bytes += len(part)
+            self.total_bytes += len(part)
+            view = view[room:]
+
+            if self._data_bytes >= self._segment_limit:
+                self._close_segment()
+                self.segment_index += 1
+
+        if (
+            self._file is not None
+            and time.monotonic() - self._last_patch >= self.header_interval
+        ):
+            self._patch_header()
+
+    @property
+    def duration(self):
+        """Seconds of audio written across all segments."""
+        return self.total_bytes / (self.rate * self.frame_size)
+
+    def close(self):
+        self._close_segment()
+        if not self.segments:
+            # Nothing was recorded; still leave a valid (empty) file behind.
+            self._open_segment()
+            self._close_segment()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -4,6 +4,8 @@
 from dotenv import load_dotenv
 
 load_dotenv()
+import sys
+from bot.browser_pool import BrowserPool
 from bot.meet_joiner_v2 import GoogleMeetBot
 from config import MEETING_URL, VIDEO_URL, AUDIO_PATH
 from bot.utils import print_welcome_message
@@ -11,15 +13,24 @@ from bot.models import MeetJoinerConfig
 
 
 if __name__ == "__main__":
-    # Load configuration
-    # Start WebSocket in a separate thread
-    config = MeetJoinerConfig(
-        meeting_url=MEETING_URL, video_url=VIDEO_URL, audio_url=AUDIO_PATH
-    )
+    # Meeting URLs given on the command line are joined back to back
+    meeting_urls = sys.argv[1:] or [MEETING_URL]
 
     # Print welcome message
     print_welcome_message()
 
-    # Start the process of joining the Google Meet and recording audio
-    bot = GoogleMeetBot(config)
-    bot.join_meeting()
+    # With more meetings queued, the next Chrome warms up while the current meeting runs
+    browser_pool = BrowserPool(size=1).start() if len(meeting_urls) > 1 else None
+    try:
+        for meeting_url in meeting_urls:
+            # Load configuration
+            config = MeetJoinerConfig(
+                meeting_url=meeting_url, video_url=VIDEO_URL, audio_url=AUDIO_PATH
+            )
+
+            # Start the process of joining the Google Meet and recording audio
+            bot = GoogleMeetBot(config, browser_pool=browser_pool)
+            bot.join_meeting()
+    finally:
+        if browser_pool is not None:
+            browser_pool.close()
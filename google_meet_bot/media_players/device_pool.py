@@ -0,0 +1,215 @@
+import os
+import subprocess
+import threading
+import time
+from bot.models import DeviceSet
+from media_players.pulse_client import PulseClient, PulseError
+
+
+class DevicePool:
+    """Virtual audio/video devices created once at service start and leased to bots.
+
+    ``provision`` loads a null sink + remap source pair per slot and creates a
+    v4l2loopback camera per slot. It records the module index of every module
+    it loads. ``lease`` is then a dictionary pop, with no subprocess or
+    kernel module work on the join path. ``release`` resets the devices
+    (unmuted, 100% volume) and re-creates a slot's audio if its modules have
+    gone. ``shutdown`` unloads only the indices the pool loaded, and removes
+    only the cameras it added, so other users of PulseAudio or v4l2loopback
+    are left alone.
+    """
+
+    def __init__(self, size=4, video_base=10, prefix="pool", client=None):
+        self.client = client or PulseClient.get()
+        self.size = size
+        self.video_base = video_base
+        self.prefix = prefix
+        self.devices = {}  # slot -> DeviceSet
+        self.leases = {}  # slot -> owner
+        self.lease_ms = []
+        self.provision_ms = None
+        self._owns_v4l2_module = False
+        self._added_cams = []  # /dev/videoN added with v4l2loopback-ctl
+        self._lock = threading.Lock()
+
+    def _device_set(self, slot):
+        instance_id = f"{self.prefix}{slot}"
+        return DeviceSet(
+            slot=slot,
+            instance_id=instance_id,
+            speaker_name=f"virtual_speaker_{instance_id}",
+            mic_name=f"virtual_mic_{instance_id}",
+            cam_label=f"VirtualCam_{instance_id}",
+            video_nr=self.video_base + slot,
+        )
+
+    @staticmethod
+    def _audio_modules(devices):
+        return [
+            (
+                "module-null-sink",
+                # Explicit channels, so the 2-channel volume reset always matches
+                f"sink_name={devices.speaker_name} channels=2 "
+                f'sink_properties=device.description="{devices.speaker_name}"',
+            ),
+            (
+                "module-remap-source",
+                f"master={devices.speaker_name}.monitor source_name={devices.mic_name} "
+                f'source_properties=device.description="{devices.mic_name}"',
+            ),
+        ]
+
+    def _load_audio(self, devices):
+        devices.module_indices = self.client.load_modules(self._audio_modules(devices))
+
+    def _unload_audio(self, devices):
+        try:
+            self.client.unload_modules(devices.module_indices, missing_ok=True)
+        except (PulseError, OSError) as e:
+            print(f"Device pool: unloading {devices.instance_id} failed: {e}")
+        devices.module_indices = []
+
+    def _create_cameras(self, sets):
+        if not os.path.exists("/sys/module/v4l2loopback"):
+            # Not loaded yet: one modprobe creates every camera
+            subprocess.run(
+                [
+                    "sudo",
+                    "modprobe",
+                    "v4l2loopback",
+                    f"devices={len(sets)}",
+                    "video_nr=" + ",".join(str(d.video_nr) for d in sets),
+                    "card_label=" + ",".join(d.cam_label for d in sets),
+                    "exclusive_caps=" + ",".join("1" for _ in sets),
+                ],
+                check=True,
+            )
+            self._owns_v4l2_module = True
+            return
+        # Someone else's module: add our devices to it
+        for devices in sets:
+            path = f"/dev/video{devices.video_nr}"
+            subprocess.run(
+                ["sudo", "v4l2loopback-ctl", "add", "-n", devices.cam_label,
+                 "--exclusive-caps", "1", path],
+                check=True,
+            )
+            self._added_cams.append(path)
+
+    def _remove_cameras(self):
+        for path in self._added_cams:
+            subprocess.run(["sudo", "v4l2loopback-ctl", "delete", path], check=False)
+        self._added_cams = []
+        if self._owns_v4l2_module:
+            subprocess.run(["sudo", "modprobe", "-r", "v4l2loopback"], check=False)
+            self._owns_v4l2_module = False
+
+    def provision(self):
+        """Create every slot's devices; rolls back and re-raises if any step fails."""
+        started = time.perf_counter()
+        sets = [self._device_set(slot) for slot in range(self.size)]
+        try:
+            # Every slot's sink and source in a single round-trip
+            indices = self.client.load_modules(
+                [module for devices in sets for module in self._audio_modules(devices)]
+            )
+            for devices in sets:
+                devices.module_indices, indices = indices[:2], indices[2:]
+            self._create_cameras(sets)
+        except (PulseError, subprocess.CalledProcessError, OSError):
+            for devices in sets:
+                self._unload_audio(devices)
+            self._remove_cameras()
+            raise
+        with self._lock:
+            self.devices = {devices.slot: devices for devices in sets}
+        self.provision_ms = (time.perf_counter() - started) * 1000
+        print(f"Device pool: provisioned {self.size} device sets in {self.provision_ms:.0f} ms.")
+        return self
+
+    def lease(self, owner):
+        """A free DeviceSet for ``owner``; raises RuntimeError when every slot is taken."""
+        started = time.perf_counter()
+        with self._lock:
+            free = [slot for slot in self.devices if slot not in self.leases]
+            if not free:
+                raise RuntimeError(f"device pool exhausted ({self.size} slots leased)")
+            self.leases[free[0]] = owner
+            devices = self.devices[free[0]].model_copy(deep=True)
+            self.lease_ms.append((time.perf_counter() - started) * 1000)
+        return devices
+
+    def release(self, devices):
+        """Reset a returned DeviceSet and make it available again."""
+        with self._lock:
+            if self.leases.get(devices.slot) is None:
+                return
+            current = self.devices[devices.slot]
+        try:
+            loaded = {index for index, _, _ in self.client.list_modules()}
+            if not set(current.module_indices) <= loaded:
+                print(f"Device pool: {current.instance_id} audio modules vanished; re-creating.")
+                self._unload_audio(current)
+                self._load_audio(current)
+            self.client.reset_devices(current.speaker_name, current.mic_name)
+        except (PulseError, OSError) as e:
+            print(f"Device pool: reset of {current.instance_id} failed ({e}); slot retired.")
+            self._unload_audio(current)
+            with self._lock:
+                self.devices.pop(devices.slot, None)
+                self.leases.pop(devices.slot, None)
+            return
+        with self._lock:
+            self.leases.pop(devices.slot, None)
+
+    def stats(self):
+        with self._lock:
+            ordered = sorted(self.lease_ms)
+            return {
+                "slots": len(self.devices),
+                "leased": len(self.leases),
+                "provision_ms": round(self.provision_ms) if self.provision_ms else None,
+                "lease_ms_max": round(ordered[-1], 3) if ordered else None,
+            }
+
+    def shutdown(self):
+        """Remove only what provision created."""
+        with self._lock:
+            sets = list(self.devices.values())
+            if self.leases:
+                print(f"Device pool: shutting down with {len(self.leases)} slots still leased.")
+            self.devices = {}
+            self.leases = {}
+        for devices in sets:
+            self._unload_audio(devices)
+        self._remove_cameras()
+        print(f"Device pool stats: {self.stats()}")
+
+
+def benchmark(rounds=5):
+    """Per-join device setup: loading modules per bot (the old path) vs a pool lease."""
+    from media_players.media_stream import VirtualMediaStreamer
+
+    streamer = VirtualMediaStreamer(instance_id="bench")
+    started = time.perf_counter()
+    for _ in range(rounds):
+        streamer.unload_virtual_audio_modules()
+        streamer.load_virtual_audio_modules()
+    per_bot_ms = (time.perf_counter() - started) * 1000 / rounds
+    streamer.unload_virtual_audio_modules()
+
+    pool = DevicePool(size=1, video_base=40, prefix="bench").provision()
+    try:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            pool.lease(owner="benchmark")
+            pool.leases.clear()  # Hand it straight back; release's reset is off the join path
+        leased_ms = (time.perf_counter() - started) * 1000 / rounds
+    finally:
+        pool.shutdown()
+    print(f"unload + load modules per join: {per_bot_ms:8.2f} ms")
+    print(f"device pool lease:              {leased_ms:8.3f} ms")
+
+
+if __name__ == "__main__":
+    benchmark()
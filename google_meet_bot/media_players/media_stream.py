@@ -2,6 +2,12 @@ import subprocess
 import re
 import os
 import pyaudio, wave
+from bot.audio_host import AudioHost
+from media_players.pulse_client import PulseClient
+
+
+class MediaDeviceError(Exception):
+    """A virtual camera could not be created, found or removed."""
 
 
 class VirtualMediaStreamer:
@@ -9,108 +15,173 @@ class VirtualMediaStreamer:
         self,
         video_path="/home/nandan/Downloads/hello.mp4",
         audio_path="/home/nandan/Music/Gmeet_Bot/google_meet_bot/media_players/text.wav",
+        instance_id=None,
+        video_nr=3,
+        devices=None,
     ):
         self.video_path = video_path
         self.virtual_cam_device = None
         self.audio_path = audio_path
+        # With an instance_id every device name is suffixed, so several bots can
+        # share one PulseAudio server and one v4l2loopback module
+        self.instance_id = instance_id
+        suffix = f"_{instance_id}" if instance_id else ""
+        self.speaker_name = f"virtual_speaker{suffix}"
+        self.mic_name = f"virtual_mic{suffix}"
+        self.cam_label = f"VirtualCam{suffix}"
+        self.video_nr = video_nr
+        self.module_indices = []  # PulseAudio modules this instance loaded
+        self.created_cam = False  # Only a camera this instance created is removed
+        # A DeviceSet leased from a DevicePool: the devices already exist and
+        # the pool resets them, so loading/unloading here is skipped
+        self.devices = devices
+        if devices is not None:
+            self.instance_id = devices.instance_id
+            self.speaker_name = devices.speaker_name
+            self.mic_name = devices.mic_name
+            self.cam_label = devices.cam_label
+            self.video_nr = devices.video_nr
+            self.virtual_cam_device = f"/dev/video{devices.video_nr}"
+
+    def audio_env(self):
+        """Environment that routes a process's (and its browser's) audio to this instance's devices.
+
+        Playback goes to the instance's speaker, and capture (the capture bus,
+        the realtime client's input) reads that speaker's monitor: the meeting
+        audio Chrome plays there.
+        """
+        return {"PULSE_SINK": self.speaker_name, "PULSE_SOURCE": f"{self.speaker_name}.monitor"}
 
     def load_virtual_audio_modules(self):
         """Loads PulseAudio modules for virtual audio devices."""
-        try:
-            print("Loading virtual speaker...")
-            subprocess.run(
-                [
-                    "pactl",
-                    "load-module",
+        if self.devices is not None:
+            os.environ.update(self.audio_env())
+            return
+        print("Loading virtual speaker and microphone...")
+        # One round-trip on the shared native connection; raises PulseError
+        # (after unloading whatever did load) instead of exiting the process
+        self.module_indices = PulseClient.get().load_modules(
+            [
+                (
                     "module-null-sink",
-                    "sink_name=virtual_speaker",
-                    'sink_properties=device.description="virtual_speaker"',
-                ],
-                check=True,
-            )
-
-            print("Loading virtual microphone...")
-            subprocess.run(
-                [
-                    "pactl",
-                    "load-module",
+                    f"sink_name={self.speaker_name} "
+                    f'sink_properties=device.description="{self.speaker_name}"',
+                ),
+                (
                     "module-remap-source",
-                    "master=virtual_speaker.monitor",
-                    "source_name=virtual_mic",
-                    'source_properties=device.description="virtual_mic"',
-                ],
-                check=True,
-            )
+                    f"master={self.speaker_name}.monitor source_name={self.mic_name} "
+                    f'source_properties=device.description="{self.mic_name}"',
+                ),
+            ]
+        )
 
-            # Set the PULSE_SINK environment variable to virtual_speaker
-            os.environ["PULSE_SINK"] = "virtual_speaker"
-            print("Virtual audio modules loaded successfully.")
-        except subprocess.CalledProcessError as e:
-            print(f"Error loading virtual audio modules: {e}")
-            exit(1)
+        # Route this process (and the browser it launches) to the virtual speaker
+        os.environ.update(self.audio_env())
+        print(f"Virtual audio modules loaded successfully (modules {self.module_indices}).")
+
+    def own_module_indices(self):
+        """Indices of loaded modules that created this instance's sink or source."""
+        ours = {f"sink_name={self.speaker_name}", f"source_name={self.mic_name}"}
+        return [
+            index
+            for index, _, argument in PulseClient.get().list_modules()
+            if ours & set(argument.split())
+        ]
 
     def unload_virtual_audio_modules(self):
-        """Unloads PulseAudio modules for virtual audio devices."""
-        try:
-            print("Unloading virtual audio modules...")
-            subprocess.run(
-                ["pactl", "unload-module", "module-remap-source"], check=True
-            )
-            subprocess.run(["pactl", "unload-module", "module-null-sink"], check=True)
-            print("Virtual audio modules unloaded successfully.")
-        except subprocess.CalledProcessError as e:
-            print(f"Error unloading virtual audio modules: {e}")
-            exit(1)
+        """Unloads this instance's PulseAudio modules, by index, leaving other bots' devices alone."""
+        print("Unloading virtual audio modules...")
+        # Also finds leftovers from a previous run that crashed before unloading
+        indices = set(self.module_indices) | set(self.own_module_indices())
+        PulseClient.get().unload_modules(indices, missing_ok=True)
+        self.module_indices = []
+        print("Virtual audio modules unloaded successfully.")
 
     def create_virtual_cam(self):
-        """Creates a virtual webcam using v4l2loopback."""
+        """Creates a virtual webcam using v4l2loopback; raises MediaDeviceError if it can't."""
+        if self.devices is not None:
+            return  # The pool created the leased camera
         try:
             print("Creating virtual webcam...")
-            subprocess.run(
-                [
-                    "sudo",
-                    "modprobe",
-                    "v4l2loopback",
-                    "video_nr=3",
-                    'card_label="VirtualCam"',
-                    "exclusive_caps=1",
-                ],
-                check=True,
-            )
-            self.virtual_cam_device = (
-                self.list_video_devices()
-            )  # Get the virtual camera device path
+            if self.instance_id:
+                path = f"/dev/video{self.video_nr}"
+                if os.path.exists(path):
+                    # Left by an earlier bot in this slot; use it, but it isn't ours to delete
+                    print(f"Reusing existing virtual webcam {path}.")
+                    self.virtual_cam_device = path
+                    return
+                # Add a device to the already-loaded module instead of (re)loading it
+                subprocess.run(
+                    [
+                        "sudo",
+                        "v4l2loopback-ctl",
+                        "add",
+                        "-n",
+                        self.cam_label,
+                        "--exclusive-caps",
+                        "1",
+                        path,
+                    ],
+                    check=True,
+                )
+                self.created_cam = True
+                self.virtual_cam_device = path
+            else:
+                subprocess.run(
+                    [
+                        "sudo",
+                        "modprobe",
+                        "v4l2loopback",
+                        f"video_nr={self.video_nr}",
+                        'card_label="VirtualCam"',
+                        "exclusive_caps=1",
+                    ],
+                    check=True,
+                )
+                self.created_cam = True
+                self.virtual_cam_device = (
+                    self.list_video_devices()
+                )  # Get the virtual camera device path
             print("Virtual webcam created successfully.")
-        except subprocess.CalledProcessError as e:
-            print(f"Error creating virtual webcam: {e}")
-            exit(1)
+        except (subprocess.CalledProcessError, OSError) as e:
+            raise MediaDeviceError(f"creating virtual webcam failed: {e}") from e
 
     def stop_virtual_cam(self):
-        """Stops the virtual webcam by removing the v4l2loopback module."""
+        """Removes the virtual webcam, if this instance created it; raises MediaDeviceError on failure."""
+        if not self.created_cam:
+            return  # Someone else's device (another bot's, or a leftover we reused)
         try:
             print("Stopping virtual webcam...")
-            subprocess.run(
-                ["sudo", "modprobe", "--force", "-r", "v4l2loopback"], check=True
-            )
+            if self.instance_id:
+                # Removing the module would take every other bot's camera with it
+                if os.path.exists(f"/dev/video{self.video_nr}"):
+                    subprocess.run(
+                        ["sudo", "v4l2loopback-ctl", "delete", f"/dev/video{self.video_nr}"],
+                        check=True,
+                    )
+            else:
+                subprocess.run(
+                    ["sudo", "modprobe", "--force", "-r", "v4l2loopback"], check=True
+                )
+            self.created_cam = False
+            self.virtual_cam_device = None
             print("Virtual webcam stopped successfully.")
-        except subprocess.CalledProcessError as e:
-            print(f"Error stopping virtual webcam: {e}")
-            exit(1)
+        except (subprocess.CalledProcessError, OSError) as e:
+            raise MediaDeviceError(f"stopping virtual webcam failed: {e}") from e
 
     def list_video_devices(self):
         """Lists video devices and returns the path of the virtual camera."""
         try:
             output = subprocess.check_output(["v4l2-ctl", "--list-devices"]).decode()
-            # Extract the virtual camera path using regex
-            match = re.search(r"VirtualCam\s*.*\n\s*(\/dev\/video\d+)", output)
-            if match:
-                return match.group(1)
-            else:
-                print("Virtual camera not found.")
-                exit(1)
-        except subprocess.CalledProcessError as e:
-            print(f"Error listing video devices: {e}")
-            exit(1)
+        except (subprocess.CalledProcessError, OSError) as e:
+            raise MediaDeviceError(f"listing video devices failed: {e}") from e
+        # Extract the virtual camera path using regex
+        match = re.search(
+            re.escape(self.cam_label) + r"\b.*\n\s*(\/dev\/video\d+)", output
+        )
+        if not match:
+            raise MediaDeviceError(f"virtual camera {self.cam_label!r} not found")
+        return match.group(1)
 
     def stream_video_and_audio(self):
         """Streams video and audio to virtual camera and microphone using ffmpeg."""
@@ -140,14 +211,11 @@ class VirtualMediaStreamer:
         # Open the audio file
         wf = wave.open(self.audio_path, 'rb')
 
-        # Instantiate PyAudio
-        p = pyaudio.PyAudio()
-
-        # Open a stream with PyAudio settings matching the WAV file
-        stream = p.open(format=p.get_format_from_width(wf.getsampwidth()),
-                        channels=wf.getnchannels(),
-                        rate=wf.getframerate(),
-                        output=True)
+        # Lease an output stream matching the WAV file from the shared audio host
+        stream = AudioHost.get().open_output(format=pyaudio.get_format_from_width(wf.getsampwidth()),
+                                             channels=wf.getnchannels(),
+                                             rate=wf.getframerate(),
+                                             owner="media streamer")
 
         # Read data from the WAV file and play it through the stream
         data = wf.readframes(1024)
@@ -155,17 +223,20 @@ class VirtualMediaStreamer:
             stream.write(data)
             data = wf.readframes(1024)
 
-        # Close the stream and PyAudio
-        stream.stop_stream()
+        # Hand the stream back to the audio host
         stream.close()
-        p.terminate()
+        wf.close()
 
         print("Audio playback completed.")
 
 
     def unload_modules(self):
-        self.unload_virtual_audio_modules()
-        self.stop_virtual_cam()
+        if self.devices is not None:
+            return
+        try:
+            self.unload_virtual_audio_modules()
+        finally:
+            self.stop_virtual_cam()
 
     def run(self):
         """Main method to manage the virtual media streaming lifecycle."""
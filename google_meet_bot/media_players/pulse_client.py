@@ -0,0 +1,452 @@
+import os
+import socket
+import struct
+import subprocess
+import threading
+import time
+
+# Native protocol commands (pulsecore/native-common.h)
+COMMAND_ERROR = 0
+COMMAND_REPLY = 2
+COMMAND_AUTH = 8
+COMMAND_SET_CLIENT_NAME = 9
+COMMAND_GET_MODULE_INFO_LIST = 26
+COMMAND_SET_SINK_VOLUME = 36
+COMMAND_SET_SOURCE_VOLUME = 38
+COMMAND_SET_SINK_MUTE = 39
+COMMAND_SET_SOURCE_MUTE = 40
+COMMAND_LOAD_MODULE = 51
+COMMAND_UNLOAD_MODULE = 52
+
+PROTOCOL_VERSION = 32  # No shm/memfd flags: this client never streams audio
+CONTROL_CHANNEL = 0xFFFFFFFF
+INVALID_INDEX = 0xFFFFFFFF
+VOLUME_NORM = 0x10000
+COOKIE_LENGTH = 256
+
+ERRORS = {
+    1: "access denied",
+    2: "unknown command",
+    3: "invalid argument",
+    4: "entity exists",
+    5: "no such entity",
+    6: "connection refused",
+    7: "protocol error",
+    8: "timeout",
+    9: "no authentication key",
+    10: "internal error",
+    11: "connection terminated",
+    12: "entity killed",
+    13: "invalid server",
+    14: "module initialization failed",
+    15: "bad state",
+    16: "no data",
+    17: "incompatible protocol version",
+    18: "data too large",
+    19: "operation not supported",
+    20: "unknown error code",
+    21: "no such extension",
+    22: "obsolete functionality",
+    23: "missing implementation",
+    24: "client forked",
+    25: "input/output error",
+    26: "device or resource busy",
+}
+
+
+class PulseError(Exception):
+    """A command the server answered with an error (``code`` is the PA_ERR_* value)."""
+
+    def __init__(self, command, code):
+        self.command = command
+        self.code = code
+        super().__init__(f"PulseAudio command {command} failed: {ERRORS.get(code, code)}")
+
+
+class TagStruct:
+    """Writer/reader for the protocol's tagged values: L u32, t/N string, 1/0 bool, x arbitrary, P proplist, v cvolume."""
+
+    def __init__(self, data=b""):
+        self.data = bytearray(data)
+        self.pos = 0
+
+    def put_u32(self, value):
+        self.data += b"L" + struct.pack(">I", value)
+        return self
+
+    def put_string(self, value):
+        if value is None:
+            self.data += b"N"
+        else:
+            self.data += b"t" + value.encode() + b"\0"
+        return self
+
+    def put_bool(self, value):
+        self.data += b"1" if value else b"0"
+        return self
+
+    def put_arbitrary(self, value):
+        self.data += b"x" + struct.pack(">I", len(value)) + value
+        return self
+
+    def put_proplist(self, props):
+        self.data += b"P"
+        for key, value in props.items():
+            value = value.encode() + b"\0" if isinstance(value, str) else value
+            self.put_string(key).put_u32(len(value)).put_arbitrary(value)
+        self.data += b"N"
+        return self
+
+    def put_cvolume(self, volumes):
+        self.data += b"v" + struct.pack(">B", len(volumes)) + struct.pack(f">{len(volumes)}I", *volumes)
+        return self
+
+    def _tag(self, expected):
+        tag = self.data[self.pos:self.pos + 1]
+        if tag not in expected:
+            raise PulseError("parse", 7)
+        self.pos += 1
+        return tag
+
+    def get_u32(self):
+        self._tag((b"L",))
+        (value,) = struct.unpack_from(">I", self.data, self.pos)
+        self.pos += 4
+        return value
+
+    def get_string(self):
+        if self._tag((b"t", b"N")) == b"N":
+            return None
+        end = self.data.index(b"\0", self.pos)
+        value = self.data[self.pos:end].decode()
+        self.pos = end + 1
+        return value
+
+    def get_bool(self):
+        return self._tag((b"1", b"0")) == b"1"
+
+    def get_arbitrary(self):
+        self._tag((b"x",))
+        (length,) = struct.unpack_from(">I", self.data, self.pos)
+        self.pos += 4 + length
+        return bytes(self.data[self.pos - length:self.pos])
+
+    def get_proplist(self):
+        self._tag((b"P",))
+        props = {}
+        while True:
+            key = self.get_string()
+            if key is None:
+                return props
+            self.get_u32()  # Length, repeated by the arbitrary that follows
+            props[key] = self.get_arbitrary()
+
+    def get_cvolume(self):
+        self._tag((b"v",))
+        channels = self.data[self.pos]
+        volumes = struct.unpack_from(f">{channels}I", self.data, self.pos + 1)
+        self.pos += 1 + 4 * channels
+        return list(volumes)
+
+    def eof(self):
+        return self.pos >= len(self.data)
+
+
+def pack_packet(payload):
+    """20-byte descriptor (length, channel, offset hi/lo, flags; big-endian) + payload."""
+    return struct.pack(">5I", len(payload), CONTROL_CHANNEL, 0, 0, 0) + bytes(payload)
+
+
+def recv_exactly(sock, length):
+    data = bytearray()
+    while len(data) < length:
+        chunk = sock.recv(length - len(data))
+        if not chunk:
+            raise ConnectionError("PulseAudio server closed the connection")
+        data += chunk
+    return bytes(data)
+
+
+def read_packet(sock):
+    length, channel, _, _, _ = struct.unpack(">5I", recv_exactly(sock, 20))
+    return channel, recv_exactly(sock, length)
+
+
+def default_socket_path():
+    server = os.environ.get("PULSE_SERVER")
+    if server:
+        # Only local sockets: "unix:/path" or a bare path
+        return server[len("unix:"):] if server.startswith("unix:") else server
+    runtime = os.environ.get("XDG_RUNTIME_DIR", f"/run/user/{os.getuid()}")
+    return os.path.join(runtime, "pulse", "native")
+
+
+def read_cookie():
+    """The auth cookie, if any. Without one, a same-user server accepts the SCM_CREDENTIALS sent with AUTH."""
+    for path in (
+        os.environ.get("PULSE_COOKIE"),
+        os.path.expanduser("~/.config/pulse/cookie"),
+        os.path.expanduser("~/.pulse-cookie"),
+    ):
+        if path and os.path.exists(path):
+            with open(path, "rb") as f:
+                cookie = f.read(COOKIE_LENGTH)
+            if len(cookie) == COOKIE_LENGTH:
+                return cookie
+    return bytes(COOKIE_LENGTH)
+
+
+class PulseClient:
+    """In-process PulseAudio control over the native protocol on the local socket.
+
+    Replaces forking ``pactl`` per operation. Commands are request/reply
+    pairs matched by tag. ``batch`` pipelines several commands in one write
+    and then collects their replies. Modules are loaded and unloaded by
+    index, so one bot never removes another's. Server errors raise
+    PulseError; connection problems raise ConnectionError/OSError. One
+    connection per process (``PulseClient.get()``), serialized by a lock, and
+    reconnected on the next call if the server went away.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    @classmethod
+    def get(cls):
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def __init__(self, path=None, client_name="google_meet_bot", timeout=5.0):
+        self.path = path or default_socket_path()
+        self.client_name = client_name
+        self.timeout = timeout
+        self.server_version = None
+        self.client_index = None
+        self._sock = None
+        self._next_tag = 0
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.path)
+            self._sock = sock
+            tag = self._tag()
+            auth = TagStruct().put_u32(COMMAND_AUTH).put_u32(tag)
+            auth.put_u32(PROTOCOL_VERSION).put_arbitrary(read_cookie())
+            credentials = struct.pack("iII", os.getpid(), os.getuid(), os.getgid())
+            sock.sendmsg(
+                [pack_packet(auth.data)],
+                [(socket.SOL_SOCKET, socket.SCM_CREDENTIALS, credentials)],
+            )
+            reply = self._reply(COMMAND_AUTH, tag)
+            self.server_version = reply.get_u32() & 0xFFFF
+            if self.server_version < 13:
+                raise PulseError(COMMAND_AUTH, 17)
+            reply = self._request(
+                COMMAND_SET_CLIENT_NAME,
+                lambda ts: ts.put_proplist({"application.name": self.client_name}),
+            )
+            self.client_index = reply.get_u32()
+        except BaseException:
+            self._sock = None
+            sock.close()
+            raise
+
+    def _tag(self):
+        self._next_tag = (self._next_tag + 1) & 0xFFFFFFFF
+        return self._next_tag - 1
+
+    def _encode(self, command, fill):
+        tag = self._tag()
+        ts = TagStruct().put_u32(command).put_u32(tag)
+        if fill is not None:
+            fill(ts)
+        return tag, pack_packet(ts.data)
+
+    def _reply(self, command, tag):
+        while True:
+            channel, payload = read_packet(self._sock)
+            if channel != CONTROL_CHANNEL:
+                continue  # Stream data; we have no streams
+            ts = TagStruct(payload)
+            reply_command = ts.get_u32()
+            reply_tag = ts.get_u32()
+            if reply_tag != tag or reply_command not in (COMMAND_REPLY, COMMAND_ERROR):
+                continue  # Server-initiated packet (events, requests)
+            if reply_command == COMMAND_ERROR:
+                raise PulseError(command, ts.get_u32())
+            return ts
+
+    def _request(self, command, fill=None):
+        tag, packet = self._encode(command, fill)
+        self._sock.sendall(packet)
+        return self._reply(command, tag)
+
+    def _ensure_connected(self):
+        if self._sock is None:
+            self._connect()
+
+    def request(self, command, fill=None):
+        """Send one command and return its reply TagStruct (positioned after command and tag)."""
+        with self._lock:
+            self._ensure_connected()
+            try:
+                return self._request(command, fill)
+            except (ConnectionError, OSError):
+                self._drop()
+                raise
+
+    def batch(self, commands):
+        """Pipeline ``[(command, fill), ...]`` in one write; returns each reply or PulseError, in order.
+
+        The server handles them in order, so later commands may depend on
+        earlier ones (e.g. a remap source on a sink loaded in the same batch).
+        """
+        with self._lock:
+            self._ensure_connected()
+            encoded = [(command, *self._encode(command, fill)) for command, fill in commands]
+            try:
+                self._sock.sendall(b"".join(packet for _, _, packet in encoded))
+                results = []
+                for command, tag, _ in encoded:
+                    try:
+                        results.append(self._reply(command, tag))
+                    except PulseError as e:
+                        results.append(e)
+                return results
+            except (ConnectionError, OSError):
+                self._drop()
+                raise
+
+    def _drop(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def close(self):
+        with self._lock:
+            self._drop()
+
+    # Commands
+
+    @staticmethod
+    def _load(name, argument):
+        return COMMAND_LOAD_MODULE, lambda ts: ts.put_string(name).put_string(argument)
+
+    @staticmethod
+    def _unload(index):
+        return COMMAND_UNLOAD_MODULE, lambda ts: ts.put_u32(index)
+
+    def load_module(self, name, argument=""):
+        """Load a module; returns its index."""
+        return self.request(*self._load(name, argument)).get_u32()
+
+    def unload_module(self, index):
+        self.request(*self._unload(index))
+
+    def load_modules(self, modules):
+        """Load ``[(name, argument), ...]`` in one round-trip; returns their indices.
+
+        If any fails, the ones that loaded are unloaded again and the first error is raised.
+        """
+        results = self.batch([self._load(name, argument) for name, argument in modules])
+        errors = [result for result in results if isinstance(result, PulseError)]
+        indices = [result.get_u32() for result in results if not isinstance(result, PulseError)]
+        if errors:
+            self.unload_modules(indices, missing_ok=True)
+            raise errors[0]
+        return indices
+
+    def unload_modules(self, indices, missing_ok=False):
+        """Unload modules by index, newest first, in one round-trip."""
+        ordered = sorted(indices, reverse=True)
+        for result in self.batch([self._unload(index) for index in ordered]):
+            if isinstance(result, PulseError) and not (missing_ok and result.code == 5):
+                raise result
+
+    def list_modules(self):
+        """``[(index, name, argument), ...]`` for every loaded module."""
+        reply = self.request(COMMAND_GET_MODULE_INFO_LIST)
+        modules = []
+        while not reply.eof():
+            index = reply.get_u32()
+            name = reply.get_string()
+            argument = reply.get_string()
+            reply.get_u32()  # Users
+            if self.server_version < 15:
+                reply.get_bool()  # Auto-unload
+            else:
+                reply.get_proplist()
+            modules.append((index, name, argument or ""))
+        return modules
+
+    @staticmethod
+    def _mute(command, name, mute):
+        return command, lambda ts: ts.put_u32(INVALID_INDEX).put_string(name).put_bool(mute)
+
+    @staticmethod
+    def _volume(command, name, volume, channels):
+        level = int(VOLUME_NORM * volume)
+        return command, lambda ts: ts.put_u32(INVALID_INDEX).put_string(name).put_cvolume([level] * channels)
+
+    def reset_devices(self, sink, source, channels=2):
+        """Unmute the sink and source and set them to 100%, in one round-trip."""
+        for result in self.batch([
+            self._mute(COMMAND_SET_SINK_MUTE, sink, False),
+            self._volume(COMMAND_SET_SINK_VOLUME, sink, 1.0, channels),
+            self._mute(COMMAND_SET_SOURCE_MUTE, source, False),
+            self._volume(COMMAND_SET_SOURCE_VOLUME, source, 1.0, channels),
+        ]):
+            if isinstance(result, PulseError):
+                raise result
+
+
+def benchmark(rounds=20, path=None):
+    """Per-operation latency: pactl load-module/unload-module vs the native client (single and batched)."""
+    if path:
+        os.environ["PULSE_SERVER"] = f"unix:{path}"  # pactl talks to the same server
+    argument = "sink_name=pulse_client_bench"
+    results = {}
+    try:
+        started = time.perf_counter()
+        for _ in range(rounds):
+            index = subprocess.check_output(["pactl", "load-module", "module-null-sink", argument]).decode()
+            subprocess.run(["pactl", "unload-module", index.strip()], check=True)
+        results["pactl"] = (time.perf_counter() - started) * 1000 / (2 * rounds)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"pactl unavailable for comparison: {e}")
+
+    client = PulseClient(path)
+    started = time.perf_counter()
+    client.list_modules()  # Connects and authenticates
+    connect_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    for _ in range(rounds):
+        client.unload_module(client.load_module("module-null-sink", argument))
+    results["native"] = (time.perf_counter() - started) * 1000 / (2 * rounds)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        client.unload_modules(client.load_modules([
+            ("module-null-sink", argument),
+            ("module-remap-source", "master=pulse_client_bench.monitor source_name=pulse_client_bench_mic"),
+        ]))
+    results["native batched"] = (time.perf_counter() - started) * 1000 / (4 * rounds)
+    client.close()
+
+    print(f"native connect + auth + list: {connect_ms:.2f} ms (connect is once per process)")
+    for label, ms in results.items():
+        print(f"{label:<15} {ms:8.3f} ms per operation")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare pactl with the native PulseAudio client")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--socket", help="Server socket (default: $PULSE_SERVER or the user's runtime dir)")
+    args = parser.parse_args()
+    benchmark(args.rounds, args.socket)
@@ -0,0 +1,345 @@
+import asyncio
+import json
+import time
+from enum import Enum
+import pyaudio
+import websockets
+from websockets.frames import OP_TEXT
+from bot.audio_host import AudioHost
+from openai_voice_assistant.realtime_voice_bot import TRANSCRIPT_EVENTS, AudioWebSocketClient
+from openai_voice_assistant.uplink import SendLatencyStats, take_coalesced
+
+
+class TurnState(Enum):
+    CONNECTING = "connecting"
+    LISTENING = "listening"  # Streaming microphone audio to the server
+    COMMITTED = "committed"  # Buffer committed, waiting for the response to start
+    RESPONDING = "responding"  # Assistant audio is streaming back
+    CLOSED = "closed"
+
+
+class AsyncAudioWebSocketClient(AudioWebSocketClient):
+    """asyncio implementation of the realtime client.
+
+    A session runs one capture task, and each connection adds a send and a
+    receive task for its lifetime. Outgoing events go through a bounded queue, so a slow socket
+    pushes back on capture instead of piling up memory, and turns move through
+    an explicit TurnState machine instead of spawning a thread per turn. Many
+    sessions can share a single event loop (see ``run_sessions``).
+
+    If the connection drops, capture keeps running into the replay ring while
+    the client reconnects with exponential backoff; the new session gets the
+    uncommitted audio (and any unacknowledged commit) before live frames.
+    """
+
+    def __init__(self, api_key, ws_url, send_queue_size=32, **kwargs):
+        super().__init__(api_key, ws_url, **kwargs)
+        self.send_queue_size = send_queue_size
+        self.state = TurnState.CONNECTING
+        self.ws = None
+        self._send_queue = None
+        self._replay_lock = asyncio.Lock()  # Keeps new frames and commits behind the replay on reconnect
+        self._stopped = None
+        self._loop = None
+        self._close_input = lambda: None
+        self._capture_task = None
+        self.send_stats = SendLatencyStats()
+
+    def _set_state(self, state):
+        if state != self.state:
+            print(f"Turn state: {self.state.value} -> {state.value}")
+            self.state = state
+
+    async def _send(self, event):
+        """Queue an event for the send task; waits while the queue is full.
+
+        Dropped while disconnected (commits are replayed from the ring instead).
+        """
+        async with self._replay_lock:
+            if self.connected:
+                await self._send_queue.put(("event", None, json.dumps(event)))
+
+    async def _send_audio(self, data):
+        self.tracer.mark_append()
+        async with self._replay_lock:
+            self.replay.append(data)
+            if self.connected:
+                await self._send_queue.put(("audio", time.perf_counter(), data))
+
+    async def _commit(self):
+        """Commit the turn; the ring mark and the live commit go together, so a replay never doubles it."""
+        async with self._replay_lock:
+            self.replay.mark_commit()
+            if self.connected:
+                await self._send_queue.put(("event", None, json.dumps({"type": "input_audio_buffer.commit"})))
+                await self._send_queue.put(("event", None, json.dumps({"type": "response.create"})))
+
+    async def _send_loop(self):
+        max_bytes = int(self.rate * self.channels * 2 * self.max_coalesce_ms / 1000)
+        pending = None
+        while True:
+            item = pending if pending is not None else await self._send_queue.get()
+            pending = None
+            if item[0] == "audio":
+                # Frames that queued while the socket was busy go out as one append
+                datas, stamps, pending = take_coalesced(
+                    item, self._send_queue.get_nowait, max_bytes
+                )
+                await self._send_text(self.append_event(b"".join(datas)))
+                self.send_stats.record(stamps, len(datas))
+            else:
+                await self.ws.send(item[2])
+
+    async def _send_text(self, data):
+        """Send UTF-8 bytes as a text frame.
+
+        ``ws.send`` turns bytes into a binary frame, so it would need a str;
+        writing the frame directly skips decoding every append into one.
+        """
+        await self.ws.ensure_open()
+        await self.ws.write_frame(True, OP_TEXT, data)
+
+    def _open_async_input(self):
+        """Return a (get, close) pair for the capture source, fed by callbacks.
+
+        Audio arrives on the capture bus or PortAudio thread and is handed to
+        the loop with ``call_soon_threadsafe``, so no executor thread sits in a
+        blocking read. ``get`` is awaited for the next chunk (None once the
+        source has ended); ``close`` detaches the callback before the source is
+        released.
+        """
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue()
+
+        def deliver(data):
+            try:
+                loop.call_soon_threadsafe(chunks.put_nowait, data)
+            except RuntimeError:
+                pass  # Loop already closed
+
+        if self.capture is not None:
+            sub = self.capture
+            sub.clear()  # Start from live audio, not whatever the bus buffered before input opened
+
+            def on_bus_audio():
+                # Only this callback reads the subscription, so whole chunks never split
+                while True:
+                    data = sub.read(self.chunk, timeout=0)
+                    if data is None:
+                        break
+                    deliver(data)
+                if sub.closed:
+                    deliver(None)
+
+            sub.listener = on_bus_audio
+            if sub.closed:
+                on_bus_audio()  # The bus already stopped and will never call back
+
+            def close():
+                sub.listener = None
+
+            return chunks.get, close
+
+        def on_device_audio(in_data, frame_count, time_info, status):
+            deliver(in_data)
+            return (None, pyaudio.paContinue)
+
+        stream = AudioHost.get(self.audio_interface).open_input(
+            rate=self.rate,
+            channels=self.channels,
+            frames_per_buffer=self.chunk,
+            format=self.format,
+            stream_callback=on_device_audio,
+            owner="realtime uplink",
+        )
+        stream.start_stream()
+        return chunks.get, stream.close
+
+    async def _capture_loop(self):
+        get, self._close_input = self._open_async_input()
+        while True:
+            data = await get()
+            if data is None:
+                break  # Capture bus stopped
+            started, ended = self.speech_events(data)
+
+            action, frames = self.screen_capture(data, started, ended)
+            if action == "skip":
+                continue  # The assistant (or its echo) is talking
+            if action == "barge_in":
+                await self._barge_in("local_vad")
+                started = True
+            elif self.state != TurnState.LISTENING:
+                continue  # Only the listening state streams audio upstream
+            if started:
+                self.begin_turn()
+
+            for frame in frames:
+                await self._send_audio(frame)
+
+            if ended:
+                await self._commit()
+                self.tracer.mark("commit")
+                self.tracer.mark("response_create")
+                self.response_active = True
+                self._set_state(TurnState.COMMITTED)
+
+    def send_event(self, ws, event):
+        """Queue a control event from synchronous code (e.g. ``speak``) on any thread."""
+        if self._loop is not None:
+            asyncio.run_coroutine_threadsafe(self._send(event), self._loop)
+
+    async def _barge_in(self, reason):
+        for event in self.interrupt_response(reason):
+            await self._send(event)
+        self._set_state(TurnState.LISTENING)
+
+    async def _receive_loop(self):
+        async for message in self.ws:
+            event = json.loads(message)
+            event_type = event.get("type")
+
+            if event_type == "response.audio.delta":
+                self.handle_audio_delta(event)
+
+            elif event_type == "session.created":
+                if self.state == TurnState.CONNECTING:
+                    self._set_state(TurnState.LISTENING)
+
+            elif event_type == "input_audio_buffer.committed":
+                self.replay.acknowledge_commit()
+
+            elif event_type in TRANSCRIPT_EVENTS:
+                self.handle_transcript_event(event)
+
+            elif event_type == "response.created":
+                self.track_response_created(event)
+                if self.response_active:
+                    self._set_state(TurnState.RESPONDING)
+
+            elif event_type == "response.done":
+                self.track_response_done(event)
+                if not self.response_active:
+                    self._set_state(TurnState.LISTENING)
+
+            elif event_type == "input_audio_buffer.speech_started":
+                if self.assistant_speaking():
+                    await self._barge_in("server_vad")
+
+            elif event_type == "error":
+                print("Realtime API error:", event.get("error"))
+
+    async def _serve_connection(self, ws):
+        """Run one connection until it drops or ``stop_async`` is called."""
+        self.ws = ws
+        self._send_queue = asyncio.Queue(maxsize=self.send_queue_size)
+        await ws.send(json.dumps(self.session_config()))
+        # Rebuild the server's input buffer before any live frame is queued. Capture
+        # waits on the lock meanwhile (its frames pile up in the input queue), so
+        # nothing captured during a slow replay is left out of the new session.
+        async with self._replay_lock:
+            messages, audio_bytes = self.resume_messages()
+            for message in messages:
+                await ws.send(message)
+            self.connected = True
+        self.backoff.reset()
+        self.report_resumed(audio_bytes)
+
+        if self._capture_task is None:
+            self._capture_task = asyncio.create_task(self._capture_loop())
+        tasks = [
+            asyncio.create_task(self._send_loop()),
+            asyncio.create_task(self._receive_loop()),
+        ]
+        stopper = asyncio.create_task(self._stopped.wait())
+        try:
+            await asyncio.wait(
+                tasks + [stopper, self._capture_task], return_when=asyncio.FIRST_COMPLETED
+            )
+        finally:
+            for task in tasks + [stopper]:
+                task.cancel()
+            await asyncio.gather(*tasks, stopper, return_exceptions=True)
+            self.connected = False
+            # Unblock a capture put on the dead queue; its frames are in the replay ring
+            while not self._send_queue.empty():
+                self._send_queue.get_nowait()
+
+    def _connection_dropped(self):
+        print("WebSocket connection lost.")
+        self.connection_lost()
+        if not self.response_active and self.state in (TurnState.COMMITTED, TurnState.RESPONDING):
+            self._set_state(TurnState.LISTENING)
+
+    async def run_async(self):
+        """Connect and run until ``stop_async`` is called, reconnecting when the connection drops."""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "OpenAI-Beta": "realtime=v1",
+        }
+        self._loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self.player.start()
+
+        try:
+            while not self._stopped.is_set():
+                try:
+                    async with websockets.connect(
+                        self.ws_url, extra_headers=headers, max_size=None
+                    ) as ws:
+                        print("Connected to server.")
+                        await self._serve_connection(ws)
+                except (OSError, websockets.WebSocketException) as e:
+                    print(f"Realtime connection failed: {e}")
+                if self._stopped.is_set() or (self._capture_task and self._capture_task.done()):
+                    break  # Stopped, or the capture source ended
+                self._connection_dropped()
+                if (
+                    self.max_reconnect_attempts is not None
+                    and self.backoff.attempts >= self.max_reconnect_attempts
+                ):
+                    print("Giving up on the realtime session after repeated failures.")
+                    break
+                delay = self.backoff.next_delay()
+                print(f"Reconnecting in {delay:.2f}s...")
+                try:
+                    await asyncio.wait_for(self._stopped.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if self._capture_task is not None:
+                self._capture_task.cancel()
+                await asyncio.gather(self._capture_task, return_exceptions=True)
+            self._close_input()
+            self.player.stop()
+            print(f"Uplink stats: {self.send_stats.summary()}")
+            print(f"Reconnect stats: {self.reconnect_stats.summary()}")
+            if self.response_cache is not None:
+                print(f"Response cache stats: {self.response_cache.stats()}")
+            if self.transcript is not None:
+                self.transcript.close()
+            self.finish_tracing()
+            self._set_state(TurnState.CLOSED)
+
+    async def stop_async(self):
+        if self._stopped is not None:
+            self._stopped.set()
+
+    def run(self):
+        asyncio.run(self.run_async())
+
+    def stop(self):
+        """Thread-safe stop for callers outside the event loop."""
+        if self._loop is not None and self._stopped is not None:
+            self._loop.call_soon_threadsafe(self._stopped.set)
+
+
+async def run_sessions(clients):
+    """Serve any number of realtime sessions concurrently on the current event loop."""
+    results = await asyncio.gather(
+        *(client.run_async() for client in clients), return_exceptions=True
+    )
+    for client, result in zip(clients, results):
+        if isinstance(result, Exception):
+            print(f"Session {client.ws_url} ended with error: {result}")
+    return results
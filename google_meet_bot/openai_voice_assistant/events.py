@@ -0,0 +1,118 @@
+import base64
+import binascii
+import json
+import time
+import tracemalloc
+import numpy as np
+
+
+class SplicedAppendEncoder:
+    """Builds ``input_audio_buffer.append`` events without dicts, str or json.dumps.
+
+    The JSON envelope is prebuilt around a reusable bytearray, and each call
+    splices the base64 payload into it. This is not zero-allocation: binascii
+    has no encode-into-buffer API, so every call allocates one payload-sized
+    bytes object that is then copied into place (a numpy encoder that writes
+    in place was over ten times slower at 20 ms frames). Base64 never needs
+    JSON escaping, which makes the splice safe. The returned buffer is reused:
+    send or copy it before the next ``encode`` call.
+    """
+
+    PREFIX = b'{"type":"input_audio_buffer.append","audio":"'
+    SUFFIX = b'"}'
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._payload_len = -1
+
+    def _resize(self, payload_len):
+        self._buffer = bytearray(self.PREFIX + b"\0" * payload_len + self.SUFFIX)
+        self._payload_len = payload_len
+
+    def encode(self, pcm):
+        """Return the UTF-8 JSON event for raw PCM16 bytes as a reused bytearray."""
+        payload_len = 4 * ((len(pcm) + 2) // 3)
+        if payload_len != self._payload_len:
+            self._resize(payload_len)  # Frame size changed (rare with fixed frame_ms)
+        start = len(self.PREFIX)
+        self._buffer[start : start + payload_len] = binascii.b2a_base64(pcm, newline=False)
+        return self._buffer
+
+
+def json_append_event(pcm):
+    """Reference (previous) implementation: base64 → str → dict → json.dumps → UTF-8."""
+    event = {"type": "input_audio_buffer.append", "audio": base64.b64encode(pcm).decode()}
+    return json.dumps(event).encode("utf-8")
+
+
+def benchmark(frame_ms=(20, 100), rate=24000, seconds=1.0):
+    """Compare messages/second and allocation per message for both encoders."""
+    encoder = SplicedAppendEncoder()
+    for ms in frame_ms:
+        pcm = bytes(range(256)) * (rate * ms // 1000 * 2 // 256 + 1)
+        pcm = pcm[: rate * ms // 1000 * 2]
+        assert bytes(encoder.encode(pcm)) == json.dumps(json.loads(json_append_event(pcm)), separators=(",", ":")).encode()
+
+        for name, fn in (("json.dumps", json_append_event), ("SplicedAppendEncoder", encoder.encode)):
+            count = 0
+            deadline = time.perf_counter() + seconds
+            start = time.perf_counter()
+            while time.perf_counter() < deadline:
+                for _ in range(100):
+                    fn(pcm)
+                count += 100
+            rate_per_s = count / (time.perf_counter() - start)
+
+            fn(pcm)  # Warm any caches before measuring allocations
+            tracemalloc.start()
+            fn(pcm)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            print(
+                f"{ms:>4} ms frame ({len(pcm)} B) {name:>18}: "
+                f"{rate_per_s:>10,.0f} msg/s, peak {peak:>6,} B allocated per message"
+            )
+
+
+def _float_roundtrip_in(b64):
+    """Previous inbound path: base64 → float64 → int16 bytes for the device."""
+    audio = np.frombuffer(base64.b64decode(b64), dtype=np.int16) / 32767.0
+    return (audio * 32767).astype(np.int16).tobytes()
+
+
+def _float_roundtrip_out(pcm):
+    """Previous outbound path: int16 → float → int16 → base64 str."""
+    audio = np.frombuffer(pcm, dtype=np.int16) / 32767.0
+    return base64.b64encode((audio * 32767).astype(np.int16).tobytes()).decode()
+
+
+def benchmark_audio_codec(delta_ms=(50, 500), rate=24000, seconds=1.0):
+    """Compare the old float round-trips with the int16 passthrough in both directions."""
+    rng = np.random.default_rng(0)
+    for ms in delta_ms:
+        pcm = rng.integers(-32768, 32767, rate * ms // 1000, dtype=np.int16).tobytes()
+        b64 = base64.b64encode(pcm).decode()
+        cases = (
+            ("inbound float64", lambda: _float_roundtrip_in(b64)),
+            ("inbound int16", lambda: base64.b64decode(b64)),
+            ("outbound float64", lambda: _float_roundtrip_out(pcm)),
+            ("outbound int16", lambda: base64.b64encode(pcm).decode()),
+        )
+        for name, fn in cases:
+            count = 0
+            start = time.perf_counter()
+            while time.perf_counter() - start < seconds:
+                fn()
+                count += 1
+            per_call = (time.perf_counter() - start) / count * 1e6
+            tracemalloc.start()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{ms:>4} ms delta {name:>17}: {per_call:>8.1f} us/call, peak {peak:>8,} B")
+
+
+if __name__ == "__main__":
+    benchmark()
+    benchmark_audio_codec()
@@ -0,0 +1,211 @@
+import bisect
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Points in a turn, in pipeline order. Marks are stored by index so the
+# per-frame path only does a list store.
+MARKS = (
+    "capture_start",  # VAD detected the start of the participant's speech
+    "first_append",  # First input_audio_buffer.append of the turn queued
+    "last_append",  # Most recent append queued (updated every frame)
+    "commit",  # input_audio_buffer.commit queued
+    "response_create",  # response.create queued
+    "first_delta",  # First response.audio.delta received
+    "playback_start",  # First response audio written to the device
+    "playback_end",  # Response audio finished (or was interrupted)
+)
+MARK_INDEX = {name: i for i, name in enumerate(MARKS)}
+CAPTURE_START = MARK_INDEX["capture_start"]
+FIRST_APPEND = MARK_INDEX["first_append"]
+LAST_APPEND = MARK_INDEX["last_append"]
+COMMIT = MARK_INDEX["commit"]
+
+# Derived spans (name, from mark, to mark) observed into histograms per turn
+SPANS = (
+    ("speech", "capture_start", "last_append"),
+    ("append_to_commit", "last_append", "commit"),
+    ("commit_to_first_delta", "commit", "first_delta"),
+    ("first_delta_to_playback", "first_delta", "playback_start"),
+    ("end_of_speech_to_playback", "last_append", "playback_start"),
+    ("playback", "playback_start", "playback_end"),
+)
+
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    """Fixed-bucket histogram in seconds (Prometheus cumulative semantics on export)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Process-wide histograms shared by every session."""
+
+    def __init__(self):
+        self.spans = {name: Histogram() for name, _, _ in SPANS}
+        self.turns_total = 0
+        self.interrupted_total = 0
+        self._lock = threading.Lock()
+
+    def observe_turn(self, marks, interrupted):
+        with self._lock:
+            self.turns_total += 1
+            if interrupted:
+                self.interrupted_total += 1
+            for name, start, end in SPANS:
+                t0 = marks[MARK_INDEX[start]]
+                t1 = marks[MARK_INDEX[end]]
+                if t0 is not None and t1 is not None and t1 >= t0:
+                    self.spans[name].observe(t1 - t0)
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP realtime_turns_total Completed voice assistant turns.",
+            "# TYPE realtime_turns_total counter",
+            f"realtime_turns_total {self.turns_total}",
+            "# HELP realtime_turns_interrupted_total Turns whose response was cut off by barge-in.",
+            "# TYPE realtime_turns_interrupted_total counter",
+            f"realtime_turns_interrupted_total {self.interrupted_total}",
+            "# HELP realtime_turn_span_seconds Duration of each stage of a turn.",
+            "# TYPE realtime_turn_span_seconds histogram",
+        ]
+        with self._lock:
+            for name, hist in self.spans.items():
+                cumulative = 0
+                for bound, count in zip(hist.buckets, hist.counts):
+                    cumulative += count
+                    lines.append(f'realtime_turn_span_seconds_bucket{{span="{name}",le="{bound}"}} {cumulative}')
+                lines.append(f'realtime_turn_span_seconds_bucket{{span="{name}",le="+Inf"}} {hist.count}')
+                lines.append(f'realtime_turn_span_seconds_sum{{span="{name}"}} {hist.sum:.6f}')
+                lines.append(f'realtime_turn_span_seconds_count{{span="{name}"}} {hist.count}')
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+class TurnTracer:
+    """Per-session turn tracing. Every method is safe to call from any thread.
+
+    Capture, the websocket receiver and the playback thread all mark the same
+    turn, so marks, the interrupted flag and the swap in ``finish_turn`` share
+    one lock, as MetricsRegistry does.
+    """
+
+    def __init__(self, session_id="session", registry=REGISTRY):
+        self.session_id = session_id
+        self.registry = registry
+        self.marks = [None] * len(MARKS)
+        self.turn_started_wall = None
+        self.completed = []  # One dict per finished turn, for the JSONL dump
+        self.interrupted = False
+        self._lock = threading.Lock()
+
+    def mark(self, name):
+        """Record a mark for the current turn; only the first occurrence counts."""
+        index = MARK_INDEX[name]
+        with self._lock:
+            if self.marks[index] is None:
+                self.marks[index] = time.perf_counter()
+                if index == 0:
+                    self.turn_started_wall = time.time()
+
+    def mark_append(self):
+        """Per-frame hook: an uncontended lock and two list stores.
+
+        Audio streams continuously, so only appends between the start of speech
+        and the commit belong to the turn.
+        """
+        with self._lock:
+            marks = self.marks
+            if marks[CAPTURE_START] is None or marks[COMMIT] is not None:
+                return
+            now = time.perf_counter()
+            if marks[FIRST_APPEND] is None:
+                marks[FIRST_APPEND] = now
+            marks[LAST_APPEND] = now
+
+    def mark_interrupted(self):
+        with self._lock:
+            self.interrupted = True
+        self.mark("playback_end")
+
+    def finish_turn(self):
+        """Close the current turn (if any marks were recorded) and publish its spans."""
+        with self._lock:
+            marks = self.marks
+            if all(m is None for m in marks):
+                return
+            started_wall, interrupted = self.turn_started_wall, self.interrupted
+            self.marks = [None] * len(MARKS)
+            self.turn_started_wall = None
+            self.interrupted = False
+        # The detached marks belong to this call alone from here on
+        self.registry.observe_turn(marks, interrupted)
+        origin = next(m for m in marks if m is not None)
+        turn = {
+            "session": self.session_id,
+            "started_at": started_wall,
+            "interrupted": interrupted,
+            "marks_ms": {
+                name: round((m - origin) * 1000, 2) if m is not None else None
+                for name, m in zip(MARKS, marks)
+            },
+        }
+        with self._lock:
+            self.completed.append(turn)
+
+    def dump_jsonl(self, path):
+        """Append every completed turn of this session to a JSONL file."""
+        with self._lock:
+            completed = list(self.completed)
+        with open(path, "a") as f:
+            for turn in completed:
+                f.write(json.dumps(turn) + "\n")
+        print(f"Wrote {len(completed)} turn traces to {path}")
+
+
+class MetricsServer:
+    """Serves the registry in Prometheus text format at http://host:port/metrics."""
+
+    def __init__(self, port=9464, host="127.0.0.1", registry=REGISTRY):
+        registry_ref = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("/metrics", ""):
+                    self.send_error(404)
+                    return
+                body = registry_ref.prometheus_text().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # Keep scrapes out of the bot's console
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self):
+        self.thread.start()
+        print(f"Metrics available at http://{self.httpd.server_address[0]}:{self.httpd.server_address[1]}/metrics")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
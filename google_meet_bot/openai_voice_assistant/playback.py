@@ -0,0 +1,215 @@
+import collections
+import threading
+import time
+from bot.audio_host import AudioHost
+from bot.vad import frame_dbfs
+
+
+class JitterBufferPlayer:
+    """Plays streamed PCM16 through one long-lived output stream.
+
+    Producers (the websocket thread) only call ``enqueue``. A dedicated playback
+    thread waits until ``target_ms`` of audio is buffered, then writes ``frame_ms``
+    blocks to the device. If the buffer runs dry mid-response it counts an
+    underrun and rebuffers instead of stuttering through a partial frame.
+    """
+
+    def __init__(
+        self,
+        rate=24000,
+        channels=1,
+        frame_ms=20,
+        target_ms=120,
+        max_ms=30000,
+        output_device_index=None,
+        audio_interface=None,
+        tracer=None,
+    ):
+        self.rate = rate
+        self.channels = channels
+        self.frame_bytes = int(rate * frame_ms / 1000) * channels * 2
+        self.bytes_per_ms = rate * channels * 2 / 1000
+        self.target_bytes = int(target_ms * self.bytes_per_ms)
+        self.max_bytes = int(max_ms * self.bytes_per_ms)
+        self.output_device_index = output_device_index
+        self.audio_interface = audio_interface  # PyAudio-like object; None uses the shared AudioHost
+        self.tracer = tracer  # Optional metrics.TurnTracer for playback_start/playback_end
+
+        self._buffer = bytearray()
+        self._cond = threading.Condition()
+        self._end_of_response = False
+        self._buffering = True
+        self.running = False
+        self.thread = None
+
+        # Metrics
+        self.underruns = 0
+        self.overflows = 0
+        self.max_depth_ms = 0.0
+        self.first_enqueue_at = None
+        self.first_audio_latency = None  # Last response: seconds from first enqueue to first write
+        self.playing = False
+        self.played_bytes = 0  # Written to the device since the last mark_response_start()
+        self.interrupt_latencies = []  # Seconds from interrupt() until the device went quiet
+        self._interrupted_at = None
+        # Level of what was just played, the reference for the clients' echo guard
+        self.echo_window_s = 0.5  # Covers the sink -> monitor -> capture round trip
+        self._levels = collections.deque()  # (perf_counter, dBFS) per written frame
+
+    @property
+    def depth_ms(self):
+        return len(self._buffer) / self.bytes_per_ms
+
+    @property
+    def is_active(self):
+        """True while audio is playing or queued to play."""
+        return self.playing or bool(self._buffer)
+
+    @property
+    def played_ms(self):
+        return int(self.played_bytes / self.bytes_per_ms)
+
+    def mark_response_start(self):
+        self.played_bytes = 0
+
+    def enqueue(self, pcm):
+        """Queue PCM16 bytes for playback. Never blocks on the audio device."""
+        with self._cond:
+            if not self.playing and not self._buffer:
+                self.first_enqueue_at = time.perf_counter()
+            self._end_of_response = False
+            self._buffer += pcm
+            if len(self._buffer) > self.max_bytes:
+                # Keep the most recent audio; the playback thread has fallen far behind.
+                self.overflows += 1
+                del self._buffer[: len(self._buffer) - self.max_bytes]
+            depth = self.depth_ms
+            if depth > self.max_depth_ms:
+                self.max_depth_ms = depth
+            self._cond.notify()
+
+    def end_of_response(self):
+        """Mark that no more audio is coming for this response so the tail plays without rebuffering."""
+        with self._cond:
+            self._end_of_response = True
+            self._cond.notify()
+
+    def interrupt(self, detected_at=None):
+        """Barge-in: drop queued audio so the device is silent after the frame in flight."""
+        detected_at = detected_at or time.perf_counter()
+        with self._cond:
+            self._buffer.clear()
+            self._buffering = True
+            self._end_of_response = False
+            self.first_enqueue_at = None
+            if self.playing:
+                self._interrupted_at = detected_at  # Resolved when the in-flight write returns
+            else:
+                self.interrupt_latencies.append(time.perf_counter() - detected_at)
+            self._cond.notify()
+
+    def _next_frame(self):
+        """Wait for the next block to play, or None when stopping."""
+        with self._cond:
+            if self._interrupted_at is not None:
+                self.interrupt_latencies.append(time.perf_counter() - self._interrupted_at)
+                self._interrupted_at = None
+            while self.running:
+                size = len(self._buffer)
+                if self._buffering:
+                    if size >= self.target_bytes or (self._end_of_response and size):
+                        self._buffering = False
+                    else:
+                        if self.playing:
+                            self.playing = False
+                            if self._end_of_response and self.tracer is not None:
+                                self.tracer.mark("playback_end")
+                                self.tracer.finish_turn()
+                        self._cond.wait(0.1)
+                        continue
+
+                if size >= self.frame_bytes or (self._end_of_response and size):
+                    frame = bytes(self._buffer[: self.frame_bytes])
+                    del self._buffer[: self.frame_bytes]
+                    return frame
+
+                if not self._end_of_response:
+                    self.underruns += 1
+                self._buffering = True
+            return None
+
+    def note_played(self, frame):
+        """Record the level of a frame that just went to the device."""
+        now = time.perf_counter()
+        with self._cond:
+            self._levels.append((now, frame_dbfs(frame)))
+            while self._levels and self._levels[0][0] < now - self.echo_window_s:
+                self._levels.popleft()
+
+    def reference_dbfs(self):
+        """Loudest frame played in the last ``echo_window_s``, or None if nothing was."""
+        cutoff = time.perf_counter() - self.echo_window_s
+        with self._cond:
+            recent = [level for at, level in self._levels if at >= cutoff]
+        return max(recent) if recent else None
+
+    def _run(self):
+        stream = AudioHost.get(self.audio_interface).open_output(
+            rate=self.rate,
+            channels=self.channels,
+            frames_per_buffer=self.frame_bytes // (2 * self.channels),
+            device_index=self.output_device_index,
+            owner="playback",
+        )
+        try:
+            while self.running:
+                frame = self._next_frame()
+                if frame is None:
+                    break
+                if not self.playing:
+                    self.playing = True
+                    if self.tracer is not None:
+                        self.tracer.mark("playback_start")
+                    if self.first_enqueue_at is not None:
+                        self.first_audio_latency = time.perf_counter() - self.first_enqueue_at
+                        self.first_enqueue_at = None
+                if len(frame) < self.frame_bytes:
+                    frame += b"\x00" * (self.frame_bytes - len(frame))
+                stream.write(frame)
+                self.played_bytes += len(frame)
+                self.note_played(frame)
+        finally:
+            stream.close()  # Parked in the audio host for the next player
+
+    def start(self):
+        self.running = True
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        if self.thread is not None:
+            self.thread.join()
+        print(f"Playback stats: {self.stats()}")
+
+    def stats(self):
+        latencies = sorted(self.interrupt_latencies)
+        return {
+            "interruptions": len(latencies),
+            "interrupt_to_silence_ms_max": (
+                round(latencies[-1] * 1000, 1) if latencies else None
+            ),
+            "interrupt_to_silence_ms_p50": (
+                round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None
+            ),
+            "underruns": self.underruns,
+            "overflows": self.overflows,
+            "max_depth_ms": round(self.max_depth_ms, 1),
+            "first_audio_latency_ms": (
+                round(self.first_audio_latency * 1000, 1)
+                if self.first_audio_latency is not None
+                else None
+            ),
+        }
@@ -5,11 +5,46 @@ import numpy as np
 import pyaudio
 import websocket
 import threading
+import time
+from bot.audio_host import AudioHost
+from bot.vad import StreamingVAD, frame_dbfs
+from openai_voice_assistant.events import SplicedAppendEncoder
+from openai_voice_assistant.metrics import TurnTracer
+from openai_voice_assistant.playback import JitterBufferPlayer
+from openai_voice_assistant.resume import Backoff, ReconnectStats, ReplayBuffer
+from openai_voice_assistant.transcript_store import TranscriptWriter
+from openai_voice_assistant.uplink import UplinkSender
+
+# Realtime events that carry finished text, mapped to the transcript entry kind
+TRANSCRIPT_EVENTS = {
+    "conversation.item.input_audio_transcription.completed": "user",
+    "conversation.item.input_audio_transcription.failed": "user_error",
+    "response.audio_transcript.done": "assistant",
+    "response.text.done": "assistant_text",
+}
 
 
 class AudioWebSocketClient:
     def __init__(
-        self, api_key, ws_url, duration=50, samplerate=24000, filename="meet_audio.wav"
+        self,
+        api_key,
+        ws_url,
+        duration=50,
+        samplerate=24000,
+        filename="meet_audio.wav",
+        capture=None,
+        frame_ms=100,
+        max_coalesce_ms=500,
+        end_of_speech_ms=300,
+        audio_interface=None,
+        session_id="session",
+        trace_path=None,
+        max_replay_ms=10000,
+        max_reconnect_attempts=None,
+        response_cache=None,
+        transcript_path=None,
+        barge_in_ms=200,
+        echo_margin_db=6.0,
     ):
         self.api_key = api_key # Open AI key
         self.ws_url = ws_url # wss://api.openai.com/v1/realtime?model=gpt-4o-realtime-preview-2024-10-01
@@ -19,37 +54,320 @@ class AudioWebSocketClient:
         self.wait = False
 
         # Audio parameters
-        self.chunk = 44800  # Number of frames per buffer (2 seconds at 24kHz)
         self.format = pyaudio.paInt16  # 16-bit PCM
         self.channels = 1  # Mono
         self.rate = 24000  # Sampling rate of 24kHz
-        self.silence_threshold = 1000  # Adjust threshold to detect silence
-        self.silence_duration = 5  # Seconds of silence before stopping
+        self.frame_ms = frame_ms  # Uplink frame duration (20-100 ms keeps turn latency low)
+        self.chunk = int(self.rate * frame_ms / 1000)  # Number of frames per buffer
+        self.max_coalesce_ms = max_coalesce_ms  # Largest append sent when the socket is backed up
 
-        # State variables
-        self.silent_chunks = 0  # Counter for silent frames
+        # Streaming VAD on 20 ms frames; a turn ends after end_of_speech_ms of non-speech
+        self.vad = StreamingVAD(
+            rate=self.rate, frame_ms=20, hangover_ms=end_of_speech_ms
+        )
+
+        # Optional AudioCaptureBus subscription (24 kHz mono) shared with the recorder
+        self.capture = capture
+
+        # PyAudio-like device interface (e.g. tools.fake_audio.FakePyAudio); None uses PyAudio
+        self.audio_interface = audio_interface
 
-    def is_silent(self, data, threshold=None):
-        """Check if the chunk of audio is silent."""
-        threshold = threshold or self.silence_threshold
-        audio_data = np.frombuffer(data, dtype=np.int16)
-        print(np.abs(audio_data).mean())
-        return np.abs(audio_data).mean() < threshold
+        # Per-turn latency tracing; completed turns are appended to trace_path on stop
+        self.tracer = TurnTracer(session_id)
+        self.trace_path = trace_path
+
+        # Long-lived playback stream fed through a jitter buffer
+        self.player = JitterBufferPlayer(
+            rate=self.rate,
+            channels=self.channels,
+            audio_interface=audio_interface,
+            tracer=self.tracer,
+        )
+
+        # Background sender that owns ws.send while connected
+        self.uplink = None
+        self.append_encoder = SplicedAppendEncoder()
+
+        # Reconnect state: uncommitted uplink audio is kept so a dropped session can resume
+        self.replay = ReplayBuffer(int(self.rate * self.channels * 2 * max_replay_ms / 1000))
+        self.backoff = Backoff()
+        self.max_reconnect_attempts = max_reconnect_attempts  # None retries until stopped
+        self.reconnect_stats = ReconnectStats()
+        self.connected = False
+        self._uplink_lock = threading.Lock()  # Keeps new frames behind the replay on reconnect
+        self._stop_event = threading.Event()
+        self._capture_thread = None
+
+        # Optional ResponseAudioCache for phrases the bot says repeatedly (see speak)
+        self.response_cache = response_cache
+        self._cache_fills = {}  # response_id -> (cache key, PCM16 chunks received so far)
+
+        # Finished user/assistant utterances are appended to transcript_path off-thread
+        self.transcript = TranscriptWriter(transcript_path) if transcript_path else None
+
+        # Response / barge-in state
+        self.response_active = False  # response.create sent and response.done not yet seen
+        self.current_response_id = None
+        self.current_item_id = None  # Assistant item whose audio is playing
+        self.cancelled_responses = set()  # Late deltas from these are dropped
+        self._cancel_next_response = False  # Cancelled before response.created arrived
+        self.capturing = False
+
+        # Echo guard: the assistant's own playback can come back on the capture device, so
+        # local speech only barges in once it has lasted barge_in_ms at echo_margin_db over it
+        self.barge_in_ms = barge_in_ms
+        self.echo_margin_db = echo_margin_db
+        self._held = []  # Frames of a possible barge-in, sent if it is confirmed
+        self._held_ms = 0.0
+        self._overlapped = False  # The current speech segment began while the assistant spoke
+
+    def speech_events(self, data):
+        """Feed captured audio to the VAD; returns (speech_started, speech_ended)."""
+        started = ended = False
+        for event, at in self.vad.process(data):
+            if event == "speech_start":
+                print(f"Speech started at {at:.2f}s.")
+                started = True
+            elif event == "speech_end":
+                print(f"Speech ended at {at:.2f}s.")
+                ended = True
+        return started, ended
+
+    def begin_turn(self):
+        """Close out the previous turn's trace and start timing a new one."""
+        self.tracer.finish_turn()
+        self.tracer.mark("capture_start")
+
+    def assistant_speaking(self):
+        """True while a response is in flight or its audio is still playing."""
+        return self.response_active or self.player.is_active
+
+    def screen_capture(self, data, started, ended):
+        """Echo guard for one captured frame; returns (action, frames).
+
+        ``action`` is "stream" (send ``frames``), "skip", or "barge_in" (interrupt
+        the assistant, then send ``frames``: the speech that confirmed it).
+        While the assistant is talking, a local speech segment must have
+        ``barge_in_ms`` of frames ``echo_margin_db`` above the loudest recently
+        played frame; its quieter frames are held but don't count. A segment
+        that began over the assistant and never passed is dropped to its end,
+        so the echo tail is not committed as a turn.
+        """
+        if self.assistant_speaking():
+            if started:
+                self._overlapped = True
+            if not self.vad.in_speech:
+                self._held, self._held_ms = [], 0.0
+                return "skip", []
+            self._held.append(data)
+            reference = self.player.reference_dbfs()
+            if reference is None or frame_dbfs(data) >= reference + self.echo_margin_db:
+                self._held_ms += len(data) / (2 * self.channels) / self.rate * 1000
+            if self._held_ms < self.barge_in_ms:
+                return "skip", []
+            frames, self._held, self._held_ms = self._held, [], 0.0
+            self._overlapped = False
+            return "barge_in", frames
+        self._held, self._held_ms = [], 0.0
+        if self._overlapped:
+            if ended or not self.vad.in_speech:
+                self._overlapped = False
+            return "skip", []
+        return "stream", [data]
+
+    def interrupt_response(self, reason):
+        """Barge-in: silence playback now and return the events that cancel the response."""
+        detected_at = time.perf_counter()
+        events = []
+        if self.response_active:
+            events.append({"type": "response.cancel"})
+            self.response_active = False
+            if self.current_response_id:
+                self.cancelled_responses.add(self.current_response_id)
+                self.current_response_id = None
+            else:
+                self._cancel_next_response = True
+        if self.current_item_id:
+            # Tell the server how much of the answer the participants actually heard
+            events.append(
+                {
+                    "type": "conversation.item.truncate",
+                    "item_id": self.current_item_id,
+                    "content_index": 0,
+                    "audio_end_ms": self.player.played_ms,
+                }
+            )
+            self.current_item_id = None
+        self.player.interrupt(detected_at)
+        self.tracer.mark_interrupted()
+        print(f"Barge-in ({reason}): cancelled response and flushed playback.")
+        return events
+
+    def track_response_created(self, event):
+        response = event.get("response", {})
+        response_id = response.get("id")
+        if self._cancel_next_response:
+            self._cancel_next_response = False
+            self.cancelled_responses.add(response_id)
+            return
+        self.response_active = True
+        self.current_response_id = response_id
+        cache_key = (response.get("metadata") or {}).get("cache_key")
+        if cache_key and self.response_cache is not None:
+            self._cache_fills[response_id] = (cache_key, [])
+
+    def track_response_done(self, event):
+        response = event.get("response", {})
+        response_id = response.get("id")
+        fill = self._cache_fills.pop(response_id, None)
+        if response_id in self.cancelled_responses:
+            self.cancelled_responses.discard(response_id)
+            return
+        if fill is not None and response.get("status") == "completed":
+            self.response_cache.put(fill[0], b"".join(fill[1]))
+        self.response_active = False
+        self.current_response_id = None
+        self.player.end_of_response()
+
+    def handle_audio_delta(self, event):
+        """Queue a response.audio.delta unless its response was cancelled by a barge-in."""
+        if event.get("response_id") in self.cancelled_responses or not event.get("delta"):
+            return
+        self.tracer.mark("first_delta")
+        if event.get("item_id") != self.current_item_id:
+            self.current_item_id = event.get("item_id")
+            self.player.mark_response_start()
+        # Decoded PCM16 goes straight into the playback buffer, no float round-trip
+        audio = base64.b64decode(event["delta"])
+        fill = self._cache_fills.get(event.get("response_id"))
+        if fill is not None:
+            fill[1].append(audio)
+        self.play_audio(audio)
+
+    def handle_transcript_event(self, event):
+        """Hand finished transcription/text events to the transcript writer (non-blocking)."""
+        if self.transcript is None:
+            return
+        text = (
+            event.get("transcript")
+            or event.get("text")
+            or (event.get("error") or {}).get("message")
+        )
+        self.transcript.record(
+            TRANSCRIPT_EVENTS[event["type"]],
+            text,
+            item_id=event.get("item_id"),
+            response_id=event.get("response_id"),
+        )
+
+    def speak(self, text):
+        """Say ``text`` verbatim, from the response cache when possible.
+
+        A cache hit plays locally with no round trip; a miss asks the server for
+        the audio and stores it once the response completes. Returns True on a hit.
+        """
+        session = self.session_config()["session"]
+        key = None
+        if self.response_cache is not None:
+            key = self.response_cache.key(
+                text, session.get("voice"), session.get("instructions"),
+                f"pcm16@{self.rate}",
+            )
+            pcm = self.response_cache.get(key)
+            if pcm is not None:
+                self.player.mark_response_start()
+                self.play_audio(pcm)
+                self.player.end_of_response()
+                return True
+
+        if not self.connected:
+            print(f"Not connected; cannot synthesize {text!r}.")
+            return False
+        response = {
+            "modalities": ["text", "audio"],
+            "instructions": f"Say exactly the following and nothing else: {text}",
+        }
+        if key is not None:
+            response["metadata"] = {"cache_key": key}  # Echoed back in response.created
+        self.response_active = True
+        self.send_event(self.ws, {"type": "response.create", "response": response})
+        return False
+
+    def connection_lost(self):
+        """Forget server-side state that died with the connection."""
+        self.connected = False
+        self.reconnect_stats.disconnected()
+        self.cancelled_responses.clear()
+        self._cancel_next_response = False
+        self._cache_fills.clear()
+        self.current_response_id = None
+        self.current_item_id = None
+        if self.response_active and not self.replay.pending_commits:
+            # The response was generating on the old session and is gone; let the
+            # audio already received finish playing and go back to listening
+            self.response_active = False
+            self.player.end_of_response()
+
+    def resume_messages(self):
+        """Messages that rebuild the uncommitted input buffer on a new session.
+
+        Returns ``(messages, audio_bytes)``. Audio is coalesced into appends of
+        up to ``max_coalesce_ms``; every commit that was never acknowledged is
+        re-sent with its response.create so the interrupted turn still gets a reply.
+        """
+        max_bytes = int(self.rate * self.channels * 2 * self.max_coalesce_ms / 1000)
+        messages = []
+        run = []
+        run_bytes = 0
+        audio_bytes = 0
+
+        def flush():
+            nonlocal run, run_bytes
+            if run:
+                messages.append(self.append_event(b"".join(run)).decode("ascii"))
+                run = []
+                run_bytes = 0
+
+        for kind, data in self.replay.items():
+            if kind == "audio":
+                if run_bytes + len(data) > max_bytes:
+                    flush()
+                run.append(data)
+                run_bytes += len(data)
+                audio_bytes += len(data)
+            else:
+                flush()
+                messages.append(json.dumps({"type": "input_audio_buffer.commit"}))
+                messages.append(json.dumps({"type": "response.create"}))
+        flush()
+        return messages, audio_bytes
+
+    def report_resumed(self, audio_bytes):
+        outage = self.reconnect_stats.reconnected(audio_bytes)
+        if outage is not None:
+            audio_ms = audio_bytes / (self.rate * self.channels * 2) * 1000
+            print(
+                f"Reconnected in {outage * 1000:.0f} ms; replayed {audio_bytes} bytes "
+                f"({audio_ms:.0f} ms of audio)."
+            )
 
     def audio_to_base64(self, audio_data):
-        """Convert raw audio data to base64-encoded PCM16 data."""
-        audio_data = (audio_data * 32767).astype(np.int16)  # Convert to PCM16
-        return base64.b64encode(audio_data.tobytes()).decode()
+        """Convert raw audio data to base64-encoded PCM16 data.
+
+        PCM16 bytes and int16 arrays are encoded as-is; float arrays in [-1, 1]
+        are scaled to PCM16 first.
+        """
+        if isinstance(audio_data, np.ndarray) and audio_data.dtype != np.int16:
+            audio_data = (audio_data * 32767).astype(np.int16)  # Convert to PCM16
+        return base64.b64encode(memoryview(audio_data).cast("B")).decode()
 
     def base64_to_audio(self, base64_audio):
-        """Convert base64-encoded audio back to raw audio data."""
-        audio_bytes = base64.b64decode(base64_audio)
-        return (
-            np.frombuffer(audio_bytes, dtype=np.int16) / 32767.0
-        )  # Convert back to float
+        """Convert base64-encoded audio to an int16 array (a view over the decoded bytes)."""
+        return np.frombuffer(base64.b64decode(base64_audio), dtype=np.int16)
 
-    def session_update(self, ws):
-        config = {
+    def session_config(self):
+        """Build the session.update event sent when a connection opens."""
+        return {
             "event_id": "event_123",
             "type": "session.update",
             "session": {
@@ -62,126 +380,195 @@ class AudioWebSocketClient:
                 "turn_detection": None,
             },
         }
-        ws.send(json.dumps(config))
+
+    def session_update(self, ws):
+        ws.send(json.dumps(self.session_config()))
 
     def stop(self):
         """Close the WebSocket connection gracefully."""
+        self.capturing = False
+        self._stop_event.set()  # No reconnect after this close
         if self.ws_url:
             self.ws.close()  # Close the WebSocket connection
             print("WebSocket connection closed.")
+        with self._uplink_lock:
+            uplink, self.uplink = self.uplink, None
+        if uplink is not None:
+            uplink.close()
+        self.player.stop()
+        print(f"Reconnect stats: {self.reconnect_stats.summary()}")
+        if self.response_cache is not None:
+            print(f"Response cache stats: {self.response_cache.stats()}")
+        if self.transcript is not None:
+            self.transcript.close()
+        self.finish_tracing()
+
+    def finish_tracing(self):
+        self.tracer.finish_turn()
+        if self.trace_path:
+            self.tracer.dump_jsonl(self.trace_path)
 
     def on_message(self, ws, message):
         """WebSocket event handler for incoming messages."""
         event = json.loads(message)
 
         if event.get("type") == "response.audio.delta":
-            audio_content = event["delta"]
-            if audio_content:
-                audio_data = self.base64_to_audio(
-                    audio_content
-                )  # Convert to raw audio data
-                self.play_audio(audio_data)  # Play the audio immediately
+            self.handle_audio_delta(event)
 
         elif event.get("type") == "session.created":
-            # Start recording and sending audio
-            threading.Thread(target=self.record_and_send_audio, args=(ws,)).start()
+            print("Session created.")
+
+        elif event.get("type") == "response.created":
+            self.track_response_created(event)
 
         elif event.get("type") == "response.done":
-            threading.Thread(target=self.record_and_send_audio, args=(ws,)).start()
+            self.track_response_done(event)
             print("Received audio done event. Continuing to record.")
 
         elif event.get("type") == "input_audio_buffer.speech_started":
             print("speech_started:", event)
+            if self.assistant_speaking():
+                for cancel in self.interrupt_response("server_vad"):
+                    self.send_event(ws, cancel)
 
         elif event.get("type") == "input_audio_buffer.speech_stopped":
             print("speech_stopped:", event)
 
+        elif event.get("type") in TRANSCRIPT_EVENTS:
+            self.handle_transcript_event(event)
+
         elif event.get("type") == "input_audio_buffer.committed":
             print("buffer committed:", event)
+            self.replay.acknowledge_commit()
 
     def on_open(self, ws):
         """WebSocket event handler for connection open."""
         print("Connected to server.")
         self.session_update(ws)
         print("Initial configuration sent.")
+        self.backoff.reset()
+        with self._uplink_lock:
+            # Replay before any new frame can reach the socket
+            messages, audio_bytes = self.resume_messages()
+            for message in messages:
+                ws.send(message)
+            self.uplink = UplinkSender(
+                send_audio=lambda data: ws.send(
+                    self.append_event(data), websocket.ABNF.OPCODE_TEXT
+                ),
+                send_event=ws.send,
+                bytes_per_ms=self.rate * self.channels * 2 / 1000,
+                max_coalesce_ms=self.max_coalesce_ms,
+            )
+            self.connected = True
+        self.report_resumed(audio_bytes)
 
     def play_audio(self, audio_data):
-        """Plays audio from raw audio data using PyAudio."""
-        audio_data_pcm = (audio_data * 32767).astype(np.int16)
-        # os.environ["PULSE_SINK"] = "virtual_speaker"
-
-        # Initialize PyAudio
-        p = pyaudio.PyAudio()
-
-        # Open a stream with the desired format
-        stream = p.open(
-            format=self.format, channels=self.channels, rate=self.rate, output=True
-        )  # Output stream
+        """Queue PCM16 audio (bytes or int16 array) on the playback thread; returns immediately."""
+        if isinstance(audio_data, np.ndarray) and audio_data.dtype != np.int16:
+            audio_data = (audio_data * 32767).astype(np.int16)  # Legacy float input
+        self.player.enqueue(memoryview(audio_data).cast("B"))
 
-        print("Playing audio...")
-        stream.write(audio_data_pcm.tobytes())  # Write audio data to the stream
+    def append_event(self, audio_data):
+        """Serialize an input_audio_buffer.append event for raw PCM16 bytes.
 
-        # Stop and close the stream
-        stream.stop_stream()
-        stream.close()
-        p.terminate()  # Terminate PyAudio
-        print("Audio playback completed.")
+        Returns a reused bytearray holding UTF-8 JSON; send it before the next call.
+        """
+        return self.append_encoder.encode(audio_data)
 
     def send_audio_frame(self, ws, audio_data):
-        """Send audio frame via WebSocket."""
-        base64_audio = base64.b64encode(audio_data).decode()
-        event = {"type": "input_audio_buffer.append", "audio": base64_audio}
-        ws.send(json.dumps(event))
-        print("Sent audio frame.")
+        """Send audio frame through the uplink sender; while disconnected it is only buffered for replay."""
+        self.tracer.mark_append()
+        with self._uplink_lock:
+            self.replay.append(audio_data)
+            if self.uplink is not None:
+                self.uplink.send_audio(audio_data)
+
+    def send_event(self, ws, event):
+        """Send a control event, keeping it ordered behind any queued audio.
+
+        Events raised while disconnected are dropped: cancels and truncates refer
+        to a response the server has already forgotten, and commits are replayed.
+        """
+        with self._uplink_lock:
+            if self.uplink is not None:
+                self.uplink.send_event(json.dumps(event))
 
     def commit_audio_buffer(self, ws):
         """Commit the current audio buffer when silence is detected."""
-        event_commit = {"type": "input_audio_buffer.commit"}
-        ws.send(json.dumps(event_commit))
-        ws.send(json.dumps({"type": "response.create"}))
+        self.replay.mark_commit()
+        self.send_event(ws, {"type": "input_audio_buffer.commit"})
+        self.tracer.mark("commit")
+        self.send_event(ws, {"type": "response.create"})
+        self.tracer.mark("response_create")
 
         print("Sent commit event.")
 
-    def record_and_send_audio(self, ws):
-        """Record audio from the microphone and send to WebSocket."""
-        p = pyaudio.PyAudio()
-        stream = p.open(
-            format=self.format,
-            channels=self.channels,
+    def _open_input(self):
+        """Return a (read, close) pair for the capture source."""
+        if self.capture is not None:
+            self.capture.clear()  # Start from live audio, not whatever the bus buffered before input opened
+            return (lambda: self.capture.read(self.chunk)), (lambda: None)
+
+        stream = AudioHost.get(self.audio_interface).open_input(
             rate=self.rate,
-            input=True,
+            channels=self.channels,
             frames_per_buffer=self.chunk,
+            format=self.format,
+            owner="realtime uplink",
         )
+        return (lambda: stream.read(self.chunk)), stream.close
 
-        print("Recording and sending audio...")
-        self.silent_chunks = 0  # Reset silent chunks counter
-
-        while True:
-
-            data = stream.read(self.chunk)  # Record a chunk of audio
-            self.send_audio_frame(
-                ws, data
-            )  # Send the audio frame regardless of silence
-
-            if self.is_silent(data):
-                self.silent_chunks += 1
-                print("Silent chunk detected:", self.silent_chunks)
-            else:
-                if self.silent_chunks > 0:
-                    print("Sound detected after silence.")
-                self.silent_chunks = 0  # Reset silent count if sound is detected
+    def record_and_send_audio(self, ws):
+        """Record audio from the microphone and send to WebSocket for the whole session."""
+        read, close = self._open_input()
 
-            # If silence persists for the specified duration, commit the audio buffer
-            if self.silent_chunks * (self.chunk / self.rate) >= self.silence_duration:
+        print("Recording and sending audio...")
+        self.vad.reset()
+        self.capturing = True
+
+        while self.capturing:
+
+            data = read()  # Record a chunk of audio
+            if data is None:
+                break  # Capture bus stopped
+            started, ended = self.speech_events(data)
+
+            action, frames = self.screen_capture(data, started, ended)
+            if action == "skip":
+                continue  # The assistant (or its echo) is talking
+            if action == "barge_in":
+                # A participant is talking over the assistant: stop and listen
+                for event in self.interrupt_response("local_vad"):
+                    self.send_event(ws, event)
+                started = True
+            if started:
+                self.begin_turn()
+
+            for frame in frames:
+                self.send_audio_frame(ws, frame)
+
+            # Once the VAD sees the end of an utterance, commit the audio buffer
+            if ended:
                 self.commit_audio_buffer(ws)
-                break  # Exit loop after committing buffer
-
-        stream.stop_stream()
-        stream.close()
-        p.terminate()
+                self.response_active = True
+
+        close()
+
+    def handle_disconnect(self):
+        """Tear down the dead connection's uplink; queued frames are already in the replay ring."""
+        with self._uplink_lock:
+            uplink, self.uplink = self.uplink, None
+            was_connected = self.connected
+            self.connected = False
+        if uplink is not None:
+            uplink.abort()
+        if was_connected:
+            print("WebSocket connection lost.")
+            self.connection_lost()
 
     def run(self):
-        """Establish WebSocket connection and start recording."""
+        """Establish WebSocket connection and start recording; reconnects until stopped."""
         # websocket.enableTrace(True)
 
         # WebSocket setup
@@ -189,14 +576,37 @@ class AudioWebSocketClient:
             "Authorization": f"Bearer {self.api_key}",  # Replace with your API key
             "OpenAI-Beta": "realtime=v1",
         }
-        ws = websocket.WebSocketApp(
-            self.ws_url, on_message=self.on_message, header=headers
-        )
-        self.ws = ws
 
         def on_open_with_audio(ws):
-            self.on_open(ws)  # Send initial config
-            self.record_and_send_audio(ws)  # Start recording and sending audio frames
-
-        ws.on_open = on_open_with_audio
-        ws.run_forever()
\ No newline at end of file
+            self.on_open(ws)  # Send initial config and replay any buffered audio
+            if self._capture_thread is None:
+                # One capture thread for the session, kept across reconnects; the
+                # websocket thread stays free for messages
+                self._capture_thread = threading.Thread(
+                    target=self.record_and_send_audio, args=(ws,), daemon=True
+                )
+                self._capture_thread.start()
+
+        self.player.start()
+        while not self._stop_event.is_set():
+            ws = websocket.WebSocketApp(
+                self.ws_url,
+                on_open=on_open_with_audio,
+                on_message=self.on_message,
+                header=headers,
+            )
+            self.ws = ws
+            # Pings catch connections that die without a close frame
+            ws.run_forever(ping_interval=20, ping_timeout=10)
+            self.handle_disconnect()
+            if self._stop_event.is_set():
+                break
+            if (
+                self.max_reconnect_attempts is not None
+                and self.backoff.attempts >= self.max_reconnect_attempts
+            ):
+                print("Giving up on the realtime session after repeated failures.")
+                break
+            delay = self.backoff.next_delay()
+            print(f"Reconnecting in {delay:.2f}s...")
+            self._stop_event.wait(delay)
\ No newline at end of file
@@ -0,0 +1,150 @@
+import collections
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+
+class ResponseAudioCache:
+    """On-disk LRU cache of synthesized response audio (raw PCM16).
+
+    Entries are keyed on normalized prompt text plus the voice, instructions
+    and audio format that produced them, stored one file per entry, and
+    tracked by an in-memory OrderedDict in least- to most-recently-used order.
+    The index is persisted to ``index.json`` so a restarted bot keeps its
+    cache. A hit touches the entry's file mtime rather than rewriting the
+    index, and loading orders entries by mtime, so recency survives restarts.
+    When the total size exceeds ``max_bytes``, the least recently used
+    entries are deleted. Safe to share between sessions in one process.
+    """
+
+    INDEX_FILE = "index.json"
+
+    def __init__(self, directory="response_cache", max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0  # Response audio served locally instead of streamed
+        self.evictions = 0
+        self._index = collections.OrderedDict()  # key -> size in bytes
+        self._size = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def normalize(text):
+        """Case- and whitespace-insensitive form of the text being spoken."""
+        return " ".join(text.casefold().split())
+
+    @classmethod
+    def key(cls, text, voice, instructions, audio_format="pcm16@24000"):
+        material = "\0".join((cls.normalize(text), voice or "", instructions or "", audio_format))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pcm")
+
+    def _load_index(self):
+        """Restore the entries in index.json in LRU order (by file mtime), dropping any whose files are gone."""
+        try:
+            with open(os.path.join(self.directory, self.INDEX_FILE)) as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            # No usable index: rebuild from the files
+            entries = [n[: -len(".pcm")] for n in os.listdir(self.directory) if n.endswith(".pcm")]
+        found = []
+        for key in entries:
+            try:
+                stat = os.stat(self._path(key))
+            except OSError:
+                continue
+            found.append((stat.st_mtime_ns, key, stat.st_size))
+        # Hits touch the mtime, so oldest mtime is least recently used
+        found.sort(key=lambda entry: entry[0])
+        for _, key, size in found:
+            self._index[key] = size
+            self._size += size
+        self._evict()
+
+    def _write_atomic(self, path, data):
+        """Write via a unique temp file in the cache directory, then rename over ``path``.
+
+        The temp name is unique per call, so concurrent writers (other sessions,
+        or other bot processes sharing the directory) never share a partial file.
+        """
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+
+    def _save_index(self):
+        self._write_atomic(
+            os.path.join(self.directory, self.INDEX_FILE), json.dumps(list(self._index)).encode()
+        )
+
+    def _evict(self):
+        while self._size > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._size -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def get(self, key):
+        """Return the cached PCM16 for ``key`` (and mark it recently used), or None."""
+        with self._lock:
+            if key not in self._index:
+                self.misses += 1
+                return None
+            try:
+                with open(self._path(key), "rb") as f:
+                    pcm = f.read()
+            except OSError:
+                # Deleted behind our back; treat as a miss and forget it
+                self._size -= self._index.pop(key)
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            try:
+                os.utime(self._path(key))  # Persist the recency for the next start
+            except OSError:
+                pass
+            self.hits += 1
+            self.bytes_saved += len(pcm)
+            return pcm
+
+    def put(self, key, pcm):
+        """Store PCM16 for ``key``; the file is written atomically."""
+        if not pcm or len(pcm) > self.max_bytes:
+            return
+        self._write_atomic(self._path(key), pcm)
+        with self._lock:
+            self._size -= self._index.pop(key, 0)
+            self._index[key] = len(pcm)
+            self._size += len(pcm)
+            self._evict()
+            self._save_index()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._index),
+            "bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "bytes_saved": self.bytes_saved,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,129 @@
+import collections
+import random
+import threading
+import time
+
+
+class ReplayBuffer:
+    """Bounded ring of uplink audio the server has not acknowledged as committed.
+
+    Every appended frame is kept (up to ``max_bytes``, oldest evicted first)
+    until an ``input_audio_buffer.committed`` acknowledges the commit that
+    covers it. After a reconnect the new session has an empty input buffer, so
+    ``items`` replays what is left: audio runs interleaved with the commits
+    that were sent but never acknowledged.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.start = 0  # Absolute stream offset of the oldest retained byte
+        self.end = 0  # Absolute stream offset after the newest byte
+        self.evicted_bytes = 0
+        self._chunks = collections.deque()
+        self._commits = collections.deque()  # Offsets of commits not yet acknowledged
+        self._lock = threading.Lock()
+
+    @property
+    def size(self):
+        return self.end - self.start
+
+    @property
+    def pending_commits(self):
+        return len(self._commits)
+
+    def append(self, data):
+        data = bytes(data)  # No copy for the bytes PyAudio and the capture bus return
+        with self._lock:
+            self._chunks.append(data)
+            self.end += len(data)
+            while self.end - self.start > self.max_bytes and len(self._chunks) > 1:
+                old = self._chunks.popleft()
+                self.start += len(old)
+                self.evicted_bytes += len(old)
+
+    def mark_commit(self):
+        """A commit was sent for everything appended so far."""
+        with self._lock:
+            self._commits.append(self.end)
+
+    def acknowledge_commit(self):
+        """The server committed the oldest outstanding commit; drop the audio it covered."""
+        with self._lock:
+            if not self._commits:
+                return
+            upto = self._commits.popleft()
+            while self._chunks and self.start + len(self._chunks[0]) <= upto:
+                self.start += len(self._chunks.popleft())
+
+    def items(self):
+        """Snapshot as ``("audio", bytes)`` and ``("commit", None)`` items in stream order."""
+        with self._lock:
+            items = []
+            offset = self.start
+            commits = collections.deque(self._commits)
+            for chunk in self._chunks:
+                while commits and commits[0] <= offset:
+                    commits.popleft()
+                    items.append(("commit", None))
+                items.append(("audio", chunk))
+                offset += len(chunk)
+            items.extend(("commit", None) for _ in commits)
+            return items
+
+
+class Backoff:
+    """Exponential reconnect delay with jitter so many bots don't reconnect in lockstep."""
+
+    def __init__(self, initial=0.25, maximum=10.0, factor=2.0, jitter=0.2):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+        self.attempts = 0
+
+    def next_delay(self):
+        delay = min(self.maximum, self.initial * self.factor ** self.attempts)
+        self.attempts += 1
+        return delay * (1 + random.uniform(-self.jitter, self.jitter))
+
+    def reset(self):
+        self.attempts = 0
+
+
+class ReconnectStats:
+    """Outage durations (drop detected → session restored) and replayed audio."""
+
+    def __init__(self):
+        self.disconnects = 0
+        self.reconnects = 0
+        self.durations = []
+        self.replayed_bytes = 0
+        self._down_since = None
+
+    def disconnected(self):
+        if self._down_since is None:
+            self._down_since = time.perf_counter()
+            self.disconnects += 1
+
+    def reconnected(self, replayed_bytes):
+        """Record a restored session; returns the outage in seconds (None on first connect)."""
+        if self._down_since is None:
+            return None
+        duration = time.perf_counter() - self._down_since
+        self._down_since = None
+        self.reconnects += 1
+        self.durations.append(duration)
+        self.replayed_bytes += replayed_bytes
+        return duration
+
+    def summary(self):
+        if not self.durations:
+            return {"disconnects": self.disconnects, "reconnects": 0}
+        ordered = sorted(self.durations)
+        return {
+            "disconnects": self.disconnects,
+            "reconnects": self.reconnects,
+            "reconnect_ms_p50": round(ordered[len(ordered) // 2] * 1000, 1),
+            "reconnect_ms_max": round(ordered[-1] * 1000, 1),
+            "replayed_bytes": self.replayed_bytes,
+        }
@@ -0,0 +1,203 @@
+"""Append-only meeting transcript log with a sparse time index.
+
+The log is JSONL, one entry per finished utterance:
+    {"t": <unix time>, "kind": "user" | "assistant" | ..., "text": ..., ...}
+Timestamps never decrease, so the sidecar ``<log>.idx`` can map time to byte
+offset. It is a flat array of little-endian (float64 time, uint64 offset)
+pairs, one per ``index_interval`` seconds of transcript. Reading a time range
+bisects the index and then scans only the part of the log it points at.
+
+Usage (from google_meet_bot/):
+    python -m openai_voice_assistant.transcript_store meet_transcript.jsonl --tail 20
+    python -m openai_voice_assistant.transcript_store meet_transcript.jsonl \
+        --start 2024-11-05T10:00 --end 2024-11-05T10:15
+"""
+
+import argparse
+import bisect
+import datetime
+import json
+import os
+import queue
+import struct
+import threading
+import time
+
+INDEX_RECORD = struct.Struct("<dQ")
+_CLOSE = object()  # Writer queue sentinel
+
+
+class TranscriptWriter:
+    """Background writer; ``record`` only enqueues and never blocks the caller."""
+
+    def __init__(self, path, index_interval=5.0, flush_interval=1.0):
+        self.path = path
+        self.index_interval = index_interval
+        self.flush_interval = flush_interval
+        self.entries = 0
+        self._queue = queue.SimpleQueue()
+        self._last_t = 0.0
+        self._next_index_t = 0.0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def record(self, kind, text, **fields):
+        self._queue.put({"t": time.time(), "kind": kind, "text": text, **fields})
+
+    def _run(self):
+        log = open(self.path, "ab")
+        index = open(self.path + ".idx", "ab")
+        offset = log.tell()
+        last_flush = time.monotonic()
+        dirty = False
+        while True:
+            try:
+                entry = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                entry = None
+            if entry is not None and entry is not _CLOSE:
+                # Keep the log sorted by time even if the clock steps back
+                entry["t"] = self._last_t = max(entry["t"], self._last_t)
+                if entry["t"] >= self._next_index_t:
+                    index.write(INDEX_RECORD.pack(entry["t"], offset))
+                    self._next_index_t = entry["t"] + self.index_interval
+                line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+                log.write(line)
+                offset += len(line)
+                self.entries += 1
+                dirty = True
+            now = time.monotonic()
+            if dirty and (entry is _CLOSE or now - last_flush >= self.flush_interval):
+                log.flush()  # Log before index, so the index never points past the data
+                index.flush()
+                last_flush = now
+                dirty = False
+            if entry is _CLOSE:
+                log.close()
+                index.close()
+                return
+
+    def close(self):
+        """Flush everything queued so far and stop the writer thread."""
+        self._queue.put(_CLOSE)
+        self.thread.join()
+        print(f"Transcript: {self.entries} entries written to {self.path}")
+
+
+class TranscriptReader:
+    """Time-range search and tailing without loading the whole log."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _index(self):
+        try:
+            with open(self.path + ".idx", "rb") as f:
+                data = f.read()
+        except OSError:
+            return [], []
+        usable = len(data) - len(data) % INDEX_RECORD.size  # Ignore a torn last record
+        pairs = list(INDEX_RECORD.iter_unpack(data[:usable]))
+        return [t for t, _ in pairs], [offset for _, offset in pairs]
+
+    @staticmethod
+    def _parse(line):
+        try:
+            return json.loads(line)
+        except ValueError:
+            return None  # Partially written last line
+
+    def search(self, start=None, end=None):
+        """Yield entries with ``start <= t <= end`` (either bound may be None)."""
+        times, offsets = self._index()
+        offset = 0
+        if start is not None and times:
+            i = bisect.bisect_right(times, start) - 1
+            offset = offsets[i] if i >= 0 else 0
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            for line in f:
+                entry = self._parse(line)
+                if entry is None:
+                    continue
+                if start is not None and entry["t"] < start:
+                    continue
+                if end is not None and entry["t"] > end:
+                    return
+                yield entry
+
+    def tail(self, n=20, block_size=8192):
+        """Return the last ``n`` entries, reading backwards from the end of the log."""
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            data = b""
+            while position > 0 and data.count(b"\n") <= n:
+                step = min(block_size, position)
+                position -= step
+                f.seek(position)
+                data = f.read(step) + data
+        lines = data.splitlines()
+        if position > 0:
+            lines = lines[1:]  # First line may be cut off by the block boundary
+        entries = [e for e in map(self._parse, lines) if e is not None]
+        return entries[-n:]
+
+    def follow(self, poll_interval=0.5):
+        """Yield entries as they are appended (like ``tail -f``), starting at the end."""
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            pending = b""
+            while True:
+                chunk = f.readline()
+                if not chunk:
+                    time.sleep(poll_interval)
+                    continue
+                pending += chunk
+                if pending.endswith(b"\n"):
+                    entry = self._parse(pending)
+                    pending = b""
+                    if entry is not None:
+                        yield entry
+
+
+def _parse_time(value):
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.datetime.fromisoformat(value).timestamp()
+
+
+def _format(entry):
+    stamp = datetime.datetime.fromtimestamp(entry["t"]).strftime("%H:%M:%S")
+    return f"[{stamp}] {entry['kind']}: {entry['text']}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read a meeting transcript log")
+    parser.add_argument("path")
+    parser.add_argument("--tail", type=int, help="Show the last N entries")
+    parser.add_argument("--follow", action="store_true", help="Keep printing new entries")
+    parser.add_argument("--start", help="Unix time or ISO 8601 (local time)")
+    parser.add_argument("--end", help="Unix time or ISO 8601 (local time)")
+    args = parser.parse_args()
+
+    reader = TranscriptReader(args.path)
+    if args.tail is not None:
+        for entry in reader.tail(args.tail):
+            print(_format(entry))
+    elif not args.follow:
+        for entry in reader.search(_parse_time(args.start), _parse_time(args.end)):
+            print(_format(entry))
+    if args.follow:
+        try:
+            for entry in reader.follow():
+                print(_format(entry), flush=True)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import asyncio
+import collections
+import queue
+import threading
+import time
+
+
+class SendLatencyStats:
+    """Rolling capture-to-sent latency for uplink audio frames."""
+
+    def __init__(self, window=2000):
+        self.samples = collections.deque(maxlen=window)
+        self.frames = 0
+        self.messages = 0
+        self.coalesced = 0  # Frames that shared a message with an earlier frame
+
+    def record(self, captured_at, frames_in_message):
+        now = time.perf_counter()
+        self.messages += 1
+        self.frames += len(captured_at)
+        self.coalesced += frames_in_message - 1
+        for t in captured_at:
+            self.samples.append(now - t)
+
+    def summary(self):
+        if not self.samples:
+            return {"frames": 0, "messages": 0}
+        ordered = sorted(self.samples)
+        pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 2)
+        return {
+            "frames": self.frames,
+            "messages": self.messages,
+            "coalesced_frames": self.coalesced,
+            "send_latency_ms_p50": pick(0.50),
+            "send_latency_ms_p95": pick(0.95),
+            "send_latency_ms_max": round(ordered[-1] * 1000, 2),
+        }
+
+
+def take_coalesced(first, get_nowait, max_bytes):
+    """Gather queued audio frames behind ``first`` into one message.
+
+    Queue items are ``("audio", captured_at, data)``, ``("event", None, payload)``
+    or ``("close", None, None)``.
+    Returns ``(datas, timestamps, leftover)`` where ``leftover`` is the first
+    non-audio item (or the frame that would overflow ``max_bytes``) that must be
+    sent next, or None.
+    """
+    datas = [first[2]]
+    stamps = [first[1]]
+    size = len(first[2])
+    while True:
+        try:
+            item = get_nowait()
+        except (queue.Empty, asyncio.QueueEmpty):
+            return datas, stamps, None
+        if item[0] != "audio" or size + len(item[2]) > max_bytes:
+            return datas, stamps, item
+        datas.append(item[2])
+        stamps.append(item[1])
+        size += len(item[2])
+
+
+class UplinkSender:
+    """Background sender that owns ``ws.send`` for the threaded client.
+
+    Capture pushes small frames without waiting on the socket. When the socket
+    falls behind, frames that queued up meanwhile are coalesced into a single
+    ``input_audio_buffer.append`` (up to ``max_coalesce_ms``), which keeps the
+    per-message overhead bounded. Control events share the queue, so a commit
+    is never sent ahead of the audio it covers.
+    """
+
+    def __init__(self, send_audio, send_event, bytes_per_ms, max_coalesce_ms=500):
+        self._send_audio = send_audio
+        self._send_event = send_event
+        self.max_bytes = int(bytes_per_ms * max_coalesce_ms)
+        self.stats = SendLatencyStats()
+        self._queue = queue.Queue()
+        self._aborted = False
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def send_audio(self, data):
+        self._queue.put(("audio", time.perf_counter(), data))
+
+    def send_event(self, payload):
+        self._queue.put(("event", None, payload))
+
+    def _run(self):
+        pending = None
+        while True:
+            item = pending if pending is not None else self._queue.get()
+            pending = None
+            if item[0] == "close":
+                return
+            if self._aborted:
+                continue  # The socket is gone; drain without sending
+            try:
+                if item[0] == "audio":
+                    datas, stamps, pending = take_coalesced(
+                        item, self._queue.get_nowait, self.max_bytes
+                    )
+                    self._send_audio(b"".join(datas) if len(datas) > 1 else datas[0])
+                    self.stats.record(stamps, len(datas))
+                else:
+                    self._send_event(item[2])
+            except Exception as e:
+                print(f"Error sending on uplink: {e}")
+
+    def close(self):
+        self._queue.put(("close", None, None))
+        self.thread.join()
+        print(f"Uplink stats: {self.stats.summary()}")
+
+    def abort(self):
+        """Stop after a dropped connection, discarding whatever is still queued."""
+        self._aborted = True
+        self.close()
@@ -0,0 +1,17 @@
+import os
+import sys
+import pytest
+
+# Modules import from the google_meet_bot root (bot., media_players., tools., ...)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def make_client():
+    """Builds a realtime client of class ``cls`` on a fake PyAudio, with 20 ms frames."""
+    from tools.fake_audio import FakePyAudio
+
+    def make(cls, url="ws://localhost:1", **kwargs):
+        return cls("key", url, frame_ms=20, audio_interface=FakePyAudio(realtime=False), **kwargs)
+
+    return make
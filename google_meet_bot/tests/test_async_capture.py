@@ -0,0 +1,45 @@
+import asyncio
+import threading
+import numpy as np
+import pytest
+
+pytest.importorskip("pyaudio")
+pytest.importorskip("websockets")
+
+from bot.capture_bus import AudioCaptureBus
+from openai_voice_assistant.async_realtime_client import AsyncAudioWebSocketClient
+
+
+def test_bus_audio_reaches_the_loop_without_a_reader_thread(make_client):
+    bus = AudioCaptureBus(rate=48000, channels=2)
+    sub = bus.subscribe(rate=24000, channels=1)
+    c = make_client(AsyncAudioWebSocketClient, capture=sub)
+
+    async def run():
+        get, close = c._open_async_input()
+        block = np.zeros((48000 // 10, 2), dtype=np.int16)  # 100 ms, as the bus thread sees it
+        threading.Thread(target=bus._dispatch, args=(block,)).start()
+        chunks = [await get() for _ in range(5)]
+        threading.Thread(target=sub.close).start()
+        ended = await get()
+        close()
+        return chunks, ended
+
+    chunks, ended = asyncio.run(run())
+    assert [len(chunk) for chunk in chunks] == [c.chunk * 2] * 5
+    assert ended is None
+    assert sub.listener is None
+
+
+def test_device_stream_is_closed_after_its_callback_is_done(make_client):
+    c = make_client(AsyncAudioWebSocketClient)
+
+    async def run():
+        get, close = c._open_async_input()
+        first = await get()
+        close()
+        return first
+
+    first = asyncio.run(run())
+    assert len(first) == c.chunk * 2
+    assert not c.audio_interface.streams
@@ -0,0 +1,72 @@
+import pytest
+
+pytest.importorskip("undetected_chromedriver")
+
+from selenium.common.exceptions import WebDriverException
+from bot.browser_pool import BrowserPool
+
+
+class FakeSwitch:
+    def window(self, handle):
+        pass
+
+
+class FakeDriver:
+    """Enough of a WebDriver for the pool: window handles, navigation, CDP, quit."""
+
+    def __init__(self):
+        self.crashed = False
+        self.quit_called = False
+        self.switch_to = FakeSwitch()
+
+    @property
+    def window_handles(self):
+        if self.crashed:
+            raise WebDriverException("chrome not reachable")
+        return ["main"]
+
+    def get(self, url):
+        pass
+
+    def execute_cdp_cmd(self, cmd, params):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+def pool(size=2):
+    launched = []
+
+    def launch():
+        launched.append(FakeDriver())
+        return launched[-1]
+
+    p = BrowserPool(size=size, max_rss_mb=None, launch=launch).start()
+    assert p.wait_ready(5)
+    return p, launched
+
+
+def test_release_never_grows_the_pool_past_size():
+    p, launched = pool(size=2)
+    for _ in range(4):
+        a, b = p.acquire(), p.acquire()
+        assert p.wait_ready(5)  # Refilled behind them
+        p.release(a)
+        p.release(b)
+    stats = p.stats()
+    assert stats["idle"] == 2
+    assert stats["recycled"]["surplus"] == 8
+    assert sum(not d.quit_called for d in launched) == 2
+    p.close()
+
+
+def test_acquire_skips_a_browser_that_crashed_while_idle():
+    p, launched = pool(size=2)
+    launched[0].crashed = True
+    launched[1].crashed = True
+    driver = p.acquire()
+    assert not driver.crashed
+    assert launched[0].quit_called and launched[1].quit_called
+    assert p.stats()["recycled"]["crashed"] == 2
+    p.close()
@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("pyaudio")
+
+from openai_voice_assistant.realtime_voice_bot import AudioWebSocketClient
+
+RATE = 24000
+
+
+def voice(seconds, dbfs, seed):
+    """Speech-like audio: a 180 Hz buzz with harmonics, 4 Hz syllable envelope."""
+    t = np.arange(int(RATE * seconds)) / RATE
+    wave = sum(np.sin(2 * np.pi * 180 * k * t) / k for k in range(1, 6))
+    wave *= 0.6 + 0.4 * np.sin(2 * np.pi * 4 * t + seed)
+    wave *= 10 ** (dbfs / 20) * 32768 / np.sqrt(np.mean(wave**2))
+    return wave.astype(np.int16)
+
+
+@pytest.fixture
+def c(make_client):
+    c = make_client(AudioWebSocketClient)
+    rng = np.random.default_rng(0)
+    room = (rng.standard_normal(RATE) * 10 ** (-70 / 20) * 32768).astype(np.int16)
+    c.speech_events(room.tobytes())  # A second of quiet room before the test starts
+    return c
+
+
+def run(c, captured, played=None):
+    """Feed 20 ms frames as the capture loop does; returns the actions taken."""
+    actions = []
+    for i in range(0, len(captured), c.chunk):
+        if played is not None:
+            c.player.note_played(played[i : i + c.chunk].tobytes())
+        data = captured[i : i + c.chunk].tobytes()
+        started, ended = c.speech_events(data)
+        actions.append(c.screen_capture(data, started, ended)[0])
+    return actions
+
+
+def test_playback_echo_alone_does_not_interrupt(c):
+    c.response_active = True  # The assistant is answering
+    played = voice(3, -20, seed=0)
+    echo = (played * 10 ** (-3 / 20)).astype(np.int16)  # Same sink, a little quieter
+    actions = run(c, echo, played)
+    assert c.vad.in_speech  # The VAD does hear it...
+    assert "barge_in" not in actions  # ...but it never cancels the response
+
+    # The echo tail after the response ends is not streamed as a turn either
+    c.response_active = False
+    assert set(run(c, echo[: RATE // 5])) == {"skip"}
+
+
+def test_participant_over_playback_barges_in_with_the_held_audio(c):
+    c.response_active = True
+    played = voice(2, -30, seed=0)
+    participant = voice(2, -12, seed=1)
+    actions = run(c, participant, played)
+    first = actions.index("barge_in")
+    assert first * 20 <= 60 + c.barge_in_ms + 20
+    assert c.vad.in_speech
+
+
+def test_speech_while_idle_streams_immediately(c):
+    actions = run(c, voice(1, -20, seed=2))
+    assert set(actions) == {"stream"}
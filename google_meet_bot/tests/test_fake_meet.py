@@ -0,0 +1,24 @@
+import urllib.error
+import urllib.request
+import pytest
+from tools.fake_meet import FakeMeet
+
+
+def test_serves_the_fixture_with_query_parameters():
+    meet = FakeMeet(port=0).start()
+    try:
+        assert meet.url() == meet.base_url
+        url = meet.url(admit_ms=500, mode="join")
+        assert url.endswith("meet_join.html?admit_ms=500&mode=join")
+        with urllib.request.urlopen(url, timeout=5) as response:
+            assert response.status == 200
+            html = response.read().decode()
+        for hook in ('aria-label="Your name"', "Ask to join", 'aria-label="Leave call"', "Contributors"):
+            assert hook in html
+        with pytest.raises(urllib.error.HTTPError) as missing:
+            urllib.request.urlopen(meet.base_url.replace("meet_join.html", "nope.html"), timeout=5)
+        assert missing.value.code == 404
+    finally:
+        meet.stop()
+    with pytest.raises(OSError):
+        urllib.request.urlopen(meet.base_url, timeout=1)
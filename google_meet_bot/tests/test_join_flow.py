@@ -0,0 +1,132 @@
+from selenium.common.exceptions import StaleElementReferenceException
+from bot.join_flow import (
+    ASK_TO_JOIN, IN_CALL, JOIN_NOW, NAME_INPUT, PEOPLE_BUTTON, PEOPLE_PANEL,
+    JoinFlow, find_first,
+)
+
+STAGES = ["loading", "name", "devices", "join_click", "admission", "people", "confirm"]
+
+
+class FakeElement:
+    def __init__(self, on_click=None, displayed=True):
+        self.on_click = on_click
+        self.displayed = displayed
+        self.typed = []
+        self.clicks = 0
+
+    def is_displayed(self):
+        if isinstance(self.displayed, Exception):
+            raise self.displayed
+        return self.displayed
+
+    def send_keys(self, text):
+        self.typed.append(text)
+
+    def click(self):
+        self.clicks += 1
+        if self.on_click is not None:
+            self.on_click()
+
+
+class FakeMeetPage:
+    """A scripted Meet page: elements by XPath plus the snapshot read_page_state returns.
+
+    ``admit_after`` is how many admission polls pass before the in-call UI
+    shows; ``outcome`` is "admitted" or "denied".
+    """
+
+    def __init__(self, join_locator=ASK_TO_JOIN[0], name_input=True, outcome="admitted", admit_after=2):
+        self.join_locator = join_locator
+        self.name_input = name_input
+        self.outcome = outcome
+        self.admit_after = admit_after
+        self.elements = {}
+        self.state = {"loading": True}
+        self.joined_polls = None
+        self.url = None
+
+    def get(self, url):
+        self.url = url
+        self.state = {"url": url, "loading": False, "name_input": self.name_input}
+        if self.name_input:
+            self.elements[NAME_INPUT[0][1]] = FakeElement()
+        if self.join_locator is not None:
+            self.elements[self.join_locator[1]] = FakeElement(on_click=self._join_clicked)
+
+    def _join_clicked(self):
+        self.joined_polls = 0
+
+    def _open_people(self):
+        self.elements[PEOPLE_PANEL[0][1]] = FakeElement()
+        self.elements['//div[contains(text(), "Guest Bot")]'] = FakeElement()
+
+    def find_elements(self, by, value):
+        element = self.elements.get(value)
+        return [element] if element is not None else []
+
+    def execute_script(self, script, *args):
+        if self.joined_polls is not None:
+            self.joined_polls += 1
+            if self.joined_polls > self.admit_after:
+                if self.outcome == "denied":
+                    self.state["denied"] = True
+                else:
+                    self.state["in_meeting"] = True
+                    self.elements[IN_CALL[0][1]] = FakeElement()
+                    self.elements.setdefault(PEOPLE_BUTTON[0][1], FakeElement(on_click=self._open_people))
+        return dict(self.state)
+
+
+def flow(page, **kwargs):
+    kwargs.setdefault("poll_interval", 0.01)
+    return JoinFlow(page, bot_name="Guest Bot", **kwargs)
+
+
+def test_ask_to_join_walks_every_stage():
+    page = FakeMeetPage()
+    seen = []
+    report = flow(page, before_join=seen.append).run("https://meet/abc")
+    assert report.joined and report.error is None
+    assert report.final_stage == "in_meeting"
+    assert list(report.stage_ms) == STAGES
+    assert report.join_to_in_meeting_ms is not None
+    assert seen == [page]
+    assert page.elements[NAME_INPUT[0][1]].typed == ["Guest Bot"]
+    assert page.elements[ASK_TO_JOIN[0][1]].clicks == 1
+    assert page.elements[PEOPLE_BUTTON[0][1]].clicks == 1
+
+
+def test_join_now_fallback_without_a_name_field():
+    page = FakeMeetPage(join_locator=JOIN_NOW[1], name_input=False, admit_after=0)
+    report = flow(page).run("https://meet/abc")
+    assert report.joined
+    assert page.elements[JOIN_NOW[1][1]].clicks == 1
+
+
+def test_denied_request_fails_at_admission():
+    page = FakeMeetPage(outcome="denied")
+    report = flow(page).run("https://meet/abc")
+    assert not report.joined
+    assert report.final_stage == "admission"
+    assert "denied" in report.error
+    assert list(report.stage_ms) == STAGES[:5]
+
+
+def test_missing_join_button_times_out_at_join_click():
+    page = FakeMeetPage(join_locator=None)
+    report = flow(page, name_timeout=0.05, join_button_timeout=0.05).run("https://meet/abc")
+    assert not report.joined
+    assert report.final_stage == "join_click"
+    assert "neither 'Ask to join' nor 'Join now'" in report.error
+
+
+def test_find_first_skips_hidden_and_stale_elements():
+    page = FakeMeetPage()
+    stale = FakeElement(displayed=StaleElementReferenceException("gone"))
+    visible = FakeElement()
+    page.elements[ASK_TO_JOIN[0][1]] = stale
+    page.elements[ASK_TO_JOIN[1][1]] = visible
+    assert find_first(page, ASK_TO_JOIN) is visible
+    page.elements[ASK_TO_JOIN[1][1]] = FakeElement(displayed=False)
+    assert find_first(page, ASK_TO_JOIN) is None
+    assert find_first(page, ASK_TO_JOIN, displayed=False) is stale
@@ -0,0 +1,69 @@
+import subprocess
+import pytest
+
+pytest.importorskip("pyaudio")
+
+from media_players import media_stream
+from media_players.media_stream import MediaDeviceError, VirtualMediaStreamer
+
+
+@pytest.fixture
+def commands(monkeypatch):
+    """Records every subprocess.run; a command whose argv contains a string in ``fail`` exits 1."""
+    ran = []
+    fail = set()
+
+    def run(argv, check=False):
+        ran.append(argv)
+        if check and fail & set(argv):
+            raise subprocess.CalledProcessError(1, argv)
+
+    monkeypatch.setattr(media_stream.subprocess, "run", run)
+    monkeypatch.setattr(VirtualMediaStreamer, "unload_virtual_audio_modules", lambda self: None)
+    return ran, fail
+
+
+def test_each_instance_creates_and_removes_only_its_own_camera(commands, monkeypatch):
+    ran, _ = commands
+    existing = set()
+    monkeypatch.setattr(media_stream.os.path, "exists", lambda path: path in existing)
+    streamer = VirtualMediaStreamer(instance_id="bot1", video_nr=11)
+    streamer.unload_modules()  # Join-start cleanup: nothing of ours exists yet
+    assert ran == []
+
+    streamer.create_virtual_cam()
+    assert ran == [["sudo", "v4l2loopback-ctl", "add", "-n", "VirtualCam_bot1",
+                    "--exclusive-caps", "1", "/dev/video11"]]
+    assert streamer.virtual_cam_device == "/dev/video11"
+    existing.add("/dev/video11")
+
+    streamer.unload_modules()
+    assert ran[-1] == ["sudo", "v4l2loopback-ctl", "delete", "/dev/video11"]
+    assert not streamer.created_cam
+
+
+def test_existing_device_is_reused_but_never_deleted(commands, monkeypatch):
+    ran, _ = commands
+    monkeypatch.setattr(media_stream.os.path, "exists", lambda path: path == "/dev/video12")
+    streamer = VirtualMediaStreamer(instance_id="bot2", video_nr=12)
+    streamer.create_virtual_cam()
+    streamer.unload_modules()
+    assert streamer.virtual_cam_device == "/dev/video12"
+    assert ran == []
+
+
+def test_failed_v4l2loopback_ctl_raises_instead_of_exiting(commands, monkeypatch):
+    _, fail = commands
+    fail.add("v4l2loopback-ctl")
+    monkeypatch.setattr(media_stream.os.path, "exists", lambda path: False)
+    streamer = VirtualMediaStreamer(instance_id="bot3", video_nr=13)
+    with pytest.raises(MediaDeviceError):
+        streamer.create_virtual_cam()
+    assert not streamer.created_cam
+
+
+def test_missing_camera_in_the_device_list_raises(monkeypatch):
+    monkeypatch.setattr(media_stream.subprocess, "check_output",
+                        lambda argv: b"Integrated Camera (usb-0000:00:14.0-5):\n\t/dev/video0\n")
+    with pytest.raises(MediaDeviceError):
+        VirtualMediaStreamer().list_video_devices()
@@ -0,0 +1,128 @@
+import pytest
+
+pytest.importorskip("pyaudio")
+pytest.importorskip("undetected_chromedriver")
+
+from bot import meet_joiner_v2
+from bot.meet_joiner_v2 import GoogleMeetBot
+from bot.models import DeviceSet, MeetJoinerConfig
+from media_players.pulse_client import PulseError
+
+
+class FakeDevicePool:
+    def __init__(self):
+        self.released = []
+
+    def lease(self, owner):
+        return DeviceSet(slot=0, instance_id="pool0", speaker_name="virtual_speaker_pool0",
+                         mic_name="virtual_mic_pool0", cam_label="VirtualCam_pool0", video_nr=10)
+
+    def release(self, devices):
+        self.released.append(devices.slot)
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+@pytest.fixture
+def bot(monkeypatch):
+    driver = FakeDriver()
+    monkeypatch.setattr(meet_joiner_v2, "launch_chrome", lambda: driver)
+    b = GoogleMeetBot(MeetJoinerConfig(meeting_url="https://meet.example/abc", video_url="", audio_url=""),
+                      device_pool=FakeDevicePool())
+    return b, driver
+
+
+def test_failed_unload_still_releases_the_lease_and_browser(bot, monkeypatch):
+    b, driver = bot
+
+    def join_fails(self, url):
+        raise RuntimeError("page never loaded")
+
+    calls = []
+
+    def unload_fails(self):
+        calls.append(self)
+        if len(calls) > 1:  # The pre-join cleanup works; the teardown one doesn't
+            raise PulseError(52, 5)
+
+    monkeypatch.setattr(meet_joiner_v2.JoinFlow, "run", join_fails)
+    monkeypatch.setattr(meet_joiner_v2.VirtualMediaStreamer, "unload_modules", unload_fails)
+    monkeypatch.setattr(meet_joiner_v2.VirtualMediaStreamer, "load_virtual_audio_modules", lambda self: None)
+    b.join_meeting()
+    assert b.device_pool.released == [0]
+    assert driver.quit_called
+    assert b.driver is None
+
+
+def test_failed_browser_launch_returns_the_lease(bot, monkeypatch):
+    b, _ = bot
+
+    def launch_fails():
+        raise RuntimeError("chrome crashed on start")
+
+    monkeypatch.setattr(meet_joiner_v2, "launch_chrome", launch_fails)
+    monkeypatch.setattr(meet_joiner_v2.VirtualMediaStreamer, "load_virtual_audio_modules", lambda self: None)
+    b.join_meeting()
+    assert b.device_pool.released == [0]
+
+
+def test_unreadable_participant_count_is_unknown_not_zero(bot, monkeypatch):
+    b, _ = bot
+
+    def snapshot_fails():
+        raise RuntimeError("chrome not reachable")
+
+    monkeypatch.setattr(b, "snapshot", snapshot_fails)
+    # 0 would satisfy the "count < 2" leave condition; None must not
+    assert b.get_participant_count() is None
+
+
+class FakeRealtimeClient:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.connected = True
+        self.spoken = []
+
+    def run(self):
+        pass
+
+    def speak(self, text):
+        self.spoken.append(text)
+
+
+def test_response_cache_and_greeting_come_from_the_config(bot, monkeypatch, tmp_path):
+    b, _ = bot
+    b.config = b.config.model_copy(
+        update={"response_cache_dir": str(tmp_path), "greeting": "Hi, I'm taking notes."}
+    )
+    monkeypatch.setattr(meet_joiner_v2, "AudioWebSocketClient", FakeRealtimeClient)
+    b.start_websocket()
+    b.greet()
+    assert b.websocket_client.kwargs["response_cache"] is b.response_cache
+    assert b.response_cache.directory == str(tmp_path)
+    assert b.websocket_client.spoken == ["Hi, I'm taking notes."]
+
+
+def test_bot_without_a_pool_creates_its_camera_after_the_audio(monkeypatch):
+    steps = []
+
+    def join_fails(self, url):
+        steps.append("join")
+        raise RuntimeError("page never loaded")
+
+    monkeypatch.setattr(meet_joiner_v2, "launch_chrome", FakeDriver)
+    monkeypatch.setattr(meet_joiner_v2.JoinFlow, "run", join_fails)
+    for name in ("unload_modules", "load_virtual_audio_modules", "create_virtual_cam"):
+        monkeypatch.setattr(meet_joiner_v2.VirtualMediaStreamer, name,
+                            lambda self, name=name: steps.append(name))
+    config = MeetJoinerConfig(meeting_url="https://meet.example/abc", video_url="", audio_url="",
+                              instance_id="bot1", video_nr=11)
+    GoogleMeetBot(config).join_meeting()
+    assert steps == ["unload_modules", "load_virtual_audio_modules", "create_virtual_cam",
+                     "join", "unload_modules"]
@@ -0,0 +1,38 @@
+import threading
+from openai_voice_assistant.metrics import MetricsRegistry, TurnTracer
+
+
+def test_concurrent_marks_and_finish_keep_turns_consistent():
+    registry = MetricsRegistry()
+    tracer = TurnTracer(registry=registry)
+    stop = threading.Event()
+
+    def capture():
+        while not stop.is_set():
+            tracer.mark("capture_start")
+            for _ in range(20):
+                tracer.mark_append()
+            tracer.mark("commit")
+
+    def playback():
+        while not stop.is_set():
+            tracer.mark("playback_start")
+            tracer.mark_interrupted()
+            tracer.finish_turn()
+
+    threads = [threading.Thread(target=capture), threading.Thread(target=playback)]
+    for thread in threads:
+        thread.start()
+    stop.wait(0.5)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    tracer.finish_turn()
+
+    assert registry.turns_total == len(tracer.completed) > 0
+    for turn in tracer.completed:
+        marks = turn["marks_ms"]
+        if marks["first_append"] is not None:
+            # mark_append only records after capture_start in the same turn
+            assert marks["capture_start"] is not None
+            assert marks["first_append"] <= marks["last_append"]
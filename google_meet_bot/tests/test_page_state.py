@@ -0,0 +1,51 @@
+from selenium.common.exceptions import WebDriverException
+from bot.page_state import SNAPSHOT_JS, read_page_state, wait_for_state
+
+
+class FakeDriver:
+    """Answers the snapshot script from a list of raw snapshots, one per call."""
+
+    def __init__(self, snapshots):
+        self.snapshots = list(snapshots)
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        snapshot = self.snapshots.pop(0) if len(self.snapshots) > 1 else self.snapshots[0]
+        if isinstance(snapshot, Exception):
+            raise snapshot
+        return snapshot
+
+
+def test_read_page_state_is_one_round_trip():
+    driver = FakeDriver([{"url": "https://meet/abc", "loading": False, "in_meeting": True,
+                          "participant_count": 3, "bot_listed": True}])
+    state = read_page_state(driver, bot_name="Guest Bot")
+    assert driver.calls == [(SNAPSHOT_JS, ("Guest Bot",))]
+    assert state.in_meeting and state.bot_listed and not state.loading
+    assert state.participant_count == 3
+    assert state.read_ms is not None
+
+
+def test_read_page_state_defaults_when_the_script_returns_nothing():
+    state = read_page_state(FakeDriver([None]))
+    assert state.loading
+    assert state.participant_count is None
+    assert not state.in_meeting
+
+
+def test_wait_for_state_polls_through_navigation():
+    driver = FakeDriver([
+        {"loading": True},
+        WebDriverException("document unloaded"),
+        {"loading": False, "ask_to_join": True},
+    ])
+    state = wait_for_state(driver, lambda s: not s.loading, timeout=2, poll_interval=0.01)
+    assert state is not None and state.ask_to_join
+    assert len(driver.calls) == 3
+
+
+def test_wait_for_state_times_out():
+    driver = FakeDriver([{"loading": True}])
+    assert wait_for_state(driver, lambda s: s.in_meeting, timeout=0.05, poll_interval=0.01) is None
+    assert len(driver.calls) > 1
@@ -0,0 +1,94 @@
+import json
+import threading
+import time
+from bot import presence
+from bot.presence import BINDING, PresenceMonitor
+
+
+class FakeSession:
+    def __init__(self):
+        self.sent = []
+
+    def send(self, method, params=None, timeout=10):
+        self.sent.append(method)
+        return {}
+
+    def close(self):
+        pass
+
+
+class FakeDriver:
+    def __init__(self):
+        self.scripts = []
+
+    def execute_script(self, script):
+        self.scripts.append(script)
+        return "ok"
+
+
+def test_push_never_enables_runtime(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(presence.CDPSession, "for_driver", classmethod(lambda cls, driver, on_event: session))
+    driver = FakeDriver()
+    monitor = PresenceMonitor(driver).start()
+    assert monitor.mode == "push"
+    assert "Runtime.enable" not in session.sent
+    assert "Runtime.evaluate" not in session.sent
+    assert session.sent == ["Runtime.addBinding", "Page.addScriptToEvaluateOnNewDocument"]
+    assert driver.scripts[0].startswith("return ")
+
+    payload = json.dumps({"count": 3, "t": time.time() * 1000})
+    monitor._on_cdp_event("Runtime.bindingCalled", {"name": BINDING, "payload": payload})
+    assert monitor.wait_until(lambda count: count == 3, timeout=1) == 3
+    monitor.stop()
+
+
+def test_failed_injection_falls_back_to_polling(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(presence.CDPSession, "for_driver", classmethod(lambda cls, driver, on_event: session))
+    driver = FakeDriver()
+    driver.execute_script = lambda script: "no-binding"
+    monitor = PresenceMonitor(driver, poll=lambda: 2, poll_interval=0.05).start()
+    assert monitor.mode == "poll"
+    assert monitor.wait_until(lambda count: count == 2, timeout=1) == 2
+    monitor.stop()
+
+
+def test_concurrent_publishers_count_every_change_once():
+    monitor = PresenceMonitor(driver=None, push=False)
+    values = iter(range(1, 2001))
+    lock = threading.Lock()
+
+    def publish():
+        while True:
+            with lock:
+                value = next(values, None)
+            if value is None:
+                return
+            monitor._publish(value)
+
+    threads = [threading.Thread(target=publish) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # Distinct values, so every publish is a change; unguarded updates lose increments
+    assert monitor.changes == 2000
+    seen = []
+    while (count := monitor.wait_for_change(timeout=0)) is not None:
+        seen.append(count)
+    assert sorted(seen) == list(range(1, 2001))
+
+
+def test_wait_until_wakes_on_publish_and_on_stop():
+    monitor = PresenceMonitor(driver=None, push=False)
+    threading.Timer(0.05, monitor._publish, args=(1,)).start()
+    started = time.monotonic()
+    assert monitor.wait_until(lambda count: count < 2, timeout=5) == 1
+    assert time.monotonic() - started < 1
+
+    idle = PresenceMonitor(driver=None, push=False)
+    threading.Timer(0.05, idle.stop).start()
+    started = time.monotonic()
+    assert idle.wait_until(lambda count: count < 2) is None
+    assert time.monotonic() - started < 1
@@ -0,0 +1,128 @@
+import os
+import socket
+import struct
+import threading
+import pytest
+from media_players import pulse_client
+from media_players.pulse_client import PulseClient, PulseError
+from tools.pulse_stub import PulseStub
+
+
+def packet(body):
+    return struct.pack(">5I", len(body), 0xFFFFFFFF, 0, 0, 0) + body
+
+
+# Golden packets, written out by hand from the protocol (tagstruct.h, native-common.h)
+AUTH = packet(
+    b"L\x00\x00\x00\x08" b"L\x00\x00\x00\x00"  # AUTH, tag 0
+    b"L\x00\x00\x00\x20"  # Protocol version 32
+    b"x\x00\x00\x01\x00" + bytes(256)  # Cookie
+)
+SET_CLIENT_NAME = packet(
+    b"L\x00\x00\x00\x09" b"L\x00\x00\x00\x01"
+    b"P" b"tapplication.name\x00" b"L\x00\x00\x00\x10" b"x\x00\x00\x00\x10google_meet_bot\x00" b"N"
+)
+LOAD_MODULE = packet(
+    b"L\x00\x00\x00\x33" b"L\x00\x00\x00\x02"
+    b"tmodule-null-sink\x00" b"tsink_name=golden\x00"
+)
+MODULE_INFO_LIST_REPLY = packet(
+    b"L\x00\x00\x00\x02" b"L\x00\x00\x00\x03"  # REPLY, tag 3
+    b"L\x00\x00\x00\x07" b"tmodule-null-sink\x00" b"tsink_name=golden\x00" b"L\x00\x00\x00\x00"
+    b"P" b"tmodule.author\x00" b"L\x00\x00\x00\x04" b"x\x00\x00\x00\x04Ada\x00" b"N"
+    b"L\x00\x00\x00\x08" b"tmodule-remap-source\x00" b"N" b"L\x00\x00\x00\x01" b"PN"
+)
+
+
+def reply(tag, body):
+    return packet(b"L\x00\x00\x00\x02" + b"L" + tag.to_bytes(4, "big") + body)
+
+
+def recv_packet(conn):
+    header = conn.recv(20, socket.MSG_WAITALL)
+    return header + conn.recv(struct.unpack(">I", header[:4])[0], socket.MSG_WAITALL)
+
+
+@pytest.fixture
+def golden_server(tmp_path, monkeypatch):
+    """A raw socket that records the client's packets and answers with golden replies."""
+    monkeypatch.setattr(pulse_client, "read_cookie", lambda: bytes(256))
+    path = str(tmp_path / "native")
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+    received = []
+
+    def serve():
+        conn, _ = listener.accept()
+        with conn:
+            received.append(recv_packet(conn))
+            conn.sendall(reply(0, b"L\x00\x00\x00\x20"))
+            received.append(recv_packet(conn))
+            conn.sendall(reply(1, b"L\x00\x00\x00\x2a"))
+            received.append(recv_packet(conn))
+            conn.sendall(reply(2, b"L\x00\x00\x00\x07"))
+            received.append(recv_packet(conn))
+            conn.sendall(MODULE_INFO_LIST_REPLY)
+            conn.recv(1)  # Until the client closes
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    yield path, received
+    listener.close()
+    thread.join(5)
+
+
+def test_client_bytes_match_the_protocol(golden_server):
+    path, received = golden_server
+    client = PulseClient(path)
+    assert client.load_module("module-null-sink", "sink_name=golden") == 7
+    assert client.list_modules() == [
+        (7, "module-null-sink", "sink_name=golden"),
+        (8, "module-remap-source", ""),
+    ]
+    client.close()
+    assert received[0] == AUTH
+    assert received[1] == SET_CLIENT_NAME
+    assert received[2] == LOAD_MODULE
+    assert client.server_version == 32 and client.client_index == 42
+
+
+@pytest.fixture
+def stub(tmp_path):
+    server = PulseStub(str(tmp_path / "stub.sock")).start()
+    yield server
+    server.stop()
+
+
+def test_device_lifecycle_against_the_stub(stub):
+    client = PulseClient(stub.path)
+    indices = client.load_modules([
+        ("module-null-sink", "sink_name=spk channels=2"),
+        ("module-remap-source", "master=spk.monitor source_name=mic"),
+    ])
+    assert [index for index, _, _ in client.list_modules()] == indices
+    client.reset_devices("spk", "mic")
+    client.unload_modules(indices)
+    assert client.list_modules() == []
+    client.close()
+    assert stub.state.malformed == []
+    assert stub.state.credentials[0] == (os.getpid(), os.getuid(), os.getgid())
+
+
+def test_stub_errors_surface_as_pulse_errors(stub):
+    client = PulseClient(stub.path)
+    with pytest.raises(PulseError) as failed:
+        # The remap source's master doesn't exist, so the sink loaded with it is rolled back
+        client.load_modules([
+            ("module-null-sink", "sink_name=spk"),
+            ("module-remap-source", "master=nowhere.monitor source_name=mic"),
+        ])
+    assert failed.value.code == 14
+    assert client.list_modules() == []
+    with pytest.raises(PulseError) as missing:
+        client.unload_module(99)
+    assert missing.value.code == 5
+    client.unload_modules([99], missing_ok=True)
+    client.close()
+    assert stub.state.malformed == []
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+import numpy as np
+import pytest
+
+pytest.importorskip("pyaudio")
+pytest.importorskip("websockets")
+
+from bot.capture_bus import AudioCaptureBus
+from openai_voice_assistant.async_realtime_client import AsyncAudioWebSocketClient
+from tools.mock_realtime_server import MockRealtimeServer
+
+RATE = 24000
+FRAME = RATE // 50  # 20 ms
+
+
+def feed(bus, stop):
+    """20 ms frames into the bus at real time, each numbered in its first sample.
+
+    The rest of each frame is silent, so the VAD never commits.
+    """
+    number = 1
+    while not stop.wait(0.02):
+        frame = np.zeros((FRAME, 1), dtype=np.int16)
+        frame[0, 0] = number
+        bus._dispatch(frame)
+        number += 1
+
+
+def frame_numbers(audio):
+    return np.frombuffer(audio, dtype=np.int16).reshape(-1, FRAME)[:, 0]
+
+
+class SlowReplayClient(AsyncAudioWebSocketClient):
+    """Everything sent before the session goes live takes 200 ms, like a congested link."""
+
+    async def _serve_connection(self, ws):
+        send = ws.send
+
+        async def slow_send(message):
+            if not self.connected:
+                await asyncio.sleep(0.2)
+            await send(message)
+
+        ws.send = slow_send
+        await super()._serve_connection(ws)
+
+
+def test_dropped_session_replays_uncommitted_audio_and_resets_backoff(make_client):
+    async def run():
+        server = await MockRealtimeServer(port=0, drop_after_messages=15, record_audio=True).start()
+        bus = AudioCaptureBus(rate=RATE, channels=1)
+        client = make_client(SlowReplayClient, server.url, capture=bus.subscribe(rate=RATE, channels=1))
+        attempts = []
+        next_delay = client.backoff.next_delay
+
+        def recording_next_delay():
+            attempts.append(client.backoff.attempts)
+            return next_delay()
+
+        client.backoff.next_delay = recording_next_delay
+        stop = threading.Event()
+        feeder = threading.Thread(target=feed, args=(bus, stop), daemon=True)
+        feeder.start()
+        session = asyncio.create_task(client.run_async())
+        for _ in range(300):
+            if server.connections >= 3:
+                break
+            await asyncio.sleep(0.05)
+        await client.stop_async()
+        await session
+        stop.set()
+        feeder.join()
+        await server.stop()
+        return server, client, attempts
+
+    server, client, attempts = asyncio.run(run())
+    assert server.connections >= 3 and server.dropped >= 2
+    first, second = (frame_numbers(audio) for audio in server.audio_by_connection[:2])
+    assert len(first) >= 2
+    # The new session got the old one's uncommitted audio first, then live frames after it
+    assert list(second[: len(first)]) == list(first)
+    assert len(second) > len(first)
+    # ...with nothing captured during the slow replay missing
+    assert list(np.diff(second)) == [1] * (len(second) - 1)
+    # Every reconnect after a successful session started from the initial delay
+    assert attempts and set(attempts) == {0}
+    assert client.reconnect_stats.reconnects >= 2
+    assert client.reconnect_stats.replayed_bytes >= len(first)
@@ -0,0 +1,44 @@
+import os
+import threading
+import time
+from openai_voice_assistant.response_cache import ResponseAudioCache
+
+
+def test_concurrent_puts_never_share_a_temp_file(tmp_path):
+    cache = ResponseAudioCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    key = cache.key("Hello, I'm the meeting bot.", "alloy", "", "pcm16@24000")
+    errors = []
+
+    def put(fill):
+        try:
+            for _ in range(20):
+                cache.put(key, bytes([fill]) * 48000)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=put, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    pcm = cache.get(key)
+    assert len(pcm) == 48000 and len(set(pcm)) == 1  # One writer's whole file, never a mix
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+    assert ResponseAudioCache(str(tmp_path)).get(key) == pcm  # The index survived too
+
+
+def test_recently_used_entries_survive_a_restart(tmp_path):
+    cache = ResponseAudioCache(str(tmp_path), max_bytes=3000)
+    keys = [cache.key(text, "alloy", "") for text in ("one", "two", "three")]
+    now = time.time()
+    for age, key in zip((300, 200, 100), keys):
+        cache.put(key, bytes(1000))
+        os.utime(cache._path(key), (now - age, now - age))  # Written in order, well apart
+    assert cache.get(keys[0]) is not None  # The oldest write is now the most recent use
+
+    restarted = ResponseAudioCache(str(tmp_path), max_bytes=2000)
+    assert restarted.get(keys[1]) is None  # Least recently used, so evicted on load
+    assert restarted.get(keys[0]) is not None
+    assert restarted.get(keys[2]) is not None
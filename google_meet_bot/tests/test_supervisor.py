@@ -0,0 +1,66 @@
+import os
+import signal
+import time
+from bot import supervisor
+from bot.models import MeetJoinerConfig
+from bot.supervisor import BotSupervisor, BotUsage
+
+
+def quick_bot(config_data):
+    pass
+
+
+def long_bot(config_data):
+    """Stands in for join_meeting: blocks, and records that its finally block ran."""
+    open(config_data["meeting_url"] + ".started", "w").close()
+    try:
+        time.sleep(60)
+    finally:
+        with open(config_data["meeting_url"], "w") as f:
+            f.write("torn down")
+
+
+def config(url):
+    return MeetJoinerConfig(meeting_url=url, video_url="", audio_url="")
+
+
+def test_bots_submitted_after_start_still_run():
+    supervisor = BotSupervisor(max_bots=2, sample_interval=0.05, run=quick_bot).start()
+    time.sleep(0.2)  # Idle loop, nothing submitted yet
+    supervisor.submit(config("https://meet.example/one"))
+    supervisor.submit(config("https://meet.example/two"))
+    assert supervisor.wait(30)
+    assert [usage.process.exitcode for usage in supervisor.finished] == [0, 0]
+    supervisor.stop()
+
+
+def test_stop_lets_the_bot_tear_down(tmp_path):
+    marker = str(tmp_path / "teardown")
+    supervisor = BotSupervisor(max_bots=1, sample_interval=0.05, run=long_bot)
+    supervisor.submit(config(marker))
+    supervisor.start()
+    deadline = time.monotonic() + 30
+    while not os.path.exists(marker + ".started") and time.monotonic() < deadline:
+        time.sleep(0.05)
+    supervisor.stop(timeout=10)
+    assert os.path.exists(marker)
+    assert supervisor.finished[0].process.exitcode == 128 + signal.SIGTERM
+
+
+class FakeProcess:
+    pid = 4242
+
+
+def test_first_sample_is_a_baseline_not_a_cpu_spike(monkeypatch):
+    readings = iter([1.0, 11.0, 12.0])  # Start-up burns 10 s of CPU, then 50% over 2 s
+    monkeypatch.setattr(supervisor, "tree_cpu_seconds", lambda pid: next(readings))
+    monkeypatch.setattr(supervisor, "tree_rss_mb", lambda pid: 100.0)
+    usage = BotUsage(0, config("https://meet.example/abc"))
+    usage.process = FakeProcess()
+    usage.last_cpu = supervisor.tree_cpu_seconds(usage.process.pid)  # As _start_pending does
+
+    sup = BotSupervisor(sample_interval=2.0)
+    sup._sample(usage, 2.0)
+    sup._sample(usage, 2.0)
+    assert usage.samples == [50.0]
+    assert usage.cpu_seconds == 11.0
@@ -0,0 +1,50 @@
+import numpy as np
+from bot.vad import StreamingVAD
+
+RATE = 24000
+
+
+def tone(seconds, dbfs, freq=120.0):
+    """A sine at ``dbfs`` (RMS), as int16."""
+    t = np.arange(int(RATE * seconds)) / RATE
+    amplitude = np.sqrt(2) * 10 ** (dbfs / 20) * 32768
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.int16)
+
+
+def silence(seconds, dbfs=-75.0):
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(RATE * seconds)) * 10 ** (dbfs / 20) * 32768).astype(np.int16)
+
+
+def feed(vad, samples, chunk_ms=20):
+    chunk = RATE * chunk_ms // 1000
+    events = []
+    for start in range(0, len(samples), chunk):
+        events += vad.process(samples[start : start + chunk].tobytes())
+    return events
+
+
+def test_steady_hum_from_the_start_is_not_speech():
+    vad = StreamingVAD(rate=RATE)
+    assert feed(vad, tone(10, -43)) == []
+    assert not vad.in_speech
+
+
+def test_hum_starting_mid_stream_ends_within_a_floor_window():
+    vad = StreamingVAD(rate=RATE)
+    events = feed(vad, np.concatenate([silence(1), tone(10, -43)]))
+    assert [name for name, _ in events] == ["speech_start", "speech_end"]
+    assert events[1][1] < 1 + 3.0 + 1.0
+    assert not vad.in_speech
+
+
+def test_speech_over_hum_is_detected():
+    vad = StreamingVAD(rate=RATE)
+    # Syllable-like bursts 20 dB over the hum, with short gaps
+    burst = np.concatenate([tone(0.25, -23, freq=220) + tone(0.25, -43), tone(0.1, -43)])
+    audio = np.concatenate([tone(2, -43), np.tile(burst, 4), tone(2, -43)])
+    events = feed(vad, audio)
+    assert [name for name, _ in events] == ["speech_start", "speech_end"]
+    assert 2.0 <= events[0][1] < 2.2
+    speech_stops = 2 + 4 * 0.35 - 0.1
+    assert speech_stops < events[1][1] < speech_stops + 0.5
@@ -0,0 +1,33 @@
+import struct
+import wave
+from bot.wav_writer import StreamingWavWriter
+
+
+class SmallCapWriter(StreamingWavWriter):
+    MAX_DATA_BYTES = 1001  # Not a whole number of 4-byte frames
+
+
+def test_unsegmented_recording_rolls_over_before_the_size_limit(tmp_path):
+    path = str(tmp_path / "meeting.wav")
+    with SmallCapWriter(path, channels=2, sample_width=2, rate=8000) as writer:
+        for _ in range(5):
+            writer.write(bytes(600))
+    assert writer.segments == [path, str(tmp_path / "meeting_001.wav"), str(tmp_path / "meeting_002.wav")]
+    frames = []
+    for segment in writer.segments:
+        with wave.open(segment) as f:
+            frames.append(f.getnframes())
+    # Each file is capped at whole frames, and nothing is lost across the roll-over
+    assert frames == [250, 250, 250]
+    assert sum(frames) * 4 == writer.total_bytes == 3000
+
+
+def test_default_cap_keeps_the_riff_header_32_bit():
+    writer = StreamingWavWriter("unused.wav", channels=2, sample_width=2, rate=44100)
+    assert writer._segment_limit <= StreamingWavWriter.MAX_DATA_BYTES
+    assert writer._segment_limit % writer.frame_size == 0
+    riff_size = struct.unpack_from("<I", writer._header(writer._segment_limit), 4)[0]
+    assert riff_size == 36 + writer._segment_limit
+    # A segment_seconds longer than the cap is capped too
+    hours = StreamingWavWriter("unused.wav", channels=2, sample_width=2, rate=44100, segment_seconds=8 * 3600)
+    assert hours._segment_limit == writer._segment_limit
@@ -0,0 +1,81 @@
+"""Cold vs warm join times: a fresh uc.Chrome per meeting vs a BrowserPool lease.
+
+Each round gets a browser, joins the fake Meet ("Join now" path), leaves, and
+gives the browser back: quit for cold, BrowserPool.release for warm. The
+pool is allowed to refill between rounds, as it would between real meetings.
+
+Usage (from google_meet_bot/):
+    python -m tools.bench_browser_pool [--rounds 5] [--max-uses 3] [--plain] [--no-headless]
+"""
+
+import argparse
+import functools
+import time
+from bot.browser_pool import BrowserPool, launch_chrome
+from bot.join_flow import JoinFlow
+from bot.meet_joiner_v2 import GoogleMeetBot
+from bot.models import MeetJoinerConfig
+from tools.fake_meet import FakeMeet, open_driver
+
+
+def join_once(meet, get_driver, give_back):
+    started = time.perf_counter()
+    driver = get_driver()
+    ready_ms = (time.perf_counter() - started) * 1000
+    report = JoinFlow(driver, page_timeout=10).run(meet.url(mode="join", load_ms=300, panel_ms=100))
+    if report.joined:
+        bot = GoogleMeetBot(MeetJoinerConfig(meeting_url="", video_url="", audio_url=""))
+        bot.driver = driver
+        bot.leave_meeting()
+    give_back(driver)
+    return ready_ms, report.total_ms, report.joined
+
+
+def summarize(label, rows):
+    joined = [row for row in rows if row[2]]
+    if not joined:
+        print(f"{label:<5} no successful joins")
+        return
+    ready = sorted(row[0] for row in joined)
+    join = sorted(row[1] for row in joined)
+    total = sorted(row[0] + row[1] for row in joined)
+    mid = len(joined) // 2
+    print(f"{label:<5} {ready[mid]:10.0f} {join[mid]:10.0f} {total[mid]:10.0f} {total[-1]:10.0f}"
+          f"   ({len(joined)}/{len(rows)} joined)")
+
+
+def run(rounds=5, max_uses=3, plain=False, headless=True):
+    launch = (
+        functools.partial(open_driver, headless)
+        if plain
+        else functools.partial(launch_chrome, headless=headless)
+    )
+    meet = FakeMeet().start()
+    pool = BrowserPool(size=1, max_uses=max_uses, launch=launch)
+    try:
+        cold = [join_once(meet, launch, lambda driver: driver.quit()) for _ in range(rounds)]
+        pool.start()  # Only now, so its launches don't overlap the cold rounds
+        warm = []
+        for _ in range(rounds):
+            pool.wait_ready(timeout=120)
+            warm.append(join_once(meet, pool.acquire, pool.release))
+    finally:
+        pool.close()
+        meet.stop()
+    print("p50 ms  browser       join      total  total max")
+    summarize("cold", cold)
+    summarize("warm", warm)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold vs pooled browser join times on the fake Meet")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--max-uses", type=int, default=3, help="Meetings per pooled browser before it is recycled")
+    parser.add_argument("--plain", action="store_true", help="Plain selenium Chrome instead of undetected_chromedriver")
+    parser.add_argument("--no-headless", action="store_true")
+    args = parser.parse_args()
+    run(args.rounds, args.max_uses, args.plain, headless=not args.no_headless)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""GoogleMeetBot benchmark suite on the offline fake Meet (tools/fake_meet.py).
+
+Three measurements, all under headless Chrome:
+
+  join      JoinFlow from driver.get() to confirmed in-meeting, with the bot's
+            own device selection, for the guest ("Ask to join") and "Join now"
+            paths; p50/max over --joins runs
+  steady    CPU of Chrome (the browser/chromedriver process tree, from /proc) and of
+            this Python process while the bot sits in a call with participant
+            churn, for presence push mode and the polling fallback
+  leave     time from the last other participant leaving (fixture timestamp)
+            to the bot clicking Leave call, for the same two modes
+
+Usage (from google_meet_bot/):
+    python -m tools.bench_meet [--joins 5] [--steady-s 20] [--churn-ms 1000] [--no-headless]
+"""
+
+import argparse
+import time
+from bot.join_flow import JoinFlow
+from bot.presence import PresenceMonitor
+from bot.proc_stats import driver_pids, tree_cpu_seconds
+from tools.fake_meet import FakeMeet, fixture_times, open_driver
+
+
+def make_bot(driver):
+    # Imported here so the fixture server itself needs no bot dependencies
+    from bot.meet_joiner_v2 import GoogleMeetBot
+    from bot.models import MeetJoinerConfig
+
+    bot = GoogleMeetBot(MeetJoinerConfig(meeting_url="", video_url="", audio_url=""))
+    bot.driver = driver
+    return bot
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def bench_join(driver, meet, bot, joins):
+    for label, params in [
+        ("ask to join", dict(load_ms=300, admit_ms=500, panel_ms=100)),
+        ("join now", dict(mode="join", load_ms=300, panel_ms=100)),
+    ]:
+        totals = []
+        admissions = []
+        for _ in range(joins):
+            report = JoinFlow(driver, before_join=bot.prepare_devices, page_timeout=10).run(meet.url(**params))
+            if not report.joined:
+                print(f"join [{label}]: failed: {report.error}")
+                break
+            totals.append(report.total_ms)
+            admissions.append(report.join_to_in_meeting_ms)
+        if totals:
+            print(
+                f"join [{label:<11}] total p50 {percentile(totals, 0.5):7.0f} ms  max {max(totals):7.0f} ms  "
+                f"click->in-call p50 {percentile(admissions, 0.5):6.0f} ms  ({len(totals)} runs)"
+            )
+
+
+def bench_presence(driver, meet, bot, push, steady_s, churn_ms):
+    """One call: steady-state CPU with churn, then leave reaction once everyone else leaves."""
+    mode = "push" if push else "poll"
+    # Everyone else leaves shortly after the steady window (the join itself takes well under 5 s)
+    url = meet.url(mode="join", load_ms=0, panel_ms=0, others=3, churn_ms=churn_ms,
+                   empty_ms=int((steady_s + 5) * 1000))
+    report = JoinFlow(driver, page_timeout=10).run(url)
+    if not report.joined:
+        print(f"presence [{mode}]: join failed: {report.error}")
+        return
+    presence = PresenceMonitor(driver, poll=bot.get_participant_count, push=push).start()
+    try:
+        chrome_pids = driver_pids(driver)
+        chrome_before = tree_cpu_seconds(*chrome_pids)
+        python_before = time.process_time()
+        started = time.monotonic()
+        time.sleep(steady_s)
+        wall = time.monotonic() - started
+        chrome_pct = (tree_cpu_seconds(*chrome_pids) - chrome_before) / wall * 100
+        python_pct = (time.process_time() - python_before) / wall * 100
+
+        count = presence.wait_until(lambda count: count is not None and count < 2, timeout=30)
+        if count is None:
+            print(f"presence [{mode}]: bot never saw the call empty")
+            return
+        bot.leave_meeting()
+        times = fixture_times(driver)
+        reaction_ms = times["leftAt"] - times["emptiedAt"]
+        print(
+            f"presence [{mode}] steady CPU: chrome {chrome_pct:5.1f}%  bot {python_pct:5.1f}%  "
+            f"({times['churn']} churn events)  leave reaction {reaction_ms:6.0f} ms  {presence.stats()}"
+        )
+    finally:
+        presence.stop()
+
+
+def run(joins=5, steady_s=20, churn_ms=1000, headless=True):
+    meet = FakeMeet().start()
+    driver = open_driver(headless)
+    try:
+        bot = make_bot(driver)
+        bench_join(driver, meet, bot, joins)
+        for push in (True, False):
+            bench_presence(driver, meet, bot, push, steady_s, churn_ms)
+    finally:
+        driver.quit()
+        meet.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Join, steady-state and leave benchmarks on the fake Meet")
+    parser.add_argument("--joins", type=int, default=5, help="Joins per path for the latency numbers")
+    parser.add_argument("--steady-s", type=float, default=20, help="Length of the in-call CPU window")
+    parser.add_argument("--churn-ms", type=int, default=1000, help="Participant join/leave interval")
+    parser.add_argument("--no-headless", action="store_true")
+    args = parser.parse_args()
+    run(args.joins, args.steady_s, args.churn_ms, headless=not args.no_headless)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Per-tick cost of reading Meet page state: separate lookups vs one snapshot.
+
+Drives the local fixture into the pre-join and in-call screens and, on each,
+reads the same facts two ways:
+
+  legacy    the bot's existing pattern, one find_element(s)/is_displayed/text
+            call per check, with misses paid as exceptions
+  snapshot  bot.page_state.read_page_state, a single execute_script
+
+Reports chromedriver round-trips and wall time per tick for both.
+
+Usage (from google_meet_bot/):
+    python -m tools.bench_page_state [--ticks 50] [--no-headless]
+"""
+
+import argparse
+import time
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from bot.join_flow import DENIED, IN_CALL, JOIN_NOW, ASK_TO_JOIN, NAME_INPUT, JoinFlow, find_first
+from bot.page_state import CommandCounter, read_page_state
+from tools.fake_meet import FakeMeet, open_driver
+
+BOT_NAME = "Guest Bot"
+
+
+def legacy_tick(driver, bot_name=BOT_NAME):
+    """The same checks as one snapshot, done the way GoogleMeetBot did them."""
+    state = {
+        "name_input": find_first(driver, NAME_INPUT) is not None,
+        "ask_to_join": find_first(driver, ASK_TO_JOIN[1:]) is not None,
+        "join_now": find_first(driver, JOIN_NOW[1:]) is not None,
+        "in_meeting": find_first(driver, IN_CALL) is not None,
+        "denied": find_first(driver, DENIED) is not None,
+        "participant_count": None,
+        "bot_listed": bool(driver.find_elements(By.XPATH, f'//div[contains(text(), "{bot_name}")]')),
+        "mic_on": bool(driver.find_elements(By.CSS_SELECTOR, '[aria-label^="Turn off microphone"]')),
+        "camera_on": bool(driver.find_elements(By.CSS_SELECTOR, '[aria-label^="Turn off camera"]')),
+    }
+    try:
+        label = driver.find_element(By.XPATH, '//div[contains(text(), "Contributors")]')
+        state["participant_count"] = int(label.find_element(By.XPATH, "following-sibling::*[1]").text)
+    except (WebDriverException, ValueError):
+        pass
+    return state
+
+
+def measure(driver, tick, ticks):
+    with CommandCounter(driver) as counter:
+        started = time.perf_counter()
+        for _ in range(ticks):
+            result = tick()
+        elapsed = time.perf_counter() - started
+    return counter.count / ticks, elapsed * 1000 / ticks, result
+
+
+def run(ticks=50, headless=True):
+    meet = FakeMeet().start()
+    driver = open_driver(headless)
+    try:
+        screens = [
+            ("pre-join", lambda: driver.get(meet.url(load_ms=0))),
+            ("in-call", lambda: JoinFlow(driver, bot_name=BOT_NAME).run(
+                meet.url(mode="join", load_ms=0, panel_ms=0))),
+        ]
+        for screen, reach in screens:
+            reach()
+            read_page_state(driver, BOT_NAME)  # Settle the page before timing
+            legacy_rt, legacy_ms, legacy = measure(driver, lambda: legacy_tick(driver), ticks)
+            snap_rt, snap_ms, snap = measure(driver, lambda: read_page_state(driver, BOT_NAME), ticks)
+            print(f"{screen}:")
+            print(f"  legacy    {legacy_rt:5.1f} round-trips  {legacy_ms:7.2f} ms per tick")
+            print(f"  snapshot  {snap_rt:5.1f} round-trips  {snap_ms:7.2f} ms per tick "
+                  f"({legacy_ms / snap_ms:.1f}x faster)")
+            mismatched = [
+                key for key, value in legacy.items() if (getattr(snap, key) or None) != (value or None)
+            ]
+            if mismatched:
+                print(f"  WARNING: readings disagree on {mismatched}")
+    finally:
+        driver.quit()
+        meet.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-tick page state reads on the Meet fixture")
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--no-headless", action="store_true")
+    args = parser.parse_args()
+    run(args.ticks, headless=not args.no_headless)
+
+
+if __name__ == "__main__":
+    main()
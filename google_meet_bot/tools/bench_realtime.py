@@ -0,0 +1,180 @@
+"""End-to-end turn latency benchmark for the realtime voice pipeline.
+
+Runs N concurrent AsyncAudioWebSocketClient sessions against the local mock
+server, each fed a scripted WAV conversation through FakePyAudio, and reports:
+  * end-of-speech (local VAD) → first response.audio.delta latency
+  * inter-delta arrival jitter
+  * CPU per session (process-wide, so it includes the in-process mock server)
+
+Usage (from google_meet_bot/):
+    python -m tools.bench_realtime [--wav conversation.wav] [--sessions 1 10 50]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import tempfile
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from openai_voice_assistant.async_realtime_client import AsyncAudioWebSocketClient
+from tools.fake_audio import FakePyAudio
+from tools.mock_realtime_server import MockRealtimeServer
+
+
+class InstrumentedClient(AsyncAudioWebSocketClient):
+    """Records wall-clock turn timings without changing client behaviour."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.turns = []
+        self.delta_gaps = []
+        self._last_delta_at = None
+
+    def speech_events(self, data):
+        started, ended = super().speech_events(data)
+        if ended:
+            self.turns.append({"end_of_speech": time.perf_counter()})
+            self._last_delta_at = None
+        return started, ended
+
+    def handle_audio_delta(self, event):
+        now = time.perf_counter()
+        if self.turns and "first_delta" not in self.turns[-1]:
+            self.turns[-1]["first_delta"] = now
+        elif self._last_delta_at is not None:
+            self.delta_gaps.append(now - self._last_delta_at)
+        self._last_delta_at = now
+        super().handle_audio_delta(event)
+
+
+def write_scripted_conversation(path, rate=24000, utterances=3, speech_s=1.2, gap_s=4.0):
+    """Synthesize speech-like bursts separated by silence long enough for a reply."""
+    rng = np.random.default_rng(0)
+    parts = [rng.normal(0, 20, int(rate * 0.5))]
+    for _ in range(utterances):
+        t = np.arange(int(rate * speech_s)) / rate
+        voiced = np.sin(2 * np.pi * 180 * t) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t)) * 6000
+        parts.append(voiced + rng.normal(0, 20, len(t)))
+        parts.append(rng.normal(0, 20, int(rate * gap_s)))
+    audio = np.clip(np.concatenate(parts), -32768, 32767).astype(np.int16)
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(audio.tobytes())
+    return len(audio) / rate
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def run_level(server, wav_path, sessions, duration, frame_ms):
+    loop = asyncio.get_running_loop()
+    # Every session parks one blocking device read in the executor at a time
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=sessions + 8))
+
+    clients = [
+        InstrumentedClient(
+            "mock-key",
+            server.url,
+            frame_ms=frame_ms,
+            audio_interface=FakePyAudio(wav_path),
+        )
+        for _ in range(sessions)
+    ]
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    tasks = [asyncio.create_task(client.run_async()) for client in clients]
+    await asyncio.sleep(duration)
+    for client in clients:
+        await client.stop_async()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    latencies = [
+        turn["first_delta"] - turn["end_of_speech"]
+        for client in clients
+        for turn in client.turns
+        if "first_delta" in turn
+    ]
+    expected_gap = server.delta_interval_ms / 1000
+    jitter = [abs(gap - expected_gap) for client in clients for gap in client.delta_gaps]
+    return {
+        "sessions": sessions,
+        "turns": len(latencies),
+        "latency_ms_p50": percentile(latencies, 0.5) * 1000 if latencies else None,
+        "latency_ms_p95": percentile(latencies, 0.95) * 1000 if latencies else None,
+        "jitter_ms_mean": statistics.fmean(jitter) * 1000 if jitter else None,
+        "jitter_ms_p95": percentile(jitter, 0.95) * 1000 if jitter else None,
+        "cpu_pct_per_session": cpu / wall / sessions * 100,
+    }
+
+
+async def main_async(args):
+    server = MockRealtimeServer(
+        port=0,
+        response_ms=args.response_ms,
+        first_delta_delay_ms=args.first_delta_delay_ms,
+    )
+    await server.start()
+
+    wav_path = args.wav
+    tmp = None
+    if wav_path is None:
+        tmp = tempfile.NamedTemporaryFile(suffix=".wav", delete=False)
+        tmp.close()
+        wav_path = tmp.name
+        length = write_scripted_conversation(wav_path)
+    else:
+        with wave.open(wav_path, "rb") as wf:
+            length = wf.getnframes() / wf.getframerate()
+
+    results = []
+    try:
+        for sessions in args.sessions:
+            quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+            with quiet:
+                result = await run_level(
+                    server, wav_path, sessions, length + 3.0, args.frame_ms
+                )
+            results.append(result)
+            print(format_result(result), flush=True)
+    finally:
+        await server.stop()
+        if tmp is not None:
+            os.unlink(wav_path)
+    return results
+
+
+def format_result(r):
+    fmt = lambda v: "   n/a" if v is None else f"{v:6.1f}"
+    return (
+        f"{r['sessions']:>3} sessions | turns {r['turns']:>4} | "
+        f"EOS->first audio p50 {fmt(r['latency_ms_p50'])} ms p95 {fmt(r['latency_ms_p95'])} ms | "
+        f"delta jitter mean {fmt(r['jitter_ms_mean'])} ms p95 {fmt(r['jitter_ms_p95'])} ms | "
+        f"CPU {r['cpu_pct_per_session']:5.2f}% per session"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Realtime turn latency benchmark")
+    parser.add_argument("--wav", help="Scripted conversation (16-bit WAV); synthesized if omitted")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--frame-ms", type=int, default=20)
+    parser.add_argument("--response-ms", type=int, default=2000)
+    parser.add_argument("--first-delta-delay-ms", type=int, default=300)
+    parser.add_argument("--verbose", action="store_true", help="Show client logs")
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
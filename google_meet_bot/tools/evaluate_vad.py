@@ -0,0 +1,124 @@
+"""Offline evaluation of bot.vad.StreamingVAD over WAV files.
+
+Usage (from google_meet_bot/):
+    python -m tools.evaluate_vad recording.wav [more.wav ...] [--frame-ms 20] [--block-ms 100]
+
+Reference speech segments come from ``<file>.labels.json`` ([[start, end], ...] in
+seconds) when present. Otherwise they are derived offline from the whole file with
+a global energy threshold. The report lists end-of-speech detection latency
+(detected end minus reference end) and CPU time per second of audio.
+"""
+
+import argparse
+import json
+import os
+import time
+import wave
+import numpy as np
+from bot.vad import StreamingVAD
+
+
+def load_wav(path):
+    with wave.open(path, "rb") as wf:
+        if wf.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit PCM is supported")
+        rate = wf.getframerate()
+        channels = wf.getnchannels()
+        samples = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16)
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return samples, rate
+
+
+def reference_segments(samples, rate, frame_ms=20, margin_db=15.0, min_gap_ms=200):
+    """Non-causal energy segmentation used when no label file exists."""
+    frame_len = int(rate * frame_ms / 1000)
+    n = len(samples) // frame_len
+    frames = samples[: n * frame_len].reshape(n, frame_len).astype(np.float32) / 32768.0
+    energy = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-10)
+    threshold = max(np.percentile(energy, 10) + margin_db, -50.0)
+    active = energy >= threshold
+
+    segments = []
+    start = None
+    gap = 0
+    max_gap = min_gap_ms // frame_ms
+    for i, on in enumerate(active):
+        if on:
+            if start is None:
+                start = i
+            gap = 0
+        elif start is not None:
+            gap += 1
+            if gap > max_gap:
+                segments.append((start * frame_ms / 1000, (i - gap + 1) * frame_ms / 1000))
+                start = None
+                gap = 0
+    if start is not None:
+        segments.append((start * frame_ms / 1000, (n - gap) * frame_ms / 1000))
+    return segments
+
+
+def run_vad(samples, rate, frame_ms, block_ms):
+    vad = StreamingVAD(rate=rate, frame_ms=frame_ms)
+    block = int(rate * block_ms / 1000)
+    events = []
+    cpu_start = time.process_time()
+    for i in range(0, len(samples), block):
+        events.extend(vad.process(samples[i : i + block]))
+    cpu = time.process_time() - cpu_start
+    return events, cpu
+
+
+def evaluate(path, frame_ms, block_ms):
+    samples, rate = load_wav(path)
+    duration = len(samples) / rate
+
+    labels_path = path + ".labels.json"
+    if os.path.exists(labels_path):
+        with open(labels_path) as f:
+            reference = [tuple(seg) for seg in json.load(f)]
+        source = "labels"
+    else:
+        reference = reference_segments(samples, rate)
+        source = "energy reference"
+
+    events, cpu = run_vad(samples, rate, frame_ms, block_ms)
+    ends = [at for event, at in events if event == "speech_end"]
+    starts = [at for event, at in events if event == "speech_start"]
+
+    # Match every reference end with the first detected end after it
+    latencies = []
+    for _, ref_end in reference:
+        later = [at for at in ends if at >= ref_end]
+        if later:
+            latencies.append(later[0] - ref_end)
+
+    print(f"\n{path} ({duration:.1f}s @ {rate} Hz, {source})")
+    print(f"  reference segments: {len(reference)}, detected: {len(starts)} starts / {len(ends)} ends")
+    if latencies:
+        ms = np.array(latencies) * 1000
+        print(
+            f"  end-of-speech latency: median {np.median(ms):.0f} ms, "
+            f"p90 {np.percentile(ms, 90):.0f} ms, max {ms.max():.0f} ms"
+        )
+    else:
+        print("  end-of-speech latency: no matched segments")
+    print(
+        f"  CPU: {cpu * 1000:.1f} ms total, {cpu * 1000 / duration:.3f} ms per audio second "
+        f"({duration / cpu if cpu else float('inf'):.0f}x real time)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("wav", nargs="+")
+    parser.add_argument("--frame-ms", type=int, default=20)
+    parser.add_argument("--block-ms", type=int, default=100, help="Size of each process() call")
+    args = parser.parse_args()
+    for path in args.wav:
+        evaluate(path, args.frame_ms, args.block_ms)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""File-backed stand-in for ``pyaudio.PyAudio`` used by benchmarks and local runs.
+
+Input streams play a WAV file (converted to the requested rate/channels) at real
+time and then deliver silence. Output streams consume audio at real time and
+count what was written. Both blocking (``read``/``write``) and callback streams
+are supported, so the recorder, capture bus, realtime clients and player can
+all run without a sound card.
+"""
+
+import threading
+import time
+import wave
+import numpy as np
+from bot.resampler import AudioConverter
+
+paInt16 = 8
+paContinue = 0
+
+
+class FakeStream:
+    def __init__(self, owner, rate, channels, input=False, output=False,
+                 frames_per_buffer=1024, stream_callback=None, realtime=True, **_):
+        self.owner = owner
+        self.rate = rate
+        self.channels = channels
+        self.is_input = input
+        self.frames_per_buffer = frames_per_buffer
+        self.callback = stream_callback
+        self.realtime = realtime
+        self.position = 0  # Frames delivered/consumed so far
+        self.bytes_written = 0
+        self.first_write_at = None
+        self._started_at = None
+        self._active = False
+        self._thread = None
+        self._source = owner.source_for(rate, channels) if input else None
+
+    def _pace(self, frames):
+        """Sleep until ``frames`` more frames would have passed on a real device."""
+        if not self.realtime:
+            return
+        if self._started_at is None:
+            self._started_at = time.perf_counter()
+        due = self._started_at + (self.position + frames) / self.rate
+        delay = due - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    def _next_input(self, frames):
+        start = self.position * self.channels
+        end = start + frames * self.channels
+        chunk = self._source[start:end]
+        if len(chunk) < frames * self.channels:
+            chunk = np.concatenate(
+                [chunk, np.zeros(frames * self.channels - len(chunk), dtype=np.int16)]
+            )
+        return chunk.tobytes()
+
+    def read(self, frames, exception_on_overflow=True):
+        self._pace(frames)
+        data = self._next_input(frames)
+        self.position += frames
+        return data
+
+    def write(self, data, num_frames=None, exception_on_underflow=False):
+        frames = len(data) // (2 * self.channels)
+        if self.first_write_at is None:
+            self.first_write_at = time.perf_counter()
+        self._pace(frames)
+        self.position += frames
+        self.bytes_written += len(data)
+        self.owner.bytes_played += len(data)
+
+    def _callback_loop(self):
+        while self._active:
+            frames = self.frames_per_buffer
+            self._pace(frames)
+            in_data = self._next_input(frames) if self.is_input else None
+            self.position += frames
+            _, flag = self.callback(in_data, frames, {}, 0)
+            if flag != paContinue:
+                break
+
+    def start_stream(self):
+        if self.callback is not None and not self._active:
+            self._active = True
+            self._thread = threading.Thread(target=self._callback_loop, daemon=True)
+            self._thread.start()
+
+    def stop_stream(self):
+        self._active = False
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+            self._thread = None
+
+    def is_active(self):
+        return self._active
+
+    def close(self):
+        self.stop_stream()
+        self.owner.streams.discard(self)
+
+
+class FakePyAudio:
+    """Drop-in for the subset of ``pyaudio.PyAudio`` the bot uses."""
+
+    def __init__(self, wav_path=None, realtime=True):
+        self.wav_path = wav_path
+        self.realtime = realtime
+        self.streams = set()
+        self.bytes_played = 0
+        self._sources = {}
+        self._wav = None
+        if wav_path:
+            with wave.open(wav_path, "rb") as wf:
+                if wf.getsampwidth() != 2:
+                    raise ValueError("FakePyAudio only reads 16-bit PCM WAV files")
+                self._wav = (
+                    wf.getframerate(),
+                    wf.getnchannels(),
+                    np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16),
+                )
+
+    def source_for(self, rate, channels):
+        """The WAV converted (once) to an input stream's format, as flat interleaved int16."""
+        key = (rate, channels)
+        if key not in self._sources:
+            if self._wav is None:
+                self._sources[key] = np.zeros(0, dtype=np.int16)
+            else:
+                src_rate, src_channels, samples = self._wav
+                converter = AudioConverter(src_rate, src_channels, rate, channels)
+                out = converter.process(samples.reshape(-1, src_channels))
+                self._sources[key] = np.ascontiguousarray(out).reshape(-1)
+        return self._sources[key]
+
+    def open(self, rate, channels, format=paInt16, input=False, output=False, **kwargs):
+        stream = FakeStream(self, rate, channels, input=input, output=output,
+                            realtime=self.realtime, **kwargs)
+        self.streams.add(stream)
+        return stream
+
+    def get_sample_size(self, format):
+        return 2
+
+    def terminate(self):
+        for stream in list(self.streams):
+            stream.close()
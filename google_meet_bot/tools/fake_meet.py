@@ -0,0 +1,77 @@
+"""Offline stand-in for meet.google.com.
+
+Serves tools/fixtures/meet_join.html, which has the DOM hooks the bot relies
+on (guest name input, "Ask to join"/"Join now", Microphone/Speaker device
+menus, People, Contributors, Leave call). Join delays and participant churn
+are set through query parameters; see the comment at the top of the fixture.
+
+Usage (from google_meet_bot/), to click through it by hand:
+    python -m tools.fake_meet [--port 8765]
+"""
+
+import argparse
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlencode
+from selenium import webdriver
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class FakeMeet:
+    """The fixture site on a local port, served from a background thread."""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        handler = functools.partial(_QuietHandler, directory=FIXTURES)
+        self.server = ThreadingHTTPServer((host, port), handler)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/meet_join.html"
+
+    def url(self, **params):
+        """Meeting URL with scripted behaviour, e.g. ``url(admit_ms=500, empty_ms=5000)``."""
+        return f"{self.base_url}?{urlencode(params)}" if params else self.base_url
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def open_driver(headless=True):
+    options = webdriver.ChromeOptions()
+    options.add_argument("--use-fake-ui-for-media-stream")
+    if headless:
+        options.add_argument("--headless=new")
+    return webdriver.Chrome(options=options)
+
+
+def fixture_times(driver):
+    """The fixture's benchmark timestamps (ms since epoch) and churn count."""
+    return driver.execute_script("return window.__fixture || {};")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the fake Meet fixture")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+    meet = FakeMeet(port=args.port)
+    print(f"Fake Meet at {meet.url(admit_ms=2000, churn_ms=3000)}")
+    try:
+        meet.server.serve_forever()
+    except KeyboardInterrupt:
+        meet.server.server_close()
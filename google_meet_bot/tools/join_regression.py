@@ -0,0 +1,80 @@
+"""Join-latency regression test against the local Meet fixture.
+
+Serves tools/fixtures/meet_join.html over HTTP, drives it with JoinFlow in a
+real Chrome, and checks each scenario's outcome and join time. A scenario
+fails if the join takes longer than the fixture's own scripted delays plus
+``--slack-ms``, which catches fixed sleeps creeping back in. The old
+join_meeting spent at least 29 s in sleeps on every join.
+
+Usage (from google_meet_bot/):
+    python -m tools.join_regression [--slack-ms 3000] [--no-headless]
+"""
+
+import argparse
+import sys
+from bot.join_flow import JoinFlow
+from tools.fake_meet import FakeMeet, open_driver
+
+LEGACY_FIXED_SLEEP_MS = 29000  # sleep(5) + sleep(2) + sleep(20) + sleep(2)
+
+# (name, query string, expect joined, scripted delay in ms)
+SCENARIOS = [
+    ("fast admit", "load_ms=300&admit_ms=500", True, 800),
+    ("slow page", "load_ms=3000&admit_ms=500", True, 3500),
+    ("slow admit", "load_ms=300&admit_ms=5000", True, 5300),
+    ("join now", "mode=join&load_ms=300", True, 500),
+    ("no name field", "name=0&load_ms=300&admit_ms=500", True, 800),
+    ("denied", "load_ms=300&admit_ms=500&deny=1", False, 800),
+]
+
+
+def select_fixture_devices(driver):
+    """The bot's device selection steps, against the fixture's menus."""
+    # Imported here so the fixture server itself needs no bot dependencies
+    from bot.meet_joiner_v2 import GoogleMeetBot
+    from bot.models import MeetJoinerConfig
+
+    bot = GoogleMeetBot(MeetJoinerConfig(meeting_url="", video_url="", audio_url=""))
+    bot.driver = driver
+    bot.prepare_devices()
+
+
+def run(slack_ms=3000, headless=True):
+    meet = FakeMeet().start()
+    driver = open_driver(headless)
+    failures = 0
+    try:
+        for name, query, expect_joined, scripted_ms in SCENARIOS:
+            flow = JoinFlow(
+                driver,
+                before_join=select_fixture_devices,
+                admission_timeout=15,
+                page_timeout=10,
+            )
+            report = flow.run(f"{meet.base_url}?{query}")
+            budget = scripted_ms + slack_ms
+            ok = report.joined == expect_joined and (not expect_joined or report.total_ms <= budget)
+            failures += not ok
+            print(
+                f"{'PASS' if ok else 'FAIL'} {name:<14} joined={report.joined!s:<5} "
+                f"total {report.total_ms:7.0f} ms (budget {budget} ms, legacy >= {LEGACY_FIXED_SLEEP_MS} ms) "
+                f"stages {report.stage_ms}"
+            )
+    finally:
+        driver.quit()
+        meet.stop()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Join-latency regression against the Meet fixture")
+    parser.add_argument("--slack-ms", type=int, default=3000, help="Allowed time beyond scripted delays")
+    parser.add_argument("--no-headless", action="store_true")
+    args = parser.parse_args()
+    failures = run(args.slack_ms, headless=not args.no_headless)
+    print(f"{len(SCENARIOS) - failures}/{len(SCENARIOS)} scenarios passed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""Local stand-in for the OpenAI realtime websocket endpoint.
+
+Speaks the subset of the event protocol the bot uses: session.update,
+input_audio_buffer.append/commit, response.create/cancel,
+conversation.item.truncate, and streams response.audio.delta / response.done
+back with configurable sizes and delays. Commits and completed responses also
+produce placeholder transcription events.
+
+Usage (from google_meet_bot/):
+    python -m tools.mock_realtime_server --port 8765 --response-ms 2000
+then point OPEN_WS_URL at ws://127.0.0.1:8765.
+"""
+
+import argparse
+import asyncio
+import base64
+import itertools
+import json
+import numpy as np
+import websockets
+
+
+class MockRealtimeServer:
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=8765,
+        response_ms=2000,  # Audio length of every response
+        delta_ms=100,  # Audio per response.audio.delta
+        first_delta_delay_ms=300,  # Server "think time" before the first delta
+        delta_interval_ms=None,  # Gap between deltas; None streams at real time
+        rate=24000,
+        drop_after_messages=None,  # Close each connection after N client messages
+        record_audio=False,  # Keep each connection's appended audio in audio_by_connection
+    ):
+        self.host = host
+        self.port = port
+        self.response_ms = response_ms
+        self.delta_ms = delta_ms
+        self.first_delta_delay_ms = first_delta_delay_ms
+        self.delta_interval_ms = delta_ms if delta_interval_ms is None else delta_interval_ms
+        self.rate = rate
+        self.drop_after_messages = drop_after_messages
+        self.record_audio = record_audio
+
+        self._ids = itertools.count(1)
+        self._server = None
+        self.connections = 0
+        self.dropped = 0
+        self.events_received = {}
+        self.audio_by_connection = []  # PCM16 appended on each connection, in order (record_audio)
+
+        # A quiet 220 Hz tone so played audio is recognisable but not silent
+        samples = int(rate * delta_ms / 1000)
+        tone = (np.sin(2 * np.pi * 220 * np.arange(samples) / rate) * 3000).astype(np.int16)
+        self._delta_b64 = base64.b64encode(tone.tobytes()).decode()
+
+    def _next_id(self, prefix):
+        return f"{prefix}_{next(self._ids)}"
+
+    async def _stream_response(self, ws, response_id, item_id):
+        try:
+            await asyncio.sleep(self.first_delta_delay_ms / 1000)
+            deltas = max(1, self.response_ms // self.delta_ms)
+            for _ in range(deltas):
+                await ws.send(
+                    json.dumps(
+                        {
+                            "type": "response.audio.delta",
+                            "response_id": response_id,
+                            "item_id": item_id,
+                            "output_index": 0,
+                            "content_index": 0,
+                            "delta": self._delta_b64,
+                        }
+                    )
+                )
+                await asyncio.sleep(self.delta_interval_ms / 1000)
+            status = "completed"
+            await ws.send(
+                json.dumps(
+                    {
+                        "type": "response.audio_transcript.done",
+                        "response_id": response_id,
+                        "item_id": item_id,
+                        "output_index": 0,
+                        "content_index": 0,
+                        "transcript": f"mock response {response_id}",
+                    }
+                )
+            )
+        except asyncio.CancelledError:
+            status = "cancelled"
+        await ws.send(
+            json.dumps(
+                {"type": "response.done", "response": {"id": response_id, "status": status}}
+            )
+        )
+
+    async def handler(self, ws, path=None):
+        self.connections += 1
+        buffered = 0
+        response_task = None
+        messages = 0
+        audio = bytearray()
+        if self.record_audio:
+            self.audio_by_connection.append(audio)
+        await ws.send(json.dumps({"type": "session.created", "session": {"id": self._next_id("sess")}}))
+        try:
+            async for message in ws:
+                messages += 1
+                if self.drop_after_messages and messages >= self.drop_after_messages:
+                    self.dropped += 1
+                    await ws.close(code=1011, reason="mock drop")
+                    return
+
+                event = json.loads(message)
+                kind = event.get("type")
+                self.events_received[kind] = self.events_received.get(kind, 0) + 1
+
+                if kind == "session.update":
+                    await ws.send(json.dumps({"type": "session.updated", "session": event.get("session", {})}))
+
+                elif kind == "input_audio_buffer.append":
+                    buffered += len(event.get("audio", "")) * 3 // 4
+                    if self.record_audio:
+                        audio += base64.b64decode(event.get("audio", ""))
+
+                elif kind == "input_audio_buffer.commit":
+                    item_id = self._next_id("item")
+                    await ws.send(
+                        json.dumps(
+                            {
+                                "type": "input_audio_buffer.committed",
+                                "item_id": item_id,
+                                "audio_bytes": buffered,
+                            }
+                        )
+                    )
+                    await ws.send(
+                        json.dumps(
+                            {
+                                "type": "conversation.item.input_audio_transcription.completed",
+                                "item_id": item_id,
+                                "content_index": 0,
+                                "transcript": f"mock transcript of {buffered} bytes",
+                            }
+                        )
+                    )
+                    buffered = 0
+
+                elif kind == "input_audio_buffer.clear":
+                    buffered = 0
+                    await ws.send(json.dumps({"type": "input_audio_buffer.cleared"}))
+
+                elif kind == "response.create":
+                    response_id = self._next_id("resp")
+                    item_id = self._next_id("item")
+                    response = {"id": response_id}
+                    metadata = (event.get("response") or {}).get("metadata")
+                    if metadata:
+                        response["metadata"] = metadata
+                    await ws.send(json.dumps({"type": "response.created", "response": response}))
+                    response_task = asyncio.create_task(
+                        self._stream_response(ws, response_id, item_id)
+                    )
+
+                elif kind == "response.cancel":
+                    if response_task and not response_task.done():
+                        response_task.cancel()
+
+                elif kind == "conversation.item.truncate":
+                    await ws.send(
+                        json.dumps(
+                            {
+                                "type": "conversation.item.truncated",
+                                "item_id": event.get("item_id"),
+                                "audio_end_ms": event.get("audio_end_ms"),
+                            }
+                        )
+                    )
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            if response_task and not response_task.done():
+                response_task.cancel()
+
+    async def start(self):
+        self._server = await websockets.serve(self.handler, self.host, self.port, max_size=None)
+        if self.port == 0:
+            self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    @property
+    def url(self):
+        return f"ws://{self.host}:{self.port}"
+
+
+async def _serve_forever(args):
+    server = MockRealtimeServer(
+        host=args.host,
+        port=args.port,
+        response_ms=args.response_ms,
+        delta_ms=args.delta_ms,
+        first_delta_delay_ms=args.first_delta_delay_ms,
+        delta_interval_ms=args.delta_interval_ms,
+        drop_after_messages=args.drop_after,
+    )
+    await server.start()
+    print(f"Mock realtime server listening on {server.url}")
+    await asyncio.Future()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local mock of the realtime websocket API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--response-ms", type=int, default=2000)
+    parser.add_argument("--delta-ms", type=int, default=100)
+    parser.add_argument("--first-delta-delay-ms", type=int, default=300)
+    parser.add_argument("--delta-interval-ms", type=int, default=None)
+    parser.add_argument("--drop-after", type=int, default=None, help="Kill connections after N messages")
+    try:
+        asyncio.run(_serve_forever(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Protocol stub of a PulseAudio server, for exercising media_players/pulse_client.py.
+
+Speaks the subset of the native protocol the bot uses over a unix socket.
+It handles AUTH (recording the SCM_CREDENTIALS it was sent),
+SET_CLIENT_NAME, LOAD_MODULE / UNLOAD_MODULE for module-null-sink and
+module-remap-source, GET_MODULE_INFO_LIST, and sink/source mute and volume.
+It tracks the sinks and sources those modules create and answers errors the
+way the real server does: init failure for duplicate names or a missing
+master, and no-entity for unknown indices or devices.
+
+The wire format is encoded and decoded here from the protocol description
+(pulsecore/tagstruct.h, pstream.c), not with the client's TagStruct, so a
+mistake in the client's encoding shows up as a failed exchange rather than
+being mirrored on both sides. tests/test_pulse_client.py also checks the
+client against golden bytes.
+
+Usage (from google_meet_bot/):
+    python -m tools.pulse_stub /tmp/pulse-stub.sock
+    PULSE_SERVER=unix:/tmp/pulse-stub.sock python -m media_players.pulse_client
+"""
+
+import os
+import socket
+import socketserver
+import struct
+import sys
+import threading
+
+# pulsecore/native-common.h
+ERROR, REPLY, AUTH, SET_CLIENT_NAME, GET_MODULE_INFO_LIST = 0, 2, 8, 9, 26
+SET_SINK_VOLUME, SET_SOURCE_VOLUME, SET_SINK_MUTE, SET_SOURCE_MUTE = 36, 38, 39, 40
+LOAD_MODULE, UNLOAD_MODULE = 51, 52
+ERR_COMMAND, ERR_INVALID, ERR_PROTOCOL, ERR_NOENTITY, ERR_MODINITFAILED = 2, 3, 7, 5, 14
+SERVER_VERSION = 32
+
+DESCRIPTOR = struct.Struct(">IIIII")  # length, channel, offset hi, offset lo, flags
+
+
+class Malformed(Exception):
+    pass
+
+
+class Fields:
+    """Reads one tagged value at a time from a packet body."""
+
+    def __init__(self, body):
+        self.body = bytes(body)
+        self.at = 0
+
+    def _expect(self, *tags):
+        if self.at >= len(self.body) or chr(self.body[self.at]) not in tags:
+            raise Malformed(f"expected {tags} at byte {self.at}")
+        self.at += 1
+        return chr(self.body[self.at - 1])
+
+    def _raw(self, n):
+        if self.at + n > len(self.body):
+            raise Malformed("truncated")
+        self.at += n
+        return self.body[self.at - n:self.at]
+
+    def u32(self):
+        self._expect("L")
+        return int.from_bytes(self._raw(4), "big")
+
+    def string(self):
+        if self._expect("t", "N") == "N":
+            return None
+        end = self.body.find(b"\0", self.at)
+        if end < 0:
+            raise Malformed("unterminated string")
+        text = self.body[self.at:end].decode()
+        self.at = end + 1
+        return text
+
+    def boolean(self):
+        return self._expect("1", "0") == "1"
+
+    def arbitrary(self):
+        self._expect("x")
+        return self._raw(int.from_bytes(self._raw(4), "big"))
+
+    def proplist(self):
+        self._expect("P")
+        props = {}
+        while (key := self.string()) is not None:
+            size = self.u32()
+            value = self.arbitrary()
+            if len(value) != size:
+                raise Malformed("proplist length mismatch")
+            props[key] = value
+        return props
+
+    def cvolume(self):
+        self._expect("v")
+        channels = self._raw(1)[0]
+        return list(struct.unpack(f">{channels}I", self._raw(4 * channels)))
+
+
+def u32(value):
+    return b"L" + value.to_bytes(4, "big")
+
+
+def string(value):
+    return b"t" + value.encode() + b"\0"
+
+
+EMPTY_PROPLIST = b"PN"
+
+
+class StubState:
+    def __init__(self):
+        self.modules = {}  # index -> (name, argument)
+        self.sinks = {}  # name -> module index
+        self.sources = {}
+        self.credentials = []  # (pid, uid, gid) sent with each AUTH
+        self.malformed = []  # (command, problem) for requests that didn't decode
+        self.commands = 0
+        self._next_index = 0
+        self.lock = threading.Lock()
+
+    def load(self, name, argument):
+        args = dict(part.split("=", 1) for part in argument.split() if "=" in part)
+        if name == "module-null-sink":
+            created = ("sinks", args.get("sink_name", "null"))
+        elif name == "module-remap-source":
+            master = args.get("master", "")
+            if master.removesuffix(".monitor") not in self.sinks and master not in self.sources:
+                return None
+            created = ("sources", args.get("source_name", master + ".remapped"))
+        else:
+            return None
+        devices = getattr(self, created[0])
+        if created[1] in devices:
+            return None
+        index = self._next_index
+        self._next_index += 1
+        self.modules[index] = (name, argument)
+        devices[created[1]] = index
+        return index
+
+    def unload(self, index):
+        if index not in self.modules:
+            return False
+        del self.modules[index]
+        for devices in (self.sinks, self.sources):
+            for name, owner in list(devices.items()):
+                if owner == index:
+                    del devices[name]
+        return True
+
+
+class StubHandler(socketserver.BaseRequestHandler):
+    def setup(self):
+        self.request.setsockopt(socket.SOL_SOCKET, socket.SO_PASSCRED, 1)
+
+    def _recv(self, n, first=False):
+        data = b""
+        while len(data) < n:
+            if first and not data:
+                # The AUTH packet's first bytes carry the SCM_CREDENTIALS
+                more, ancdata, _, _ = self.request.recvmsg(n, socket.CMSG_SPACE(12))
+                for level, kind, payload in ancdata:
+                    if level == socket.SOL_SOCKET and kind == socket.SCM_CREDENTIALS:
+                        self.server.state.credentials.append(struct.unpack("iII", payload[:12]))
+            else:
+                more = self.request.recv(n - len(data))
+            if not more:
+                raise ConnectionError
+            data += more
+        return data
+
+    def _recv_packet(self, first=False):
+        length, channel, _, _, _ = DESCRIPTOR.unpack(self._recv(DESCRIPTOR.size, first))
+        body = self._recv(length)
+        if channel != 0xFFFFFFFF:
+            raise Malformed(f"audio on channel {channel}")
+        return body
+
+    def _send(self, command, tag, body=b""):
+        body = u32(command) + u32(tag) + body
+        self.request.sendall(DESCRIPTOR.pack(len(body), 0xFFFFFFFF, 0, 0, 0) + body)
+
+    def handle(self):
+        state = self.server.state
+        try:
+            body = self._recv_packet(first=True)
+            while True:
+                fields = Fields(body)
+                command, tag = fields.u32(), fields.u32()
+                with state.lock:
+                    state.commands += 1
+                    try:
+                        reply, error = self.dispatch(state, command, fields)
+                        if not error and fields.at != len(fields.body):
+                            raise Malformed("trailing bytes")
+                    except Malformed as e:
+                        state.malformed.append((command, str(e)))
+                        reply, error = b"", ERR_PROTOCOL
+                if error:
+                    self._send(ERROR, tag, u32(error))
+                else:
+                    self._send(REPLY, tag, reply)
+                body = self._recv_packet()
+        except (ConnectionError, OSError, Malformed):
+            pass
+
+    def dispatch(self, state, command, fields):
+        """(reply body, error code) for one command."""
+        if command == AUTH:
+            fields.u32()
+            if len(fields.arbitrary()) != 256:
+                raise Malformed("cookie is not 256 bytes")
+            return u32(SERVER_VERSION), 0
+        if command == SET_CLIENT_NAME:
+            fields.proplist()
+            return u32(threading.get_ident() & 0xFFFF), 0
+        if command == LOAD_MODULE:
+            index = state.load(fields.string(), fields.string() or "")
+            if index is None:
+                return b"", ERR_MODINITFAILED
+            return u32(index), 0
+        if command == UNLOAD_MODULE:
+            return b"", 0 if state.unload(fields.u32()) else ERR_NOENTITY
+        if command == GET_MODULE_INFO_LIST:
+            return b"".join(
+                u32(index) + string(name) + string(argument) + u32(0) + EMPTY_PROPLIST
+                for index, (name, argument) in sorted(state.modules.items())
+            ), 0
+        if command in (SET_SINK_MUTE, SET_SINK_VOLUME, SET_SOURCE_MUTE, SET_SOURCE_VOLUME):
+            fields.u32()
+            name = fields.string()
+            if command in (SET_SINK_MUTE, SET_SOURCE_MUTE):
+                fields.boolean()
+            elif not fields.cvolume():
+                return b"", ERR_INVALID
+            devices = state.sinks if command in (SET_SINK_MUTE, SET_SINK_VOLUME) else state.sources
+            return b"", 0 if name in devices else ERR_NOENTITY
+        return b"", ERR_COMMAND
+
+
+class PulseStub(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        if os.path.exists(path):
+            os.unlink(path)
+        super().__init__(path, StubHandler)
+        self.path = path
+        self.state = StubState()
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        os.unlink(self.path)
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "/tmp/pulse-stub.sock"
+    stub = PulseStub(path)
+    print(f"PulseAudio protocol stub listening on {path}")
+    try:
+        stub.serve_forever()
+    except KeyboardInterrupt:
+        stub.server_close()
+        os.unlink(path)